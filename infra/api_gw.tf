@@ -14,6 +14,10 @@ module "backend" {
 
     submission_table_name = module.submission_table.name
     submission_table_arn  = module.submission_table.arn
+    submission_table_stream_arn = module.submission_table.stream_arn
+
+    submission_aggregate_table_name = module.submission_aggregate_table.name
+    submission_aggregate_table_arn  = module.submission_aggregate_table.arn
 
     user_table_name = module.user_table.name
     user_table_arn  = module.user_table.arn
@@ -1,3 +1,4 @@
+# With enable_in_handler_auth the entity routes skip the JWT authorizer; their handlers verify the token
 module "api_gateway" {
     source = "../modules/apigw_rest"
     context = var.context
@@ -22,50 +23,50 @@ module "api_gateway" {
             http_method          = "GET"
             path                 = "participant"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.participant_lambda.invoke_arn
-            lambda_function_name = module.lambdas.participant_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.participant.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.participant.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "GET"
             path                 = "participant/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.participant_lambda.invoke_arn
-            lambda_function_name = module.lambdas.participant_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.participant.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.participant.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "POST"
             path                 = "participant"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.participant_lambda.invoke_arn
-            lambda_function_name = module.lambdas.participant_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.participant.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.participant.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "PUT"
             path                 = "participant/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.participant_lambda.invoke_arn
-            lambda_function_name = module.lambdas.participant_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.participant.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.participant.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "DELETE"
             path                 = "participant/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.participant_lambda.invoke_arn
-            lambda_function_name = module.lambdas.participant_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.participant.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.participant.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
 
@@ -74,50 +75,50 @@ module "api_gateway" {
             http_method          = "GET"
             path                 = "recipe"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.recipe_lambda.invoke_arn
-            lambda_function_name = module.lambdas.recipe_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.recipe.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.recipe.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "GET"
             path                 = "recipe/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.recipe_lambda.invoke_arn
-            lambda_function_name = module.lambdas.recipe_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.recipe.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.recipe.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "POST"
             path                 = "recipe"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.recipe_lambda.invoke_arn
-            lambda_function_name = module.lambdas.recipe_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.recipe.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.recipe.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "PUT"
             path                 = "recipe/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.recipe_lambda.invoke_arn
-            lambda_function_name = module.lambdas.recipe_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.recipe.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.recipe.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "DELETE"
             path                 = "recipe/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.recipe_lambda.invoke_arn
-            lambda_function_name = module.lambdas.recipe_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.recipe.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.recipe.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
 
@@ -126,50 +127,60 @@ module "api_gateway" {
             http_method          = "GET"
             path                 = "trial"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.trial_lambda.invoke_arn
-            lambda_function_name = module.lambdas.trial_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.trial.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.trial.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "GET"
             path                 = "trial/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.trial_lambda.invoke_arn
-            lambda_function_name = module.lambdas.trial_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.trial.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.trial.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
+            authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
+        },
+        {
+            http_method          = "GET"
+            path                 = "trial/{id}/stats"
+            integration_type     = "lambda"
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.trial.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.trial.name
+            enable_cors_all      = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "POST"
             path                 = "trial"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.trial_lambda.invoke_arn
-            lambda_function_name = module.lambdas.trial_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.trial.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.trial.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "PUT"
             path                 = "trial/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.trial_lambda.invoke_arn
-            lambda_function_name = module.lambdas.trial_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.trial.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.trial.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "DELETE"
             path                 = "trial/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.trial_lambda.invoke_arn
-            lambda_function_name = module.lambdas.trial_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.trial.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.trial.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
 
@@ -178,50 +189,70 @@ module "api_gateway" {
             http_method          = "GET"
             path                 = "submission"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.submission_lambda.invoke_arn
-            lambda_function_name = module.lambdas.submission_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.submission.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.submission.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "GET"
             path                 = "submission/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.submission_lambda.invoke_arn
-            lambda_function_name = module.lambdas.submission_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.submission.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.submission.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "POST"
             path                 = "submission"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.submission_lambda.invoke_arn
-            lambda_function_name = module.lambdas.submission_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.submission.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.submission.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
+            authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
+        },
+        {
+            http_method          = "POST"
+            path                 = "submission/batch"
+            integration_type     = "lambda"
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.submission.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.submission.name
+            enable_cors_all      = true
+            use_authorizer       = !var.enable_in_handler_auth
+            authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
+        },
+        {
+            http_method          = "POST"
+            path                 = "submission/batch-get"
+            integration_type     = "lambda"
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.submission.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.submission.name
+            enable_cors_all      = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "PUT"
             path                 = "submission/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.submission_lambda.invoke_arn
-            lambda_function_name = module.lambdas.submission_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.submission.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.submission.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
         {
             http_method          = "DELETE"
             path                 = "submission/{id}"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.submission_lambda.invoke_arn
-            lambda_function_name = module.lambdas.submission_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.submission.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.submission.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
 
@@ -230,10 +261,10 @@ module "api_gateway" {
             http_method          = "POST"
             path                 = "voice-memo"
             integration_type     = "lambda"
-            lambda_invoke_arn    = module.lambdas.voice_memo_lambda.invoke_arn
-            lambda_function_name = module.lambdas.voice_memo_lambda.name
+            lambda_invoke_arn    = module.lambdas.entity_lambdas.voice_memo.invoke_arn
+            lambda_function_name = module.lambdas.entity_lambdas.voice_memo.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
 
@@ -245,11 +276,14 @@ module "api_gateway" {
             lambda_invoke_arn    = module.lambdas.transcription_lambda.invoke_arn
             lambda_function_name = module.lambdas.transcription_lambda.name
             enable_cors_all      = true
-            use_authorizer       = true
+            use_authorizer       = !var.enable_in_handler_auth
             authorizer_id        = module.authorizers_jwt_auth0_authorizer.authorizer_id
         },
     ]
 
     authorizer_type = "CUSTOM"
     api_type        = ["REGIONAL"]
+
+    # Handlers gzip compress large responses as base64; request bodies arrive base64 encoded too
+    binary_media_types = ["*/*"]
 }
\ No newline at end of file
@@ -9,6 +9,8 @@ module "auth0_webhook_packager" {
   export_dir      = "${path.root}/dist/lambda_functions/authorizers/webhooks/auth0"
   sys_paths       = ["${path.root}/../lambda_functions/authorizers/webhooks/auth0"]
   no_reqs         = true
+  precompile      = { python_version = "3.12" }
+  cache_dir       = "${path.root}/dist/.packager-cache"
 }
 
 module "auth0_webhook_lambda" {
@@ -52,12 +54,32 @@ module "authorizers_webhooks_auth0_authorizer" {
 ################################
 # AUTH0 JWT AUTHORIZER
 ################################
+# Snapshot of the tenant JWKS bundled as jwks_snapshot/jwks.json, so cold starts verify tokens
+# without fetching it first. Unknown kids and snapshots older than jwks_snapshot_max_age_seconds
+# still go to the network
+module "auth0_jwks_snapshot" {
+  source = "../modules/util_packager/jwks_snapshot"
+  count  = var.enable_jwks_snapshot ? 1 : 0
+
+  jwks_url              = "https://${var.auth0_domain}/.well-known/jwks.json"
+  output_dir            = "${path.root}/dist/auth0/jwks_snapshot"
+  refresh_after_seconds = floor(var.jwks_snapshot_max_age_seconds / 2)
+}
+
+locals {
+  jwks_snapshot_dirs = flatten(module.auth0_jwks_snapshot[*].directories)
+  jwks_snapshot_environment = {
+    JWKS_SNAPSHOT_MAX_AGE_SECONDS = tostring(var.jwks_snapshot_max_age_seconds)
+  }
+}
+
 module "auth0_jwt_packager" {
   source = "../modules/util_packager/nodejs"
 
   entry_file_path   = "${path.root}/../lambda_functions/authorizers/jwt/auth0/handler.js"
   export_dir        = "${path.root}/dist/lambda_functions/authorizers/jwt/auth0"
   package_json_path = "${path.root}/../lambda_functions/authorizers/jwt/auth0/package.json"
+  source_dirs       = local.jwks_snapshot_dirs
 }
 
 module "auth0_jwt_lambda" {
@@ -81,10 +103,10 @@ module "auth0_jwt_lambda" {
 
   enable_vpc_access = false
 
-  environment_variables = {
+  environment_variables = merge({
     AUTH0_DOMAIN   = var.auth0_domain
     AUTH0_AUDIENCE = var.auth0_audience
-  }
+  }, local.jwks_snapshot_environment)
 }
 
 module "authorizers_jwt_auth0_authorizer" {
@@ -4,8 +4,10 @@ module "create_user_packager" {
 
   entry_file_path = "${path.root}/../lambda_functions/webhooks/auth0/create_user/handler.py"
   export_dir      = "${path.root}/dist/lambda_functions/webhooks/auth0/create_user"
-  sys_paths       = ["${path.root}/../lambda_functions/webhooks/auth0/create_user"]
+  sys_paths       = ["${path.root}/../lambda_functions/webhooks/auth0/create_user", "${path.root}/../lambda_functions"]
   no_reqs         = true
+  precompile      = { python_version = "3.12" }
+  cache_dir       = "${path.root}/dist/.packager-cache"
 }
 
 module "create_user_lambda" {
@@ -20,9 +20,25 @@ module "lambdas" {
 
     submission_table_name = var.submission_table_name
     submission_table_arn  = var.submission_table_arn
+    submission_table_stream_arn = var.submission_table_stream_arn
+
+    submission_aggregate_table_name = var.submission_aggregate_table_name
+    submission_aggregate_table_arn  = var.submission_aggregate_table_arn
 
     voice_memo_bucket = var.voice_memo_bucket
     voice_memo_bucket_arn = var.voice_memo_bucket_arn
 
     backend_api_root_dir = var.backend_api_root_dir
+
+    enable_router = var.enable_router_lambda
+
+    enable_aggregate_stats = var.enable_aggregate_stats
+
+    enable_in_handler_auth    = var.enable_in_handler_auth
+    auth0_domain              = var.auth0_domain
+    auth0_audience            = var.auth0_audience
+    authorizer_scope_policies = var.authorizer_scope_policies
+    auth_layer_arns           = [module.python_dependencies_layer.layer_arn]
+    jwks_snapshot_dirs        = local.jwks_snapshot_dirs
+    jwks_snapshot_environment = local.jwks_snapshot_environment
 }
\ No newline at end of file
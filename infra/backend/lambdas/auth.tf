@@ -0,0 +1,19 @@
+# In-handler token verification (lambda_functions/common/auth.py). The handlers need PyJWT from
+# the python-dependencies layer and the tenant settings; otherwise they run without either.
+# The JWKS snapshot, if one was taken, is bundled as jwks_snapshot/ next to common/
+locals {
+  # Unset lets every valid token call every route
+  scope_policies_environment = length(var.authorizer_scope_policies) > 0 ? {
+    AUTHORIZER_SCOPE_POLICIES = jsonencode(var.authorizer_scope_policies)
+  } : {}
+
+  in_handler_auth_environment = var.enable_in_handler_auth ? merge({
+    IN_HANDLER_AUTH = "true"
+    AUTH0_DOMAIN    = var.auth0_domain
+    AUTH0_AUDIENCE  = var.auth0_audience
+  }, var.jwks_snapshot_environment, local.scope_policies_environment) : {}
+
+  in_handler_auth_layers = var.enable_in_handler_auth ? var.auth_layer_arns : []
+
+  in_handler_auth_modules = var.enable_in_handler_auth ? var.jwks_snapshot_dirs : []
+}
@@ -39,6 +39,13 @@ module "label_submission" {
   attributes = ["submission"]
 }
 
+module "label_submission_aggregates" {
+  source  = "cloudposse/label/null"
+  context = module.main_ctx.context
+
+  attributes = ["submission-aggregates"]
+}
+
 module "label_voice_memo" {
   source  = "cloudposse/label/null"
   context = module.main_ctx.context
@@ -51,4 +58,10 @@ module "label_transcription" {
   context = module.main_ctx.context
 
   attributes = ["transcription"]
-}
\ No newline at end of file
+}
+module "label_router" {
+  source  = "cloudposse/label/null"
+  context = module.main_ctx.context
+
+  attributes = ["router"]
+}
@@ -18,6 +18,11 @@ output "submission_lambda" {
     value       = module.submission_lambda
 }
 
+output "submission_aggregates_lambda" {
+    description = "submission aggregates stream consumer lambda function"
+    value       = module.submission_aggregates_lambda
+}
+
 output "voice_memo_lambda" {
     description = "voice memo lambda function"
     value       = module.voice_memo_lambda
@@ -26,4 +31,24 @@ output "voice_memo_lambda" {
 output "transcription_lambda" {
     description = "transcription lambda function"
     value       = module.transcription_lambda
-}
\ No newline at end of file
+}
+output "router_lambda" {
+    description = "router lambda function serving all entity routes, null unless enabled"
+    value       = var.enable_router ? module.router_lambda[0] : null
+}
+
+output "entity_lambdas" {
+    description = "Function serving each entity's API routes: the router when enabled, otherwise the entity's own function"
+    value = {
+        for entity, function in {
+            participant = module.participant_lambda
+            recipe      = module.recipe_lambda
+            trial       = module.trial_lambda
+            submission  = module.submission_lambda
+            voice_memo  = module.voice_memo_lambda
+        } : entity => {
+            invoke_arn = var.enable_router ? module.router_lambda[0].invoke_arn : function.invoke_arn
+            name       = var.enable_router ? module.router_lambda[0].name : function.name
+        }
+    }
+}
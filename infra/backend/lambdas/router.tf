@@ -0,0 +1,131 @@
+# Optional single function serving every entity route. Entity controllers are imported lazily
+# on first use, so one warm container answers the whole API during a session.
+module "router_packager" {
+  source = "../../modules/util_packager/python"
+  count  = var.enable_router ? 1 : 0
+
+  entry_file_path = "${var.backend_api_root_dir}/router/handler.py"
+  export_dir      = "${path.root}/dist/backend-api/router/router/"
+  # Entity directories are search paths so their services/ modules merge into one namespace package
+  sys_paths = [
+    var.backend_api_root_dir,
+    "${var.backend_api_root_dir}/participant",
+    "${var.backend_api_root_dir}/recipe",
+    "${var.backend_api_root_dir}/trial",
+    "${var.backend_api_root_dir}/submission",
+  ]
+  no_reqs    = true
+  precompile = { python_version = "3.12" }
+  cache_dir  = "${path.root}/dist/.packager-cache"
+
+  # Bundles the JWKS snapshot when in-handler auth is enabled
+  additional_modules = local.in_handler_auth_modules
+
+  # Same dependencies as the entity packagers: NumPy backs GET /trial/{id}/stats
+  install_dependencies = {
+    architecture = "x86_64"
+    dependencies = ["numpy==1.26.4"]
+  }
+}
+
+module "router_lambda" {
+  source  = "../../modules/lambda"
+  context = module.label_router.context
+  count   = var.enable_router ? 1 : 0
+
+  name = "router_lambda"
+
+  handler         = "handler.handler"
+  source_dir      = module.router_packager[0].result.build_directory
+  build_path      = "${path.root}/dist/backend-api/router/handler.zip"
+  runtime         = "python3.12"
+  memory          = var.memory
+  time_limit      = var.time_limit
+  deployment_type = "zip"
+  zip_project     = true
+  s3_bucket       = var.deploy_s3_bucket
+  s3_key          = "backend-api/router_lambda.zip"
+
+  enable_vpc_access = false
+  layers            = local.in_handler_auth_layers
+
+  environment_variables = merge({
+    PARTICIPANTS_TABLE_NAME : var.participant_table_name
+    RECIPES_TABLE_NAME : var.recipe_table_name
+    TRIALS_TABLE_NAME : var.trial_table_name
+    SUBMISSIONS_TABLE_NAME : var.submission_table_name
+    VOICE_MEMO_BUCKET : var.voice_memo_bucket
+    DYNAMODB_READ_MODE : "native"
+  }, local.aggregate_stats_environment, local.in_handler_auth_environment)
+}
+
+# Union of the entity functions' permissions
+resource "aws_iam_role_policy" "router_lambda_access" {
+  count = var.enable_router ? 1 : 0
+
+  name = "${module.label_router.id}-access-policy"
+  role = module.router_lambda[0].role_name
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:DeleteItem",
+          "dynamodb:Query",
+          "dynamodb:Scan"
+        ]
+        Resource = [
+          var.participant_table_arn,
+          "${var.participant_table_arn}/*",
+          var.recipe_table_arn,
+          "${var.recipe_table_arn}/*",
+          var.trial_table_arn,
+          "${var.trial_table_arn}/*",
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:BatchWriteItem",
+          "dynamodb:BatchGetItem",
+          "dynamodb:DeleteItem",
+          "dynamodb:Query",
+          "dynamodb:Scan"
+        ]
+        Resource = [
+          "${var.submission_table_arn}/*",
+          var.submission_table_arn
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:Query"
+        ]
+        Resource = [
+          var.submission_aggregate_table_arn
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject",
+          "s3:DeleteObject",
+        ]
+        Resource = [
+          "${var.voice_memo_bucket_arn}/*",
+          var.voice_memo_bucket_arn
+        ]
+      }
+    ]
+  })
+}
@@ -5,6 +5,11 @@ module "submission_packager" {
   export_dir      = "${path.root}/dist/backend-api/submission/submission/"
   sys_paths       = [var.backend_api_root_dir]
   no_reqs         = true
+  precompile      = { python_version = "3.12" }
+  cache_dir       = "${path.root}/dist/.packager-cache"
+
+  # Bundles the JWKS snapshot when in-handler auth is enabled
+  additional_modules = local.in_handler_auth_modules
 }
 
 module "submission_lambda" {
@@ -25,10 +30,12 @@ module "submission_lambda" {
   s3_key          = "backend-api/submission_lambda.zip"
 
   enable_vpc_access           = false
+  layers                      = local.in_handler_auth_layers
 
-  environment_variables = {
+  environment_variables = merge({
     SUBMISSIONS_TABLE_NAME : var.submission_table_name
-  }
+    DYNAMODB_READ_MODE : "native"
+  }, local.in_handler_auth_environment)
 }
 
 # IAM Policy for DynamoDB access
@@ -45,6 +52,8 @@ resource "aws_iam_role_policy" "submission_lambda_dynamodb" {
           "dynamodb:GetItem",
           "dynamodb:PutItem",   
           "dynamodb:UpdateItem",
+          "dynamodb:BatchWriteItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
           "dynamodb:Scan"
@@ -0,0 +1,88 @@
+# The trial function reads GET /trial/{id}/stats from the aggregates only once enable_aggregate_stats
+# is set. Run lambda_functions/submission_aggregates/backfill.py after the consumer is deployed and
+# before turning it on, otherwise trials written before the consumer existed report no submissions
+locals {
+  aggregate_stats_environment = var.enable_aggregate_stats ? {
+    AGGREGATES_TABLE_NAME = var.submission_aggregate_table_name
+  } : {}
+}
+
+module "submission_aggregates_packager" {
+  source = "../../modules/util_packager/python"
+
+  entry_file_path = "${var.backend_api_root_dir}/submission_aggregates/handler.py"
+  export_dir      = "${path.root}/dist/backend-api/submission_aggregates/submission_aggregates/"
+  sys_paths       = [var.backend_api_root_dir]
+  no_reqs         = true
+  precompile      = { python_version = "3.12" }
+  cache_dir       = "${path.root}/dist/.packager-cache"
+}
+
+module "submission_aggregates_lambda" {
+  source  = "../../modules/lambda"
+  context = module.label_submission_aggregates.context
+
+  name = "submission_aggregates_lambda"
+
+  handler         = "handler.handler"
+  source_dir      = module.submission_aggregates_packager.result.build_directory
+  build_path      = "${path.root}/dist/backend-api/submission_aggregates/handler.zip"
+  runtime         = "python3.12"
+  memory          = var.memory
+  time_limit      = var.time_limit
+  deployment_type = "zip"
+  zip_project     = true
+  s3_bucket       = var.deploy_s3_bucket
+  s3_key          = "backend-api/submission_aggregates_lambda.zip"
+
+  enable_vpc_access           = false
+
+  environment_variables = {
+    AGGREGATES_TABLE_NAME : var.submission_aggregate_table_name
+  }
+}
+
+# Deliver submission inserts/updates/removals to the aggregates consumer
+resource "aws_lambda_event_source_mapping" "submission_aggregates_stream" {
+  event_source_arn        = var.submission_table_stream_arn
+  function_name           = module.submission_aggregates_lambda.arn
+  starting_position       = "LATEST"
+  batch_size              = 100
+  function_response_types = ["ReportBatchItemFailures"]
+}
+
+# IAM Policy for reading the submission stream and updating aggregates
+resource "aws_iam_role_policy" "submission_aggregates_lambda_dynamodb" {
+  name = "${module.label_submission_aggregates.id}-dynamodb-policy"
+  role = module.submission_aggregates_lambda.role_name
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ]
+        Resource = [
+          var.submission_table_stream_arn
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:Query"
+        ]
+        Resource = [
+          var.submission_aggregate_table_arn
+        ]
+      }
+    ]
+  })
+}
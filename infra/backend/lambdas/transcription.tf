@@ -5,6 +5,11 @@ module "transcription_packager" {
   export_dir      = "${path.root}/dist/backend-api/transcription/transcription/"
   sys_paths       = [var.backend_api_root_dir]
   no_reqs         = true
+  precompile      = { python_version = "3.12" }
+  cache_dir       = "${path.root}/dist/.packager-cache"
+
+  # Bundles the JWKS snapshot when in-handler auth is enabled
+  additional_modules = local.in_handler_auth_modules
 }
 
 module "transcription_lambda" {
@@ -25,11 +30,12 @@ module "transcription_lambda" {
   s3_key          = "backend-api/transcription_lambda.zip"
 
   enable_vpc_access = false
+  layers            = local.in_handler_auth_layers
 
-  environment_variables = {
+  environment_variables = merge({
     VOICE_MEMO_BUCKET      = var.voice_memo_bucket
     SUBMISSIONS_TABLE_NAME = var.submission_table_name
-  }
+  }, local.in_handler_auth_environment)
 }
 
 # IAM Policy for Transcribe access
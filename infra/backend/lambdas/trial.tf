@@ -5,6 +5,17 @@ module "trial_packager" {
   export_dir      = "${path.root}/dist/backend-api/trial/trial/"
   sys_paths       = [var.backend_api_root_dir]
   no_reqs         = true
+  precompile      = { python_version = "3.12" }
+  cache_dir       = "${path.root}/dist/.packager-cache"
+
+  # Bundles the JWKS snapshot when in-handler auth is enabled
+  additional_modules = local.in_handler_auth_modules
+
+  # NumPy backs the GET /trial/{id}/stats aggregation
+  install_dependencies = {
+    architecture = "x86_64"
+    dependencies = ["numpy==1.26.4"]
+  }
 }
 
 module "trial_lambda" {
@@ -25,10 +36,13 @@ module "trial_lambda" {
   s3_key          = "backend-api/trial_lambda.zip"
 
   enable_vpc_access           = false
+  layers                      = local.in_handler_auth_layers
 
-  environment_variables = {
+  environment_variables = merge({
     TRIALS_TABLE_NAME : var.trial_table_name
-  }
+    SUBMISSIONS_TABLE_NAME : var.submission_table_name
+    DYNAMODB_READ_MODE : "native"
+  }, local.aggregate_stats_environment, local.in_handler_auth_environment)
 }
 
 # IAM Policy for DynamoDB access
@@ -53,6 +67,16 @@ resource "aws_iam_role_policy" "trial_lambda_dynamodb" {
           "${var.trial_table_arn}/*",
           var.trial_table_arn
         ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:Query"
+        ]
+        Resource = [
+          "${var.submission_table_arn}/index/*",
+          var.submission_aggregate_table_arn
+        ]
       }
     ]
   })
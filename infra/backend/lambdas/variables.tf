@@ -46,6 +46,21 @@ variable "submission_table_arn" {
   description = "The ARN of the DynamoDB table to store submission data"
 }
 
+variable "submission_table_stream_arn" {
+  type        = string
+  description = "The ARN of the submission table's DynamoDB stream"
+}
+
+variable "submission_aggregate_table_name" {
+  type        = string
+  description = "The name of the DynamoDB table storing running submission score aggregates"
+}
+
+variable "submission_aggregate_table_arn" {
+  type        = string
+  description = "The ARN of the DynamoDB table storing running submission score aggregates"
+}
+
 variable "voice_memo_bucket" {
   type        = string
   description = "The name of the S3 bucket to store voice memos"
@@ -78,3 +93,57 @@ variable "deploy_s3_bucket" {
     type        = string
     description = "S3 bucket name for Lambda deployment packages"
 }
+
+variable "enable_router" {
+    type        = bool
+    description = "Serve participant, recipe, trial, submission and voice memo routes from one router function instead of one function per entity"
+    default     = false
+}
+
+variable "enable_aggregate_stats" {
+    type        = bool
+    description = "Serve trial stats from the submission aggregates table. Only enable after running submission_aggregates/backfill.py"
+    default     = false
+}
+
+variable "enable_in_handler_auth" {
+    type        = bool
+    description = "Verify Auth0 tokens inside the API handlers instead of the API Gateway JWT authorizer"
+    default     = false
+}
+
+variable "auth0_domain" {
+    type        = string
+    description = "The Auth0 domain, used when enable_in_handler_auth is set"
+    default     = ""
+}
+
+variable "auth0_audience" {
+    type        = string
+    description = "The Auth0 API audience identifier, used when enable_in_handler_auth is set"
+    default     = ""
+}
+
+variable "authorizer_scope_policies" {
+    type        = map(list(string))
+    description = "Scope to METHOD/resource patterns (AUTHORIZER_SCOPE_POLICIES), used when enable_in_handler_auth is set"
+    default     = {}
+}
+
+variable "auth_layer_arns" {
+    type        = list(string)
+    description = "Layers providing PyJWT and cryptography, attached when enable_in_handler_auth is set"
+    default     = []
+}
+
+variable "jwks_snapshot_dirs" {
+    type        = list(string)
+    description = "JWKS snapshot directory bundled with the handlers when enable_in_handler_auth is set (empty: fetch at runtime)"
+    default     = []
+}
+
+variable "jwks_snapshot_environment" {
+    type        = map(string)
+    description = "JWKS snapshot settings (JWKS_SNAPSHOT_MAX_AGE_SECONDS) for the handlers when enable_in_handler_auth is set"
+    default     = {}
+}
@@ -5,6 +5,11 @@ module "voice_memo_packager" {
   export_dir      = "${path.root}/dist/backend-api/voice_memo/voice_memo/"
   sys_paths       = [var.backend_api_root_dir]
   no_reqs         = true
+  precompile      = { python_version = "3.12" }
+  cache_dir       = "${path.root}/dist/.packager-cache"
+
+  # Bundles the JWKS snapshot when in-handler auth is enabled
+  additional_modules = local.in_handler_auth_modules
 }
 
 module "voice_memo_lambda" {
@@ -25,10 +30,11 @@ module "voice_memo_lambda" {
   s3_key          = "backend-api/voice_memo_lambda.zip"
 
   enable_vpc_access           = false
+  layers                      = local.in_handler_auth_layers
 
-  environment_variables = {
+  environment_variables = merge({
     VOICE_MEMO_BUCKET : var.voice_memo_bucket
-  }
+  }, local.in_handler_auth_environment)
 }
 
 # IAM Policy for S3 access
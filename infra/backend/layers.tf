@@ -15,8 +15,14 @@ module "python_dependencies_layer" {
   s3_bucket       = module.lambda_deployment_bucket.bucket_name
   s3_key          = "lambda_layers/python_dependencies.zip"
 
+  precompile     = { python_version = "3.12" }
+  prune_manifest = "${var.backend_api_root_dir}/layers/python-dependencies.manifest.json"
+
   dependencies = [
     "PyJWT[crypto]==2.8.0",
-    "cryptography==41.0.7"
+    "cryptography==41.0.7",
+    # Transitive dependencies are pinned too, otherwise a new release changes the layer hash
+    "cffi==2.0.0",
+    "pycparser==2.23"
   ]
 }
\ No newline at end of file
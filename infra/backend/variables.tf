@@ -46,6 +46,21 @@ variable "submission_table_arn" {
   description = "The ARN of the DynamoDB table to store submission data"
 }
 
+variable "submission_table_stream_arn" {
+  type        = string
+  description = "The ARN of the submission table's DynamoDB stream"
+}
+
+variable "submission_aggregate_table_name" {
+  type        = string
+  description = "The name of the DynamoDB table storing running submission score aggregates"
+}
+
+variable "submission_aggregate_table_arn" {
+  type        = string
+  description = "The ARN of the DynamoDB table storing running submission score aggregates"
+}
+
 variable "user_table_name" {
   type        = string
   description = "The name of the DynamoDB table to store user data"
@@ -98,3 +113,39 @@ variable "backend_api_root_dir" {
     description = "Root directory path for backend-api API code"
 }
 
+
+variable "enable_router_lambda" {
+    type        = bool
+    description = "Route all entity endpoints to a single router function (see lambda_functions/router)"
+    default     = false
+}
+
+variable "enable_aggregate_stats" {
+    type        = bool
+    description = "Serve trial stats from the running submission aggregates instead of querying the trial's submissions. Only enable after running lambda_functions/submission_aggregates/backfill.py against the deployed tables"
+    default     = false
+}
+
+variable "enable_in_handler_auth" {
+    type        = bool
+    description = "Verify Auth0 tokens inside the Python handlers (common/auth.py) instead of invoking the JWT authorizer per route"
+    default     = false
+}
+
+variable "authorizer_scope_policies" {
+    type        = map(list(string))
+    description = "Scope or permission to the METHOD/resource patterns it allows (e.g. {\"read:trials\" = [\"GET/*\"]}), checked by in-handler auth. Empty: every valid token may call every route"
+    default     = {}
+}
+
+variable "enable_jwks_snapshot" {
+    type        = bool
+    description = "Bundle a snapshot of the Auth0 JWKS, taken at plan time, with the functions that verify tokens so cold starts skip the JWKS fetch"
+    default     = true
+}
+
+variable "jwks_snapshot_max_age_seconds" {
+    type        = number
+    description = "Age after which a bundled JWKS snapshot is no longer trusted and the JWKS is fetched instead. Plans retake the snapshot after half of it"
+    default     = 86400
+}
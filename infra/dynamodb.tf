@@ -100,6 +100,10 @@ module "submission_table" {
   hash_key  = "submission_id"
   range_key = "recipe_id"
 
+  # Feeds the submission aggregates consumer
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+
   attributes = [
     {
       name = "submission_id"
@@ -117,6 +121,10 @@ module "submission_table" {
       name = "trial_id"
       type = "S"
     },
+    {
+      name = "last_updated"
+      type = "S"
+    },
   ]
   global_secondary_indexes = [
     {
@@ -136,10 +144,41 @@ module "submission_table" {
       hash_key        = "recipe_id"
       range_key       = "submission_id"
       projection_type = "ALL"
+    },
+    {
+      name            = "trial_id_last_updated_index"
+      hash_key        = "trial_id"
+      range_key       = "last_updated"
+      projection_type = "ALL"
     }
   ]
 }
 
+# Running count / score sum / sum of squares per (trial_id, recipe_id::outcome),
+# maintained from the submission table stream
+module "submission_aggregate_table" {
+  source  = "./modules/dynamodb_table"
+  context = module.null_label.context
+
+  name = "submission-aggregate"
+
+  billing_mode = "PAY_PER_REQUEST"
+
+  hash_key  = "trial_id"
+  range_key = "aggregate_key"
+
+  attributes = [
+    {
+      name = "trial_id"
+      type = "S"
+    },
+    {
+      name = "aggregate_key"
+      type = "S"
+    },
+  ]
+}
+
 module "user_table" {
   source  = "./modules/dynamodb_table"
   context = module.null_label.context
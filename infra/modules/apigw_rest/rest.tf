@@ -1,7 +1,8 @@
 locals {
   # 1. Filter routes into top-level and nested paths
   top_level_paths = toset([for r in var.http_routes : r.path if !strcontains(r.path, "/")])
-  nested_paths    = toset([for r in var.http_routes : r.path if strcontains(r.path, "/")])
+  nested_paths    = toset([for r in var.http_routes : r.path if length(split("/", r.path)) == 2])
+  deep_paths      = toset([for r in var.http_routes : r.path if length(split("/", r.path)) == 3])
 
   # 2. Top-Level Resources (e.g., "user", "order")
   top_level_resources = { for path in local.top_level_paths : path => {
@@ -15,13 +16,19 @@ locals {
     parent_path = join("/", slice(split("/", path), 0, length(split("/", path)) - 1)) # e.g., "user"
   } }
 
+  # 3b. Third-level Resources (e.g., "trial/{id}/stats"), parented by a nested resource
+  deep_resources = { for path in local.deep_paths : path => {
+    path_part   = split("/", path)[2]
+    parent_path = join("/", slice(split("/", path), 0, 2))
+  } }
+
   # 4. Create a compound key map for all HTTP methods/integrations (No Change)
   http_routes_map = {
     for route in var.http_routes : "${route.path}_${route.http_method}" => route
   }
 
   # 5. Combined map for easy lookup in the integration module and deployment triggers
-  all_resources = merge(aws_api_gateway_resource.top_level, aws_api_gateway_resource.nested)
+  all_resources = merge(aws_api_gateway_resource.top_level, aws_api_gateway_resource.nested, aws_api_gateway_resource.deep)
 
   # 6. Get unique paths that need CORS (deduplicate by path)
   cors_enabled_paths = toset([
@@ -32,11 +39,7 @@ locals {
   # 7. Create a map of unique resources that need CORS (one OPTIONS method per resource)
   cors_enabled_resources = {
     for path in local.cors_enabled_paths : path => {
-      resource_id = strcontains(path, "/") ? (
-        aws_api_gateway_resource.nested[path].id
-      ) : (
-        aws_api_gateway_resource.top_level[path].id
-      )
+      resource_id = local.all_resources[path].id
     }
   }
 }
@@ -44,6 +47,7 @@ locals {
 resource "aws_api_gateway_rest_api" "api" {
   name = module.label_apigw.id
   tags = module.label_apigw.tags
+  binary_media_types = var.binary_media_types
   endpoint_configuration {
     types = var.api_type
   }
@@ -73,6 +77,14 @@ resource "aws_api_gateway_resource" "nested" {
   parent_id = aws_api_gateway_resource.top_level[each.value.parent_path].id
 }
 
+# 2b. Create Third-level Resources (Parent is a nested resource)
+resource "aws_api_gateway_resource" "deep" {
+  for_each    = local.deep_resources
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  path_part   = each.value.path_part
+  parent_id   = aws_api_gateway_resource.nested[each.value.parent_path].id
+}
+
 
 # 3. Create Methods and Integrations using a Compound Key
 module "api_lambda_integration" {
@@ -85,12 +97,8 @@ module "api_lambda_integration" {
 
   rest_api_id          = aws_api_gateway_rest_api.api.id
 
-  # Determine resource_id based on whether the path is nested or top-level
-  resource_id          = strcontains(each.value.path, "/") ? (
-    aws_api_gateway_resource.nested[each.value.path].id
-  ) : (
-    aws_api_gateway_resource.top_level[each.value.path].id
-  )
+  # Look up the resource at any depth (top-level, nested or third-level)
+  resource_id          = local.all_resources[each.value.path].id
 
   http_method          = each.value.http_method
   lambda_invoke_arn    = each.value.lambda_invoke_arn
@@ -143,6 +151,10 @@ resource "aws_api_gateway_integration" "cors_options" {
   http_method = aws_api_gateway_method.cors_options[each.key].http_method
   type        = "MOCK"
 
+  # With a binary_media_types wildcard the preflight would otherwise reach the MOCK
+  # integration as binary and miss the application/json request template
+  content_handling = "CONVERT_TO_TEXT"
+
   request_templates = {
     "application/json" = jsonencode({
       statusCode = 200
@@ -203,6 +215,7 @@ resource "aws_api_gateway_deployment" "deployment" {
       jsonencode(aws_api_gateway_rest_api.api),
       jsonencode(aws_api_gateway_resource.top_level),
       jsonencode(aws_api_gateway_resource.nested),
+      jsonencode(aws_api_gateway_resource.deep),
       jsonencode(module.api_lambda_integration)
     ]))
   }
@@ -216,6 +229,7 @@ resource "aws_api_gateway_deployment" "deployment" {
     aws_api_gateway_rest_api_policy.policy,
     # Explicit dependency on the nested resources ensures correct ordering for deployment
     aws_api_gateway_resource.nested,
+    aws_api_gateway_resource.deep,
     # Depend on CORS OPTIONS methods
     aws_api_gateway_method.cors_options,
     aws_api_gateway_integration.cors_options,
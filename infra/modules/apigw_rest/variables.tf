@@ -42,6 +42,12 @@ variable "api_type" {
   }
 }
 
+variable "binary_media_types" {
+  description = "Media types API Gateway treats as binary. Use [\"*/*\"] when Lambda responses may be base64 encoded (e.g. compressed)"
+  type        = list(string)
+  default     = []
+}
+
 variable "vpc_endpoint_ids" {
   description = "Private API GW related VPC endpoints ids"
   type        = list(string)
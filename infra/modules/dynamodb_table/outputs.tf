@@ -13,6 +13,11 @@ output "name" {
   value       = aws_dynamodb_table.table.name
 }
 
+output "stream_arn" {
+  description = "The ARN of the DynamoDB table stream (empty when streams are disabled)"
+  value       = aws_dynamodb_table.table.stream_arn
+}
+
 output "hash_key" {
   description = "The hash key of the DynamoDB table"
   value       = aws_dynamodb_table.table.hash_key
@@ -7,6 +7,10 @@ data "archive_file" "zip" {
   output_path = var.build_path
 
   excludes = ["*.zip"]
+
+  # The provider already sorts entries and fixes timestamps; permissions still come from the
+  # build machine's umask, which would change the hash and redeploy unchanged code
+  output_file_mode = "0644"
 }
 
 
@@ -6,7 +6,8 @@ data "archive_file" "zip" {
   source_dir  = var.source_dir
   output_path = var.build_path
 
-  excludes = ["*.zip"]
+  excludes         = ["*.zip"]
+  output_file_mode = "0644"
 }
 
 
@@ -11,6 +11,9 @@ data "external" "install_dependencies" {
     --no-compile \
     --only-binary=:all: \
     ${join(" ", var.dependencies)} >> /dev/null 2>&1 && \
+    rm -rf ${var.source_dir}/python/bin && \
+    ${local.prune_command} \
+    ${local.precompile_command} \
     echo '{"result": "success"}'
     EOF
   ]
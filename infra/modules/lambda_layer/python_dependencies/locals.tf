@@ -8,4 +8,19 @@ locals {
 locals {
   pip_architectures            = [for arch in var.architecture : local.architecture_mapper[arch]]
   pip_install_platform_command = join(" ", [for arch in local.pip_architectures : "--platform ${arch}"])
+
+  # Bytecode must come from the runtime's minor version; a missing interpreter skips compilation.
+  # Source paths are recorded as /opt/python so the .pyc files do not depend on where the build ran
+  precompile_command = var.precompile == null ? "" : join(" ", [
+    "{ python${var.precompile.python_version} -m compileall -q -j 0",
+    "--invalidation-mode unchecked-hash -o ${var.precompile.optimize}",
+    "-s ${abspath(var.source_dir)}/python -p /opt/python",
+    "${abspath(var.source_dir)}/python >> /dev/null 2>&1 || true; } &&"
+  ])
+
+  # Pruning never fails the install: on any problem the full layer is shipped
+  prune_command = var.prune_manifest == null ? "" : join(" ", [
+    "{ python ${path.module}/prune.py ${var.source_dir}/python ${var.prune_manifest}",
+    ">> /dev/null 2>&1 || true; } &&"
+  ])
 }
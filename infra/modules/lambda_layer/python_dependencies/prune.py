@@ -0,0 +1,92 @@
+"""
+Remove every file from an installed layer that a prune manifest does not keep.
+
+    python prune.py LAYER_PYTHON_DIR MANIFEST
+
+The manifest is written by lambda_functions/local/prune_layer.py from import traces. A file is kept
+when it is listed in `keep`, matches a `native` extension glob (ABI tags vary by interpreter) or an
+`allowlist` glob, or is the bytecode of a kept source file.
+Nothing is removed when the installed distributions differ from the traced ones or a kept file is
+missing, because the trace no longer describes this layer; the full layer is shipped instead.
+"""
+
+import fnmatch
+import json
+import os
+import sys
+from typing import List
+
+
+def installed_distributions(layer_dir: str) -> List[str]:
+    return sorted(name[: -len(".dist-info")] for name in os.listdir(layer_dir) if name.endswith(".dist-info"))
+
+
+def is_kept(relative_path: str, keep: set, allowlist: List[str]) -> bool:
+    if relative_path in keep or any(fnmatch.fnmatch(relative_path, pattern) for pattern in allowlist):
+        return True
+
+    directory, name = os.path.split(relative_path)
+    if os.path.basename(directory) == "__pycache__" and name.endswith(".pyc"):
+        source = os.path.join(os.path.dirname(directory), name.split(".")[0] + ".py")
+        return source in keep or any(fnmatch.fnmatch(source, pattern) for pattern in allowlist)
+    return False
+
+
+def prune(layer_dir: str, manifest: dict) -> dict:
+    keep = set(manifest["keep"])
+    native = manifest.get("native", [])
+    allowlist = manifest.get("allowlist", []) + native
+
+    distributions = installed_distributions(layer_dir)
+    if distributions != sorted(manifest["distributions"]):
+        return {"pruned": False, "reason": f"installed {distributions} but manifest traced {manifest['distributions']}"}
+
+    missing = sorted(path for path in keep if not os.path.exists(os.path.join(layer_dir, path)))
+    if missing:
+        return {"pruned": False, "reason": f"kept files missing from the layer: {', '.join(missing[:5])}"}
+
+    # Decide everything before deleting anything
+    relative_paths = []
+    for current, dirs, files in os.walk(layer_dir):
+        for name in files:
+            relative_paths.append(os.path.relpath(os.path.join(current, name), layer_dir).replace(os.sep, "/"))
+
+    unmatched = [pattern for pattern in native if not fnmatch.filter(relative_paths, pattern)]
+    if unmatched:
+        return {"pruned": False, "reason": f"no native extension matches {', '.join(unmatched)}"}
+
+    removals = [
+        os.path.join(layer_dir, relative_path)
+        for relative_path in relative_paths
+        if not is_kept(relative_path, keep, allowlist)
+    ]
+
+    removed_bytes = 0
+    for path in removals:
+        removed_bytes += os.path.getsize(path)
+        os.remove(path)
+
+    for current, dirs, files in os.walk(layer_dir, topdown=False):
+        if current != layer_dir and not os.listdir(current):
+            os.rmdir(current)
+
+    return {"pruned": True, "removed_files": len(removals), "removed_bytes": removed_bytes}
+
+
+def main() -> None:
+    if len(sys.argv) != 3:
+        print(__doc__, file=sys.stderr)
+        sys.exit(2)
+
+    layer_dir, manifest_path = sys.argv[1:]
+    with open(manifest_path, "r") as file:
+        manifest = json.load(file)
+
+    result = prune(layer_dir, manifest)
+    if not result["pruned"]:
+        print(f"prune: keeping the full layer, {result['reason']}", file=sys.stderr)
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
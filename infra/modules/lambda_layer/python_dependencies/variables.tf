@@ -155,3 +155,23 @@ variable "dependencies" {
     error_message = "All `dependencies` must have exact version specified. Example: 'requests==2.28.1'"
   }
 }
+
+variable "precompile" {
+  type = object({
+    python_version = string
+    optimize       = optional(number, 0)
+  })
+  description = "Compile the installed packages to unchecked-hash .pyc files for the target runtime (e.g. `3.12`). Skipped when no matching `python<version>` is available. `optimize` 1 or 2 only takes effect in functions that set PYTHONOPTIMIZE to the same level."
+  default     = null
+
+  validation {
+    condition     = var.precompile == null ? true : contains([0, 1, 2], var.precompile.optimize)
+    error_message = "Valid values for `precompile.optimize`: [0, 1, 2]."
+  }
+}
+
+variable "prune_manifest" {
+  type        = string
+  description = "Path to a prune manifest written by `lambda_functions/local/prune_layer.py`. Files the traced handlers never loaded are removed from the layer before it is compiled and zipped; allowlisted paths are always kept. If the installed distributions differ from the traced ones, the full layer is shipped."
+  default     = null
+}
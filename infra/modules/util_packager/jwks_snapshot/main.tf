@@ -0,0 +1,10 @@
+data "external" "jwks_snapshot" {
+  program = ["python", "${path.module}/snapshot.py"]
+
+  query = {
+    jwks_url              = var.jwks_url
+    output_dir            = var.output_dir
+    refresh_after_seconds = tostring(var.refresh_after_seconds)
+    timeout_seconds       = tostring(var.timeout_seconds)
+  }
+}
@@ -0,0 +1,9 @@
+output "result" {
+  value       = data.external.jwks_snapshot.result
+  description = "Snapshot information: directory, fetched_at (epoch seconds), kids and whether it was updated."
+}
+
+output "directories" {
+  value       = compact([data.external.jwks_snapshot.result.directory])
+  description = "The snapshot directory, or no directory when no snapshot could be taken. Suitable for `additional_modules`/`source_dirs`."
+}
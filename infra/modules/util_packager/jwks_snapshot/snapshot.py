@@ -0,0 +1,95 @@
+"""
+Terraform external program: write a snapshot of a JWKS to <output_dir>/jwks.json so it can be
+bundled with the functions that verify tokens against it.
+
+The query (stdin) holds jwks_url, output_dir, refresh_after_seconds and timeout_seconds. The file
+is only rewritten when the keys changed or the snapshot is older than refresh_after_seconds, so
+unchanged keys keep the bundles (and their build cache fingerprints) stable between plans.
+A failed fetch never fails the plan: the previous snapshot is kept, or none is bundled and the
+functions fetch the JWKS at runtime as before.
+"""
+import json
+import os
+import sys
+import time
+import urllib.request
+from typing import Any, Dict
+
+
+SNAPSHOT_FILE_NAME = "jwks.json"
+
+
+def read_snapshot(path: str) -> Dict[str, Any] | None:
+    try:
+        with open(path, "r") as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return snapshot if isinstance(snapshot, dict) and isinstance(snapshot.get("keys"), list) else None
+
+
+def fetch_keys(url: str, timeout: float) -> list:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        keys = json.load(response).get("keys")
+    if not isinstance(keys, list) or not keys:
+        raise ValueError("JWKS has no keys")
+    return keys
+
+
+def write_snapshot(path: str, snapshot: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(snapshot, file, sort_keys=True, indent=2)
+        file.write("\n")
+    os.replace(temp_path, path)
+
+
+def take_snapshot(url: str, output_dir: str, refresh_after: float, timeout: float) -> Dict[str, str]:
+    path = os.path.join(output_dir, SNAPSHOT_FILE_NAME)
+    previous = read_snapshot(path)
+    if previous is not None and previous.get("url") != url:
+        previous = None
+
+    try:
+        keys = fetch_keys(url, timeout)
+    except Exception as e:
+        print(f"WARNING: could not fetch {url}: {e}", file=sys.stderr)
+        if previous is None:
+            return {"directory": "", "fetched_at": "", "kids": "", "updated": "false"}
+        return result(output_dir, previous, False)
+
+    now = int(time.time())
+    if previous is not None and previous["keys"] == keys and now - previous.get("fetched_at", 0) < refresh_after:
+        return result(output_dir, previous, False)
+
+    snapshot = {"url": url, "fetched_at": now, "keys": keys}
+    write_snapshot(path, snapshot)
+    return result(output_dir, snapshot, True)
+
+
+def result(output_dir: str, snapshot: Dict[str, Any], updated: bool) -> Dict[str, str]:
+    return {
+        "directory": os.path.normpath(output_dir),
+        "fetched_at": str(snapshot.get("fetched_at", "")),
+        "kids": ",".join(str(key.get("kid", "")) for key in snapshot["keys"]),
+        "updated": str(updated).lower(),
+    }
+
+
+def main() -> None:
+    query = json.load(sys.stdin)
+    print(
+        json.dumps(
+            take_snapshot(
+                query["jwks_url"],
+                query["output_dir"],
+                float(query.get("refresh_after_seconds", 43200)),
+                float(query.get("timeout_seconds", 5)),
+            )
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
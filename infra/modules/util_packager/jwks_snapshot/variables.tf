@@ -0,0 +1,21 @@
+variable "jwks_url" {
+  type        = string
+  description = "URL of the JWKS to snapshot, e.g. https://your-tenant.auth0.com/.well-known/jwks.json."
+}
+
+variable "output_dir" {
+  type        = string
+  description = "Directory the snapshot (jwks.json) is written to. Pass the `directories` output to the packagers so it is bundled as `<bundle>/<basename of output_dir>/jwks.json`."
+}
+
+variable "refresh_after_seconds" {
+  type        = number
+  description = "Rewrite the snapshot with a new timestamp once it is this old even if the keys did not change. Keep it below the functions' JWKS_SNAPSHOT_MAX_AGE_SECONDS so a deploy ships a snapshot they still trust."
+  default     = 43200
+}
+
+variable "timeout_seconds" {
+  type        = number
+  description = "Timeout of the JWKS request. When it fails the previous snapshot is kept, or none is bundled."
+  default     = 5
+}
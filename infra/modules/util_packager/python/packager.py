@@ -1,13 +1,23 @@
 import argparse
 import ast
+import hashlib
 import json
 import os
 import shutil
 import subprocess
+import statistics
 import sys
+import tempfile
+import time
+import zipfile
 from importlib.metadata import PackageNotFoundError, packages_distributions, version
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, FrozenSet, List, Set
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
 
 
 class ImportTarget(object):
@@ -22,6 +32,11 @@ class ImportTarget(object):
             file_content = file.read()
         return ast.parse(file_content)
 
+    def get_content_hash(self) -> str:
+        if not hasattr(self, "_content_hash"):
+            self._content_hash = file_hash(self.absolute_path)
+        return self._content_hash
+
     def __eq__(self, other: Any):
         if not isinstance(other, ImportTarget):
             return False
@@ -32,6 +47,9 @@ class ImportTarget(object):
             and self.module_name == other.module_name
         )
 
+    def __hash__(self) -> int:
+        return hash((self.absolute_path, self.relative_path, self.is_package, self.module_name))
+
     def __str__(self) -> str:
         return f"ImportTarget(module={self.module_name}, path={self.relative_path})"
 
@@ -74,6 +92,9 @@ class ExternalModule:
             return False
         return self.name == other.name and self.version == other.version
 
+    def __hash__(self) -> int:
+        return hash((self.name, self.version))
+
     def __str__(self) -> str:
         return f"ExternalModule({self.name}=={self.version})"
 
@@ -81,6 +102,72 @@ class ExternalModule:
         return f"ExternalModule(name='{self.name}', version='{self.version}')"
 
 
+class BuildCache:
+    """
+    Persistent cache shared by packager runs:
+    - imports.json maps a module's content hash (plus its module name, which relative imports
+      depend on) to the import lines discovered in it, so unchanged files are not parsed again
+    - builds/<export dir hash>.json records the fingerprint of the last build of an export
+      directory, so an unchanged build can be skipped entirely
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.imports_path = os.path.join(self.cache_dir, "imports.json")
+        self.imports = self._load(self.imports_path)
+        self.new_imports: dict = {}
+
+    @staticmethod
+    def _load(path: str) -> dict:
+        try:
+            with open(path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write(path: str, content: dict) -> None:
+        # Write then rename, so parallel packager runs never read a half-written file
+        Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False, suffix=".tmp") as file:
+            json.dump(content, file, sort_keys=True)
+        os.replace(file.name, path)
+
+    @staticmethod
+    def import_key(import_target: "ImportTarget") -> str:
+        return f"{import_target.get_content_hash()}:{import_target.module_name}:{int(import_target.is_package)}"
+
+    def get_imports(self, import_target: "ImportTarget") -> List["ImportLine"] | None:
+        lines = self.imports.get(self.import_key(import_target))
+        if lines is None:
+            return None
+        return [ImportLine(module_name, items) for module_name, items in lines]
+
+    def set_imports(self, import_target: "ImportTarget", import_lines: List["ImportLine"]) -> None:
+        lines = [[import_line.module_name, import_line.items] for import_line in import_lines]
+        self.imports[self.import_key(import_target)] = lines
+        self.new_imports[self.import_key(import_target)] = lines
+
+    def _build_path(self, export_dir: str) -> str:
+        digest = hashlib.sha256(os.path.abspath(export_dir).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, "builds", f"{digest}.json")
+
+    def get_build(self, export_dir: str) -> str | None:
+        return self._load(self._build_path(export_dir)).get("fingerprint")
+
+    def set_build(self, export_dir: str, fingerprint: str) -> None:
+        self._write(self._build_path(export_dir), {"export_dir": os.path.abspath(export_dir), "fingerprint": fingerprint})
+
+    def save(self) -> None:
+        if not self.new_imports:
+            return
+        # Merge with entries other runs may have written since this one started
+        imports = self._load(self.imports_path)
+        imports.update(self.new_imports)
+        self._write(self.imports_path, imports)
+        self.new_imports = {}
+
+
 class Packager:
     def __init__(
         self,
@@ -89,6 +176,7 @@ class Packager:
         export_dir: str,
         sys_paths: List[str] | None = None,
         additional_modules: List[str] | None = None,
+        cache: BuildCache | None = None,
     ):
         if sys_paths is None:
             sys_paths = []
@@ -105,13 +193,22 @@ class Packager:
         self.stdlib_modules: List[str] = []
         self.external_modules: List[ExternalModule] = []
         self.unknown_modules: List[str] = []
+        self.cache = cache
+        self.collected = False
+        # Lists above keep discovery order for callers; these mirror them for O(1) membership checks
+        self.seen_modules: Set[ImportTarget] = set()
+        self.seen_top_level_modules: Set[str] = set()
+        # Memoized filesystem lookups and module name resolution
+        self.directory_listings: Dict[str, FrozenSet[str]] = {}
+        self.resolved_module_names: Dict[str, ImportTarget | None] = {}
 
     ##########################
     # Dicovering import line #
     ##########################
-    def process_import_line(self, import_line: ImportLine) -> None:
+    def process_import_line(self, import_line: ImportLine) -> List[ImportTarget]:
         """
-        Process an import line by finding possible import targets and discovering them.
+        Process an import line by finding possible import targets and return the ones not seen before,
+        which still have to be discovered.
         Note that if the import line is coming from third-party modules like `import json` or `from io import BytesIO`,
         possible_import_targets will be empty because find_valid_module_names will return only None
         """
@@ -119,11 +216,15 @@ class Packager:
         possible_import_targets = self.find_possible_import_targets(import_line)
 
         if not possible_import_targets:
-            # Check if it's a stdlib module
             module_name = import_line.module_name.split(".")[0]
+            # Stdlib/external/unknown classification only depends on the top-level name
+            if module_name in self.seen_top_level_modules:
+                return []
+            self.seen_top_level_modules.add(module_name)
+
+            # Check if it's a stdlib module
             if module_name in sys.stdlib_module_names:
-                if module_name not in self.stdlib_modules:
-                    self.stdlib_modules.append(module_name)
+                self.stdlib_modules.append(module_name)
             else:
                 # Try to get version info
                 try:
@@ -135,13 +236,16 @@ class Packager:
                     if external_module not in self.external_modules:
                         self.external_modules.append(external_module)
                 except (PackageNotFoundError, KeyError):
-                    if module_name not in self.unknown_modules:
-                        self.unknown_modules.append(module_name)
-        else:
-            for possible_import_target in possible_import_targets:
-                if possible_import_target not in self.modules:
-                    self.modules.append(possible_import_target)
-                    self.discover_module(possible_import_target)
+                    self.unknown_modules.append(module_name)
+            return []
+
+        new_import_targets = []
+        for possible_import_target in possible_import_targets:
+            if possible_import_target not in self.seen_modules:
+                self.seen_modules.add(possible_import_target)
+                self.modules.append(possible_import_target)
+                new_import_targets.append(possible_import_target)
+        return new_import_targets
 
     def find_possible_import_targets(self, import_line: ImportLine) -> List[ImportTarget]:
         """
@@ -159,10 +263,36 @@ class Packager:
         ]
 
         # Filter valid module names
-        import_targets = [self.find_valid_module_names(module_name) for module_name in module_names]
+        import_targets = [self.resolve_module_name(module_name) for module_name in module_names]
         import_targets = [import_target for import_target in import_targets if import_target is not None]
         return import_targets
 
+    def resolve_module_name(self, module_name: str) -> ImportTarget | None:
+        """
+        Memoized find_valid_module_names: the same names are looked up from many files
+        """
+        if module_name not in self.resolved_module_names:
+            self.resolved_module_names[module_name] = self.find_valid_module_names(module_name)
+        return self.resolved_module_names[module_name]
+
+    def list_directory(self, directory: str) -> FrozenSet[str]:
+        """
+        Cached directory listing, empty if the directory does not exist
+        """
+        if directory not in self.directory_listings:
+            try:
+                self.directory_listings[directory] = frozenset(os.listdir(directory))
+            except OSError:
+                self.directory_listings[directory] = frozenset()
+        return self.directory_listings[directory]
+
+    def path_exists(self, path: str) -> bool:
+        """
+        os.path.exists answered from the directory listing cache, so each directory is read once per run
+        """
+        directory, name = os.path.split(path)
+        return name in self.list_directory(directory)
+
     def find_valid_module_names(self, module_name: str) -> ImportTarget | None:
         """
         Try to find a valid file for the given module name. Return None if not found.
@@ -182,7 +312,7 @@ class Packager:
                 Returns the first valid one, otherwise returns None
                 """
                 full_module_path = os.path.join(sys_path, relative_path)
-                if os.path.exists(full_module_path):
+                if self.path_exists(full_module_path):
                     """
                     In case sys_path=src and module_name=module.submodule, these are the two possible options:
                     ImportTarget(
@@ -212,16 +342,31 @@ class Packager:
     ######################
     def discover_module(self, import_target: ImportTarget) -> None:
         """
-        Find all import lines in the import_target and process them
+        Find all import lines in the import_target and process them, then do the same for every newly
+        found module. Uses a work list instead of recursion so deep import chains cannot hit the recursion limit
         """
 
-        import_lines = self.find_import_statements(import_target)
-        for import_line in import_lines:
-            self.process_import_line(import_line)
+        pending = [import_target]
+        while pending:
+            for import_line in self.find_import_statements(pending.pop()):
+                pending.extend(self.process_import_line(import_line))
 
     def find_import_statements(self, import_target: ImportTarget) -> List[ImportLine]:
         """
-        Find all import lines in the import_target
+        Find all import lines in the import_target, reusing the lines cached for identical file content
+        """
+        if self.cache is None:
+            return self.parse_import_statements(import_target)
+
+        import_lines = self.cache.get_imports(import_target)
+        if import_lines is None:
+            import_lines = self.parse_import_statements(import_target)
+            self.cache.set_imports(import_target, import_lines)
+        return import_lines
+
+    def parse_import_statements(self, import_target: ImportTarget) -> List[ImportLine]:
+        """
+        Parse the import_target and collect its import lines
         """
 
         # Get the AST of the file
@@ -340,11 +485,44 @@ class Packager:
             self.entry_file_path, relative_path=os.path.basename(self.entry_file_path), is_package=False, module_name=""
         )
         self.modules = [initial_import_target]
+        self.seen_modules = {initial_import_target}
         self.discover_module(initial_import_target)
+        self.collected = True
         return self.modules
 
+    def fingerprint(self, options: dict) -> str:
+        """
+        Hash everything a build depends on: the content of every collected module and additional
+        module file, the resolved external module versions, the build options and this packager itself
+        """
+        if not self.collected:
+            self.collect_modules()
+
+        additional_files = []
+        for path in sorted(self.additional_modules):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    full_path = os.path.join(root, name)
+                    additional_files.append([os.path.relpath(full_path, path), file_hash(full_path)])
+
+        content = {
+            "modules": sorted([module.relative_path, module.get_content_hash()] for module in self.modules),
+            "additional_modules": additional_files,
+            "external_modules": sorted(str(module) for module in self.external_modules),
+            "options": options,
+            "packager": file_hash(os.path.abspath(__file__)),
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+    def is_up_to_date(self, fingerprint: str) -> bool:
+        """Whether the export directory already holds a build with this fingerprint"""
+        if self.cache is None or self.cache.get_build(self.export_dir) != fingerprint:
+            return False
+        return all(os.path.exists(os.path.join(self.export_dir, module.relative_path)) for module in self.modules)
+
     def package(self) -> None:
-        modules = self.collect_modules()
+        modules = self.modules if self.collected else self.collect_modules()
         export_dir_full_path = os.path.abspath(self.export_dir)
 
         if os.path.exists(export_dir_full_path):
@@ -355,7 +533,8 @@ class Packager:
             path_suffix = module.relative_path
             new_path = os.path.join(export_dir_full_path, path_suffix)
             Path(os.path.dirname(new_path)).mkdir(parents=True, exist_ok=True)
-            shutil.copy(module.absolute_path, new_path)
+            # Content only: source permissions and mtimes differ between checkouts and are normalized later
+            shutil.copyfile(module.absolute_path, new_path)
 
         for path in self.additional_modules:
             if os.path.isdir(path):
@@ -368,22 +547,182 @@ class Packager:
 architecture_mapper = {"x86_64": "manylinux2014_x86_64", "arm64": "manylinux2014_aarch64"}
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("script")
-    parser.add_argument("--export-dir", required=True)
-    parser.add_argument("--sys-paths", nargs="*", default=[])
-    parser.add_argument("--additional-modules", nargs="*", default=[])
-    parser.add_argument("--extra-requirements", nargs="*", default=[])
-    parser.add_argument("--architecture", default="")
-    parser.add_argument("--install-dependencies", nargs="*", default=[])
-    parser.add_argument("--no-reqs", action="store_true")
-    args = parser.parse_args()
-
+###################
+# Reproducibility #
+###################
+# Zip timestamps cannot predate 1980; SOURCE_DATE_EPOCH is honoured like in other reproducible build tools
+REPRODUCIBLE_TIMESTAMP = max(int(os.environ.get("SOURCE_DATE_EPOCH", "315532800")), 315532800)
+FILE_MODE = 0o644
+DIRECTORY_MODE = 0o755
+
+
+def list_files(root: str) -> List[str]:
+    """Sorted POSIX paths of every file under root, relative to it. Zips are skipped like the Lambda module does"""
+    paths = []
+    for current, dirs, files in os.walk(root):
+        for name in files:
+            if not name.endswith(".zip"):
+                paths.append(os.path.relpath(os.path.join(current, name), root).replace(os.sep, "/"))
+    return sorted(paths)
+
+
+def normalize_tree(root: str) -> None:
+    """Give every file and directory the same permissions and timestamp, whatever machine built them"""
+    for current, dirs, files in os.walk(root):
+        for name in dirs:
+            os.chmod(os.path.join(current, name), DIRECTORY_MODE)
+        for name in files:
+            path = os.path.join(current, name)
+            os.chmod(path, FILE_MODE)
+            os.utime(path, (REPRODUCIBLE_TIMESTAMP, REPRODUCIBLE_TIMESTAMP))
+    for current, dirs, files in os.walk(root, topdown=False):
+        os.utime(current, (REPRODUCIBLE_TIMESTAMP, REPRODUCIBLE_TIMESTAMP))
+
+
+def write_deterministic_zip(source_dir: str, zip_path: str) -> str:
+    """Zip source_dir with sorted entries, fixed timestamps and permissions; return the sha256 of the archive"""
+    date_time = time.gmtime(REPRODUCIBLE_TIMESTAMP)[:6]
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for relative_path in list_files(source_dir):
+            info = zipfile.ZipInfo(relative_path, date_time=date_time)
+            info.create_system = 3  # Unix, so external_attr is read as a file mode
+            info.external_attr = (0o100000 | FILE_MODE) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(os.path.join(source_dir, relative_path), "rb") as file:
+                archive.writestr(info, file.read(), compresslevel=9)
+    return file_hash(zip_path)
+
+
+def tree_digest(root: str) -> Dict[str, str]:
+    return {relative_path: file_hash(os.path.join(root, relative_path)) for relative_path in list_files(root)}
+
+
+#######################
+# Bytecode compilation #
+#######################
+def find_interpreter(python_version: str) -> str | None:
+    """
+    Find an interpreter for the target runtime version (e.g. "3.12").
+    Bytecode is version specific, so it must be compiled by the same minor version Lambda runs
+    """
+    if f"{sys.version_info.major}.{sys.version_info.minor}" == python_version:
+        return sys.executable
+
+    interpreter = shutil.which(f"python{python_version}")
+    if interpreter is None:
+        return None
+    # Version managers install shims for versions that are not actually installed
+    completed = subprocess.run(
+        [interpreter, "-c", "import sys; print('%d.%d' % sys.version_info[:2])"], capture_output=True, text=True
+    )
+    if completed.returncode != 0 or completed.stdout.strip() != python_version:
+        return None
+    return interpreter
+
+
+# Where Lambda extracts function code; recorded in .pyc files instead of the machine-specific build path
+LAMBDA_TASK_ROOT = "/var/task"
+
+
+def precompile(export_dir: str, python_version: str, optimize: int = 0) -> bool:
+    """
+    Compile every .py file in export_dir to __pycache__/*.cpython-XY[.opt-N].pyc.
+    unchecked-hash pycs are never validated against source mtimes, so they stay valid after
+    zipping and extraction. Optimization levels above 0 are only loaded when the function runs
+    with PYTHONOPTIMIZE set to the same level, and then every library without matching
+    .opt-N.pyc files (including the runtime's boto3) is compiled from source on each cold start.
+    Returns False (and warns on stderr) when no interpreter for python_version is available
+    """
+    interpreter = find_interpreter(python_version)
+    if interpreter is None:
+        print(f"packager: python{python_version} not found, skipping bytecode compilation", file=sys.stderr)
+        return False
+
+    subprocess.run(
+        [
+            interpreter,
+            "-m",
+            "compileall",
+            "-q",
+            "-j",
+            "0",
+            "--invalidation-mode",
+            "unchecked-hash",
+            "-o",
+            str(optimize),
+            "-s",
+            os.path.abspath(export_dir),
+            "-p",
+            LAMBDA_TASK_ROOT,
+            os.path.abspath(export_dir),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.STDOUT,
+        check=True,
+    )
+    return True
+
+
+def measure_import_time(
+    interpreter: str, export_dir: str, module_name: str, use_bytecode: bool, optimize: int, repetitions: int
+) -> float:
+    """
+    Median time in ms for a fresh interpreter to import module_name from export_dir.
+    Without bytecode the import runs from a copy of export_dir without __pycache__ directories,
+    so only the packaged files lose their .pyc (installed libraries keep theirs, as on Lambda)
+    """
+    timings = []
+    with tempfile.TemporaryDirectory() as source_copy:
+        package_dir = os.path.abspath(export_dir)
+        if not use_bytecode:
+            package_dir = os.path.join(source_copy, "package")
+            shutil.copytree(export_dir, package_dir, ignore=shutil.ignore_patterns("__pycache__"))
+
+        script = (
+            "import sys, time\n"
+            f"sys.path.insert(0, {package_dir!r})\n"
+            "started = time.perf_counter()\n"
+            f"import {module_name}\n"
+            "print((time.perf_counter() - started) * 1000)\n"
+        )
+        env = {key: value for key, value in os.environ.items() if key not in ("PYTHONPATH", "AWS_LAMBDA_FUNCTION_NAME")}
+        env["PYTHONOPTIMIZE"] = str(optimize) if optimize else ""
+        for _ in range(repetitions):
+            completed = subprocess.run(
+                [interpreter, "-B", "-c", script], env=env, capture_output=True, text=True, check=True
+            )
+            timings.append(float(completed.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def compile_report(
+    export_dir: str, entry_file_path: str, python_version: str, optimize: int, repetitions: int = 5
+) -> dict:
+    """Compare the entry module's import (INIT) time from source against precompiled bytecode"""
+    interpreter = find_interpreter(python_version)
+    if interpreter is None:
+        return {"error": f"python{python_version} not found"}
+
+    module_name = os.path.splitext(os.path.basename(entry_file_path))[0]
+    from_source = measure_import_time(interpreter, export_dir, module_name, False, optimize, repetitions)
+    from_bytecode = measure_import_time(interpreter, export_dir, module_name, True, optimize, repetitions)
+    return {
+        "module": module_name,
+        "python_version": python_version,
+        "optimize": optimize,
+        "repetitions": repetitions,
+        "import_ms_source": round(from_source, 2),
+        "import_ms_bytecode": round(from_bytecode, 2),
+        "saving_ms": round(from_source - from_bytecode, 2),
+    }
+
+
+def build(args: argparse.Namespace, export_dir: str, cache: BuildCache | None = None) -> bool:
+    """
+    Build the package described by args into export_dir. Returns True when the cache showed the
+    existing build is still current and nothing was written
+    """
     entry_file_path = args.script
-    export_dir = args.export_dir
-    sys_paths = args.sys_paths
-    additional_modules = args.additional_modules
     extra_requirements = args.extra_requirements
     install_dependencies = args.install_dependencies
     generate_requirements = not args.no_reqs
@@ -391,12 +730,33 @@ def main() -> None:
     packager = Packager(
         entry_file_path=entry_file_path,
         export_dir=export_dir,
-        sys_paths=list(set(sys_paths)),
-        additional_modules=list(set(additional_modules)),
+        sys_paths=list(set(args.sys_paths)),
+        additional_modules=list(set(args.additional_modules)),
+        cache=cache,
     )
+
+    fingerprint = None
+    if cache is not None:
+        options = {
+            "extra_requirements": extra_requirements,
+            "architecture": args.architecture,
+            "install_dependencies": install_dependencies,
+            "generate_requirements": generate_requirements,
+            "precompile": args.precompile,
+            "optimize": args.optimize,
+            "source_date_epoch": REPRODUCIBLE_TIMESTAMP,
+        }
+        fingerprint = packager.fingerprint(options)
+        cache.save()
+        if packager.is_up_to_date(fingerprint):
+            return True
+
     packager.package()
 
     if install_dependencies and len(install_dependencies) > 0:
+        # pip --target puts console scripts in bin/ with a shebang pointing at the local interpreter
+        scripts_dir = os.path.join(export_dir, "bin")
+        had_scripts_dir = os.path.exists(scripts_dir)
         for dependency in install_dependencies:
             subprocess.run(
                 [
@@ -414,6 +774,14 @@ def main() -> None:
                 stderr=subprocess.STDOUT,
                 check=True,
             )
+        if not had_scripts_dir and os.path.isdir(scripts_dir):
+            shutil.rmtree(scripts_dir)
+
+    if args.precompile:
+        compiled = precompile(export_dir, args.precompile, args.optimize)
+        if compiled and args.compile_report:
+            report = compile_report(export_dir, entry_file_path, args.precompile, args.optimize)
+            print(json.dumps(report), file=sys.stderr)
 
     if generate_requirements:
         # subprocess.run(["pipreqs", "--mode=gt", export_dir], stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
@@ -437,7 +805,71 @@ def main() -> None:
                 for dependency in extra_requirements:
                     f.write(f"{dependency}\n")
 
-    result = {"success": "true", "build_directory": os.path.normpath(export_dir)}
+    normalize_tree(export_dir)
+
+    if cache is not None:
+        cache.set_build(export_dir, fingerprint)
+    return False
+
+
+def verify_reproducibility(args: argparse.Namespace) -> dict:
+    """
+    Build twice from scratch into separate directories and compare every file and the resulting zip.
+    The cache is not used, so both builds really run
+    """
+    with tempfile.TemporaryDirectory(prefix="packager-verify-") as temp_dir:
+        digests = []
+        zip_hashes = []
+        for attempt in ("a", "b"):
+            export_dir = os.path.join(temp_dir, attempt, "build")
+            build(args, export_dir)
+            digests.append(tree_digest(export_dir))
+            zip_hashes.append(write_deterministic_zip(export_dir, os.path.join(temp_dir, attempt, "build.zip")))
+
+    first, second = digests
+    differences = sorted(path for path in set(first) | set(second) if first.get(path) != second.get(path))
+    return {
+        "reproducible": "true" if not differences and zip_hashes[0] == zip_hashes[1] else "false",
+        "files": str(len(first)),
+        "zip_sha256": zip_hashes[0],
+        "differences": ",".join(differences),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("script")
+    parser.add_argument("--export-dir", required=True)
+    parser.add_argument("--sys-paths", nargs="*", default=[])
+    parser.add_argument("--additional-modules", nargs="*", default=[])
+    parser.add_argument("--extra-requirements", nargs="*", default=[])
+    parser.add_argument("--architecture", default="")
+    parser.add_argument("--install-dependencies", nargs="*", default=[])
+    parser.add_argument("--no-reqs", action="store_true")
+    parser.add_argument("--precompile", metavar="PYTHON_VERSION", help="Emit .pyc files for this runtime, e.g. 3.12")
+    parser.add_argument("--optimize", type=int, choices=[0, 1, 2], default=0)
+    parser.add_argument("--compile-report", action="store_true", help="Print import time with/without .pyc to stderr")
+    parser.add_argument("--cache-dir", help="Reuse discovered imports and skip unchanged builds using this directory")
+    parser.add_argument("--zip", help="Also write a deterministic zip of the export directory to this path")
+    parser.add_argument(
+        "--verify-reproducibility",
+        action="store_true",
+        help="Build twice in temporary directories and exit non-zero if the outputs differ",
+    )
+    args = parser.parse_args()
+
+    if args.verify_reproducibility:
+        report = verify_reproducibility(args)
+        print(json.dumps(report))
+        sys.exit(0 if report["reproducible"] == "true" else 1)
+
+    export_dir = args.export_dir
+    cache = BuildCache(args.cache_dir) if args.cache_dir else None
+    cached = build(args, export_dir, cache)
+
+    result = {"success": "true", "build_directory": os.path.normpath(export_dir), "cached": str(cached).lower()}
+    if args.zip:
+        result["zip_sha256"] = write_deterministic_zip(export_dir, args.zip)
     print(json.dumps(result))
 
 
@@ -7,6 +7,8 @@ data "external" "packager_program" {
     length(var.additional_modules) > 0 ? flatten(["--additional-modules", var.additional_modules]) : [],
     length(var.extra_requirements) > 0 ? flatten(["--extra-requirements", var.extra_requirements]) : [],
     var.install_dependencies != null ? flatten(["--architecture", var.install_dependencies.architecture, "--install-dependencies", var.install_dependencies.dependencies]) : [],
-    var.no_reqs ? ["--no-reqs"] : []
+    var.no_reqs ? ["--no-reqs"] : [],
+    var.precompile != null ? ["--precompile", var.precompile.python_version, "--optimize", tostring(var.precompile.optimize)] : [],
+    var.cache_dir != null ? ["--cache-dir", var.cache_dir] : []
   ])
 }
@@ -68,3 +68,36 @@ variable "no_reqs" {
   description = "Whether to skip generating requirements.txt file."
   default     = false
 }
+
+###########
+# Bytecode
+###########
+
+variable "precompile" {
+  type = object({
+    python_version = string
+    optimize       = optional(number, 0)
+  })
+  description = "Emit unchecked-hash .pyc files for the target runtime (e.g. `3.12`) so cold starts skip compilation. Needs a matching `python<version>` on the machine running Terraform, otherwise compilation is skipped. `optimize` 1 or 2 (-O/-OO) is only used when the function sets PYTHONOPTIMIZE to the same level, which also makes the runtime's own boto3 compile from source; keep 0 unless every imported library is bundled."
+  default     = null
+
+  validation {
+    condition     = var.precompile == null ? true : can(regex("^3\\.[0-9]+$", var.precompile.python_version))
+    error_message = "`precompile.python_version` must look like `3.12`."
+  }
+
+  validation {
+    condition     = var.precompile == null ? true : contains([0, 1, 2], var.precompile.optimize)
+    error_message = "Valid values for `precompile.optimize`: [0, 1, 2]."
+  }
+}
+
+###########
+# Caching
+###########
+
+variable "cache_dir" {
+  type        = string
+  description = "Directory for the incremental build cache. Discovered imports are cached by file content hash, and when nothing the build depends on has changed, the export directory is left untouched instead of being rebuilt. Set to null to always rebuild."
+  default     = null
+}
@@ -1,17 +1,53 @@
+const fs = require('fs');
+const path = require('path');
 const jwt = require('jsonwebtoken');
 const jwksClient = require('jwks-rsa');
 
+// JWKS snapshot baked into the bundle at deploy time (infra/modules/util_packager/jwks_snapshot),
+// so a cold start verifies tokens without fetching the JWKS first. It is trusted until it is
+// JWKS_SNAPSHOT_MAX_AGE_SECONDS old; unknown kids still go to the network
+const JWKS_SNAPSHOT_PATH = process.env.JWKS_SNAPSHOT_PATH || path.join(__dirname, 'jwks_snapshot', 'jwks.json');
+const JWKS_SNAPSHOT_MAX_AGE_SECONDS = Number(process.env.JWKS_SNAPSHOT_MAX_AGE_SECONDS || 86400);
+
+function loadJwksSnapshot(jwksUri) {
+  try {
+    const snapshot = JSON.parse(fs.readFileSync(JWKS_SNAPSHOT_PATH, 'utf8'));
+    if (snapshot.url !== jwksUri || !Array.isArray(snapshot.keys)) {
+      console.warn(`WARNING: JWKS snapshot ${JWKS_SNAPSHOT_PATH} has no keys for ${jwksUri}, fetching instead`);
+      return null;
+    }
+    return snapshot;
+  } catch (err) {
+    if (err.code !== 'ENOENT') {
+      console.warn(`WARNING: Ignoring JWKS snapshot ${JWKS_SNAPSHOT_PATH}: ${err.message}`);
+    }
+    return null;
+  }
+}
+
+// Keys offered to jwks-rsa before it fetches; an empty list (no or old snapshot) makes it fetch
+function snapshotKeys(snapshot) {
+  if (!snapshot) {
+    return [];
+  }
+  const age = Date.now() / 1000 - Number(snapshot.fetched_at || 0);
+  return age < JWKS_SNAPSHOT_MAX_AGE_SECONDS ? snapshot.keys : [];
+}
+
 // Initialize JWKS client
 let client;
 
 function getJwksClient(auth0Domain) {
   if (!client) {
+    const jwksUri = `https://${auth0Domain}/.well-known/jwks.json`;
+    const snapshot = loadJwksSnapshot(jwksUri);
     client = jwksClient({
-      jwksUri: `https://${auth0Domain}/.well-known/jwks.json`,
+      jwksUri: jwksUri,
       cache: true,
       cacheMaxAge: 600000, // 10 minutes
       rateLimit: true,
-      jwksRequestsPerMinute: 10
+      jwksRequestsPerMinute: 10,
+      getKeysInterceptor: () => snapshotKeys(snapshot)
     });
   }
   return client;
@@ -1,8 +1,7 @@
 import os
-import json
 import jwt
-from jwt import PyJWKClient
-from typing import Dict, Any
+from typing import Dict, Any, List
+from common.auth import verify_token, allowed_resources, stage_arn, JwksError
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -37,33 +36,21 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         raise Exception("Unauthorized")
     
     try:
-        # Get the JWKS URL from Auth0 domain
-        jwks_url = f'https://{auth0_domain}/.well-known/jwks.json'
-        
-        # Create JWKS client to fetch public keys
-        jwks_client = PyJWKClient(jwks_url)
-        
-        # Get the signing key from the token
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
-        
-        # Decode and verify the token
-        payload = jwt.decode(
-            token,
-            signing_key.key,
-            algorithms=["RS256"],
-            audience=auth0_audience,
-            issuer=f'https://{auth0_domain}/'
-        )
+        payload = verify_token(token, auth0_domain, auth0_audience)
         
         # Extract user ID (sub claim)
         user_id = payload.get('sub', 'user')
         
         print(f"Successfully authenticated user: {user_id}")
         
-        # Generate IAM policy allowing access
-        policy = generate_policy(user_id, 'Allow', event['methodArn'], payload)
-        
-        return policy
+        # API Gateway caches the policy per token and checks it against every later route,
+        # so it has to cover the whole stage rather than this request's methodArn
+        resources = allowed_resources(event['methodArn'], payload)
+        if not resources:
+            print(f"User {user_id} has no scope that grants access to this API")
+            return generate_policy(user_id, 'Deny', [stage_arn(event['methodArn']) + '/*'], payload)
+
+        return generate_policy(user_id, 'Allow', resources, payload)
         
     except jwt.ExpiredSignatureError:
         print("ERROR: Token has expired")
@@ -77,19 +64,22 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     except jwt.InvalidTokenError as e:
         print(f"ERROR: Invalid token: {str(e)}")
         raise Exception("Unauthorized")
+    except JwksError as e:
+        print(f"ERROR: No signing key: {str(e)}")
+        raise Exception("Unauthorized")
     except Exception as e:
         print(f"ERROR: Unexpected error during token validation: {str(e)}")
         raise Exception("Unauthorized")
 
 
-def generate_policy(principal_id: str, effect: str, resource: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+def generate_policy(principal_id: str, effect: str, resources: List[str], payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Generate an IAM policy document for API Gateway.
     
     Args:
         principal_id: User identifier from the token
         effect: 'Allow' or 'Deny'
-        resource: ARN of the API Gateway method
+        resources: Method ARN patterns the statement applies to
         payload: Decoded JWT payload
         
     Returns:
@@ -105,7 +95,7 @@ def generate_policy(principal_id: str, effect: str, resource: str, payload: Dict
                 {
                     'Action': 'execute-api:Invoke',
                     'Effect': effect,
-                    'Resource': resource
+                    'Resource': resources
                 }
             ]
         },
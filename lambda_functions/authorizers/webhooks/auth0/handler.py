@@ -25,7 +25,13 @@ def handler(event, context):
     return generate_policy("Deny", event["methodArn"])
 
 
-def generate_policy(effect, resource):
+def stage_resource(method_arn):
+    # Cached per secret and reused for every route behind this authorizer, so cover the stage
+    api_arn, stage = method_arn.split("/")[:2]
+    return f"{api_arn}/{stage}/*"
+
+
+def generate_policy(effect, method_arn):
     return {
         "principalId": "webhook",
         "policyDocument": {
@@ -34,7 +40,7 @@ def generate_policy(effect, resource):
                 {
                     "Action": "execute-api:Invoke",
                     "Effect": effect,
-                    "Resource": resource,
+                    "Resource": stage_resource(method_arn),
                 }
             ],
         },
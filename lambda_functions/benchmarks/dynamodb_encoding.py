@@ -0,0 +1,111 @@
+"""
+Compare the two ways a trial-wide submission list can get from DynamoDB's wire
+format to a JSON response body:
+
+- resource: TypeDeserializer (what boto3.resource does) builds Decimals, then
+  json.dumps calls decimal_default once per number
+- native: common.dynamodb.item_from_wire builds int/float directly, then a plain json.dumps
+
+Runs offline on synthetic items shaped like real submissions.
+
+    python lambda_functions/benchmarks/dynamodb_encoding.py --items 10000 --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from decimal import Decimal
+from boto3.dynamodb.types import TypeDeserializer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from common.dynamodb import item_from_wire, item_to_wire
+
+OUTCOMES = ['sweetness', 'texture', 'aroma', 'overall']
+
+
+def decimal_default(obj):
+    """Same hook as the entity handlers"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def make_wire_items(count: int, seed: int = 0):
+    """Build typed items resembling one trial's submissions, with notes and transcriptions"""
+    rng = random.Random(seed)
+    items = []
+    for index in range(count):
+        participant_id = f"participant-{index // 40}"
+        recipe_id = f"recipe-{(index // 4) % 10}"
+        outcome = OUTCOMES[index % 4]
+        items.append(item_to_wire({
+            'submission_id': f"{participant_id}::{recipe_id}::{outcome}",
+            'recipe_id': recipe_id,
+            'trial_id': "trial-benchmark",
+            'participant_id': participant_id,
+            'score': Decimal(str(rng.randint(0, 20) / 2)),
+            'status': rng.choice(['draft', 'saved']),
+            'notes': "Slightly too sweet, good crumb. " * rng.randint(0, 4),
+            'transcription': "I think this one is a bit sweeter than the last one. " * rng.randint(0, 3),
+            'version': Decimal(rng.randint(1, 5)),
+            'created_at': "2024-12-11T10:00:00.000000",
+            'last_updated': "2024-12-11T10:05:00.000000"
+        }))
+    return items
+
+
+def encode_resource(wire_items):
+    deserializer = TypeDeserializer()
+    items = [{key: deserializer.deserialize(value) for key, value in item.items()} for item in wire_items]
+    return json.dumps({'data': items}, default=decimal_default)
+
+
+def encode_native(wire_items):
+    items = [item_from_wire(item) for item in wire_items]
+    return json.dumps({'data': items})
+
+
+def measure(function, wire_items, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(wire_items)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    wire_items = make_wire_items(args.items)
+    assert json.loads(encode_resource(wire_items)) == json.loads(encode_native(wire_items))
+
+    results = {}
+    for name, function in (('resource', encode_resource), ('native', encode_native)):
+        timings = measure(function, wire_items, args.repeat)
+        results[name] = {
+            'median_ms': round(statistics.median(timings) * 1000, 2),
+            'min_ms': round(min(timings) * 1000, 2)
+        }
+    results['speedup'] = round(results['resource']['median_ms'] / results['native']['median_ms'], 2)
+
+    if args.json:
+        print(json.dumps({'items': args.items, 'repeat': args.repeat, **results}))
+        return
+
+    print(f"{args.items} items, {args.repeat} runs")
+    for name in ('resource', 'native'):
+        print(f"  {name:<9} median {results[name]['median_ms']:>9.2f} ms   min {results[name]['min_ms']:>9.2f} ms")
+    print(f"  speedup   {results['speedup']}x")
+
+
+if __name__ == '__main__':
+    main()
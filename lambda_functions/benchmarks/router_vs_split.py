@@ -0,0 +1,283 @@
+"""
+Cold-start rate and latency percentiles of the per-entity functions ("split") versus the
+single router function ("unified") under proctor session traffic.
+
+Two steps:
+
+1. Measure, in fresh interpreters against the local DynamoDB/S3 stand-in (moto's server):
+   interpreter start, handler INIT, the first response of a new container and warm responses.
+   For the router, the first request per entity also pays that entity's lazy import.
+2. Replay a simulated session against a model of Lambda's container pool using those costs.
+   Proctors send requests with exponential think times and an entity mix. A request takes an
+   idle container of its function if one was used within --idle-timeout, otherwise a new
+   container is started (a cold start). Every function scales on its own.
+
+    python lambda_functions/benchmarks/router_vs_split.py --proctors 8 --sessions 3
+
+The measured costs are local; the relative difference between deployments is the point,
+not the absolute numbers. Real Lambda adds runtime bootstrap and code download on top of
+every cold start, which widens the gap.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List
+
+LAMBDA_FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+
+from local.aws import start_local_aws, connect, seed_trial, lambda_environment
+from local.cold_start import SAMPLE_EVENTS
+
+# Entity -> handler directory, and the default share of session traffic
+ENTITIES = {
+    'participant': 'participant',
+    'recipe': 'recipe',
+    'trial': 'trial',
+    'submission': 'submission',
+    'voice-memo': 'voice_memo',
+}
+DEFAULT_MIX = {'submission': 0.45, 'participant': 0.15, 'recipe': 0.15, 'trial': 0.15, 'voice-memo': 0.10}
+ROUTER_PATHS = [os.path.join(LAMBDA_FUNCTIONS_DIR, 'router'), LAMBDA_FUNCTIONS_DIR] + [
+    os.path.join(LAMBDA_FUNCTIONS_DIR, directory) for directory in ('participant', 'recipe', 'trial', 'submission')
+]
+
+# Runs in the fresh interpreter: import the handler, then answer each event in order
+CHILD_SCRIPT = """
+import sys, time, json, os
+started = time.perf_counter()
+sys.path[:0] = {paths!r}
+import handler
+init_ms = (time.perf_counter() - started) * 1000
+timings = []
+for event in json.loads(os.environ['BENCH_EVENTS']):
+    invoked = time.perf_counter()
+    response = handler.handler(event, None)
+    timings.append([(time.perf_counter() - invoked) * 1000, response['statusCode']])
+print(json.dumps({{'init_ms': init_ms, 'timings': timings}}))
+"""
+
+
+def run_child(paths: List[str], events: List[Dict[str, Any]], environment: Dict[str, str]) -> Dict[str, Any]:
+    env = dict(os.environ, **environment)
+    env['BENCH_EVENTS'] = json.dumps(events)
+    # Lambda sets this; prewarm() only builds services when it is present
+    env['AWS_LAMBDA_FUNCTION_NAME'] = 'router-vs-split'
+    env.pop('PYTHONPATH', None)
+    completed = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT.format(paths=paths)],
+        env=env, capture_output=True, text=True, cwd=paths[0]
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark child failed:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    failed = [status for _, status in result['timings'] if status >= 500]
+    if failed:
+        raise RuntimeError(f"Handler returned {failed} for {paths[0]}")
+    return result
+
+
+def interpreter_start_ms(repetitions: int) -> float:
+    timings = []
+    for _ in range(repetitions):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure_costs(environment: Dict[str, str], repetitions: int, warm_requests: int) -> Dict[str, Any]:
+    """Median costs (ms) of cold starts and warm requests for both deployments"""
+    split: Dict[str, Dict[str, float]] = {}
+    for entity, directory in ENTITIES.items():
+        paths = [os.path.join(LAMBDA_FUNCTIONS_DIR, directory), LAMBDA_FUNCTIONS_DIR]
+        runs = [run_child(paths, [SAMPLE_EVENTS[directory]] * (warm_requests + 1), environment)
+                for _ in range(repetitions)]
+        split[entity] = {
+            'init_ms': statistics.median(run['init_ms'] for run in runs),
+            'first_ms': statistics.median(run['timings'][0][0] for run in runs),
+            'warm_ms': statistics.median(timing for run in runs for timing, _ in run['timings'][1:])
+        }
+
+    # A new router container: INIT, then the first request, which also imports what all entities share
+    router_entities: Dict[str, Dict[str, List[float]]] = {
+        entity: {'cold_first': [], 'lazy_first': [], 'warm': []} for entity in ENTITIES
+    }
+    router_init = []
+    for entity, directory in ENTITIES.items():
+        for _ in range(repetitions):
+            run = run_child(ROUTER_PATHS, [SAMPLE_EVENTS[directory]], environment)
+            router_init.append(run['init_ms'])
+            router_entities[entity]['cold_first'].append(run['timings'][0][0])
+
+    # A warm router container seeing an entity for the first time: only that entity's lazy import.
+    # Every entity needs a turn that is not first
+    for repetition in range(max(repetitions, len(ENTITIES))):
+        # Rotate the order so no entity always pays for modules shared with the others
+        order = list(ENTITIES)[repetition % len(ENTITIES):] + list(ENTITIES)[:repetition % len(ENTITIES)]
+        events = [SAMPLE_EVENTS[ENTITIES[entity]] for entity in order]
+        events += [SAMPLE_EVENTS[ENTITIES[entity]] for entity in order for _ in range(warm_requests)]
+        run = run_child(ROUTER_PATHS, events, environment)
+        for position, entity in enumerate(order[1:], start=1):
+            router_entities[entity]['lazy_first'].append(run['timings'][position][0])
+        for position, (timing, _) in enumerate(run['timings'][len(order):]):
+            router_entities[order[position // warm_requests]]['warm'].append(timing)
+
+    return {
+        'interpreter_ms': interpreter_start_ms(repetitions),
+        'split': split,
+        'router': {
+            'init_ms': statistics.median(router_init),
+            'entities': {
+                entity: {
+                    'cold_first_ms': statistics.median(values['cold_first']),
+                    'lazy_first_ms': statistics.median(values['lazy_first']),
+                    'warm_ms': statistics.median(values['warm'])
+                }
+                for entity, values in router_entities.items()
+            }
+        }
+    }
+
+
+def generate_requests(
+    proctors: int, sessions: int, session_minutes: float, think_seconds: float, mix: Dict[str, float], seed: int
+) -> List[tuple]:
+    """(time in ms, entity) for every request; sessions are a day apart, so each starts with no warm containers"""
+    rng = random.Random(seed)
+    entities, weights = list(mix), list(mix.values())
+    requests = []
+    for session in range(sessions):
+        session_start = session * 24 * 3600 * 1000
+        session_end = session_start + session_minutes * 60 * 1000
+        for _ in range(proctors):
+            now = session_start + rng.uniform(0, 60 * 1000)
+            while now < session_end:
+                requests.append((now, rng.choices(entities, weights)[0]))
+                now += rng.expovariate(1 / think_seconds) * 1000
+    return sorted(requests)
+
+
+def simulate(requests: List[tuple], costs: Dict[str, Any], unified: bool, idle_timeout_ms: float) -> Dict[str, Any]:
+    """Replay requests against per-function container pools; a container serves one request at a time"""
+    pools: Dict[str, List[Dict[str, Any]]] = {}
+    latencies = []
+    cold_starts = 0
+    lazy_imports = 0
+    containers = 0
+    for arrival, entity in requests:
+        function = 'router' if unified else entity
+        pool = [
+            container for container in pools.get(function, [])
+            if arrival - container['idle_since'] <= idle_timeout_ms or container['busy_until'] > arrival
+        ]
+        pools[function] = pool
+        idle = [container for container in pool if container['busy_until'] <= arrival]
+
+        if idle:
+            # Lambda favours the most recently used container
+            container = max(idle, key=lambda candidate: candidate['idle_since'])
+            if unified and entity not in container['loaded']:
+                latency = costs['router']['entities'][entity]['lazy_first_ms']
+                container['loaded'].add(entity)
+                lazy_imports += 1
+            else:
+                latency = (costs['router']['entities'][entity] if unified else costs['split'][entity])['warm_ms']
+        else:
+            cold_starts += 1
+            containers += 1
+            if unified:
+                latency = (costs['interpreter_ms'] + costs['router']['init_ms']
+                           + costs['router']['entities'][entity]['cold_first_ms'])
+            else:
+                split = costs['split'][entity]
+                latency = costs['interpreter_ms'] + split['init_ms'] + split['first_ms']
+            container = {'loaded': {entity}}
+            pool.append(container)
+
+        container['busy_until'] = arrival + latency
+        container['idle_since'] = arrival + latency
+        latencies.append(latency)
+
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))], 2)
+
+    return {
+        'requests': len(latencies),
+        'cold_starts': cold_starts,
+        'cold_start_rate': round(cold_starts / len(latencies), 4),
+        'lazy_entity_imports': lazy_imports,
+        'containers': containers,
+        'mean_ms': round(statistics.mean(latencies), 2),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'p999_ms': percentile(0.999),
+        'max_ms': round(ordered[-1], 2)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--proctors', type=int, default=8)
+    parser.add_argument('--sessions', type=int, default=3)
+    parser.add_argument('--session-minutes', type=float, default=90)
+    parser.add_argument('--think-seconds', type=float, default=20, help="Mean time between a proctor's requests")
+    parser.add_argument('--idle-timeout', type=float, default=10, help="Minutes an idle container stays warm")
+    parser.add_argument('--repetitions', '-n', type=int, default=5, help="Fresh interpreters per cost measurement")
+    parser.add_argument('--warm-requests', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--endpoint-url', help="Use an already running DynamoDB/S3 stand-in instead of moto")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        server, endpoint_url = start_local_aws()
+        seed_trial(connect(endpoint_url))
+    try:
+        costs = measure_costs(lambda_environment(endpoint_url), args.repetitions, args.warm_requests)
+    finally:
+        if server is not None:
+            server.stop()
+
+    requests = generate_requests(
+        args.proctors, args.sessions, args.session_minutes, args.think_seconds, DEFAULT_MIX, args.seed
+    )
+    idle_timeout_ms = args.idle_timeout * 60 * 1000
+    report = {
+        'python': sys.version.split()[0],
+        'workload': {key: getattr(args, key) for key in
+                     ('proctors', 'sessions', 'session_minutes', 'think_seconds', 'idle_timeout', 'seed')},
+        'costs': costs,
+        'split': simulate(requests, costs, unified=False, idle_timeout_ms=idle_timeout_ms),
+        'unified': simulate(requests, costs, unified=True, idle_timeout_ms=idle_timeout_ms)
+    }
+
+    print(f"{'deployment':<10} {'requests':>9} {'cold':>6} {'cold rate':>10} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'p99.9 ms':>9} {'max ms':>8}", file=sys.stderr)
+    for name in ('split', 'unified'):
+        result = report[name]
+        print(f"{name:<10} {result['requests']:>9} {result['cold_starts']:>6} {result['cold_start_rate']:>10.2%} "
+              f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['p999_ms']:>9.1f} "
+              f"{result['max_ms']:>8.1f}",
+              file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Cost of authorizing a repeated bearer token with and without the verified-token cache:
+
+- verify: what the JWT authorizer does on a cache miss, i.e. read the kid, look the key up in
+  the (already fetched) JWKS cache and run jwt.decode with RS256, audience and issuer checks
+- hit: VerifiedTokenCache.get on a token that is cached, i.e. a SHA-256 digest and an LRU lookup
+- miss: VerifiedTokenCache.get on an unknown token, the overhead added in front of verify
+
+Runs offline with a throwaway RSA key and Auth0-shaped tokens. --tokens sets how many distinct
+tokens (proctors) are in rotation; keep it below the cache size to measure hits only.
+
+    python lambda_functions/benchmarks/token_cache.py --iterations 2000 --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import jwt
+from jwt.algorithms import RSAAlgorithm
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from common.jwks import JwksCache
+from common.tokens import VerifiedTokenCache
+
+DOMAIN = 'benchmark.auth0.local'
+AUDIENCE = 'https://api.benchmark.local'
+
+
+def make_tokens(count: int, key_size: int):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    jwk = json.loads(RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update({'kid': 'benchmark-key', 'use': 'sig', 'alg': 'RS256'})
+    jwks = JwksCache(f'https://{DOMAIN}/.well-known/jwks.json')
+    jwks.load({'keys': [jwk]})
+
+    now = int(time.time())
+    tokens = [
+        jwt.encode(
+            {
+                'sub': f'auth0|proctor-{index}', 'iss': f'https://{DOMAIN}/', 'aud': AUDIENCE,
+                'iat': now, 'exp': now + 86400, 'scope': 'openid profile email',
+                'azp': 'benchmark-client', 'permissions': []
+            },
+            key, algorithm='RS256', headers={'kid': 'benchmark-key'}
+        )
+        for index in range(count)
+    ]
+    return jwks, tokens
+
+
+def verify(jwks: JwksCache, token: str):
+    signing_key = jwks.get_signing_key(jwt.get_unverified_header(token).get('kid'))
+    return jwt.decode(token, signing_key.key, algorithms=['RS256'], audience=AUDIENCE, issuer=f'https://{DOMAIN}/')
+
+
+def measure(function, tokens, iterations: int, repeat: int):
+    """Microseconds per call, one value per run"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for index in range(iterations):
+            function(tokens[index % len(tokens)])
+        timings.append((time.perf_counter() - start) / iterations * 1e6)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tokens', type=int, default=50, help="Distinct tokens in rotation")
+    parser.add_argument('--key-size', type=int, default=2048)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    jwks, tokens = make_tokens(args.tokens, args.key_size)
+    cache = VerifiedTokenCache(max_entries=max(args.tokens, 1))
+    for token in tokens:
+        cache.put(token, verify(jwks, token))
+    unknown = [token + 'x' for token in tokens]
+
+    results = {}
+    for name, function, inputs in (
+        ('verify', lambda token: verify(jwks, token), tokens),
+        ('hit', cache.get, tokens),
+        ('miss', cache.get, unknown)
+    ):
+        timings = measure(function, inputs, args.iterations, args.repeat)
+        results[name] = {'median_us': round(statistics.median(timings), 2), 'min_us': round(min(timings), 2)}
+    results['speedup'] = round(results['verify']['median_us'] / results['hit']['median_us'], 1)
+
+    if args.json:
+        print(json.dumps({'iterations': args.iterations, 'repeat': args.repeat, 'tokens': args.tokens,
+                          'key_size': args.key_size, **results}))
+        return
+
+    print(f"{args.tokens} tokens, RSA-{args.key_size}, {args.iterations} calls x {args.repeat} runs")
+    for name in ('verify', 'hit', 'miss'):
+        print(f"  {name:<7} median {results[name]['median_us']:>9.2f} us   min {results[name]['min_us']:>9.2f} us")
+    print(f"  hit is {results['speedup']}x cheaper than verify")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+What verifying one Auth0 access token costs, per key type and per way of holding the key:
+
+- keys: RS256 with RSA-2048 (Auth0's default signing key) and RSA-3072, ES256 with P-256
+- jwk: the key is parsed from its JWKS entry (PyJWK) for every token, like a verifier
+  without a key cache
+- pem: the key is passed as PEM text and jwt.decode loads it for every token
+- parsed: the PyJWK is parsed once and its key reused, like common.jwks.JwksCache does
+
+Every mode runs jwt.decode with the audience and issuer checks the authorizer uses, single
+threaded and then on a thread pool (--threads), and reports latency percentiles and
+throughput. Keys and tokens are generated locally, nothing is fetched.
+
+To measure the versions in the python-dependencies layer rather than the local ones, install
+the layer's pins and point --site-dir at them; to approximate a Lambda-sized CPU share, limit
+the process (e.g. taskset -c 0, or docker run --cpus 1):
+
+    pip install --target /tmp/layer "PyJWT[crypto]==2.8.0" cryptography==41.0.7
+    python lambda_functions/benchmarks/token_verification.py --site-dir /tmp/layer --calls 2000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable
+
+DOMAIN = 'benchmark.auth0.local'
+AUDIENCE = 'https://api.benchmark.local'
+KEY_TYPES = ('RS256-2048', 'RS256-3072', 'ES256-P256')
+MODES = ('jwk', 'pem', 'parsed')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=1000, help="Verifications per run")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per case; the median run is reported")
+    parser.add_argument('--tokens', type=int, default=50, help="Distinct tokens in rotation")
+    parser.add_argument('--threads', type=int, default=4, help="Thread pool size; 0 skips the pool runs")
+    parser.add_argument('--keys', nargs='+', choices=KEY_TYPES, default=list(KEY_TYPES))
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--site-dir', help="Import jwt and cryptography from this directory (e.g. the layer's pins)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    return parser.parse_args()
+
+
+args = parse_args() if __name__ == '__main__' else None
+if args is not None and args.site_dir:
+    sys.path.insert(0, os.path.abspath(args.site_dir))
+
+import jwt
+import cryptography
+from jwt import PyJWK
+from jwt.algorithms import RSAAlgorithm, ECAlgorithm
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa, ec
+
+
+def make_key(key_type: str) -> Dict[str, Any]:
+    """Private key, its JWKS entry and its PEM public key"""
+    algorithm, size = key_type.split('-')
+    if algorithm == 'RS256':
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=int(size))
+        jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        jwk = json.loads(ECAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({'kid': f'benchmark-{key_type.lower()}', 'use': 'sig', 'alg': algorithm})
+    pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return {'algorithm': algorithm, 'private_key': private_key, 'jwk': jwk, 'pem': pem}
+
+
+def make_tokens(key: Dict[str, Any], count: int) -> List[str]:
+    """Access tokens shaped like the ones Auth0 issues for the API"""
+    now = int(time.time())
+    return [
+        jwt.encode(
+            {
+                'iss': f'https://{DOMAIN}/', 'sub': f'auth0|proctor-{index:04d}',
+                'aud': [AUDIENCE, f'https://{DOMAIN}/userinfo'],
+                'iat': now, 'exp': now + 86400, 'azp': 'benchmark-client',
+                'scope': 'openid profile email', 'permissions': ['read:trials', 'write:submissions']
+            },
+            key['private_key'], algorithm=key['algorithm'], headers={'kid': key['jwk']['kid'], 'typ': 'JWT'}
+        )
+        for index in range(count)
+    ]
+
+
+def make_verifier(key: Dict[str, Any], mode: str) -> Callable[[str], Dict[str, Any]]:
+    algorithms = [key['algorithm']]
+    issuer = f'https://{DOMAIN}/'
+
+    if mode == 'jwk':
+        def verify(token):
+            return jwt.decode(token, PyJWK(key['jwk']).key, algorithms=algorithms, audience=AUDIENCE, issuer=issuer)
+    elif mode == 'pem':
+        def verify(token):
+            return jwt.decode(token, key['pem'], algorithms=algorithms, audience=AUDIENCE, issuer=issuer)
+    else:
+        parsed = PyJWK(key['jwk']).key
+
+        def verify(token):
+            return jwt.decode(token, parsed, algorithms=algorithms, audience=AUDIENCE, issuer=issuer)
+    return verify
+
+
+def timed_calls(verify: Callable[[str], Any], tokens: List[str], indexes: range) -> List[float]:
+    """Latency of each call in microseconds"""
+    latencies = []
+    for index in indexes:
+        start = time.perf_counter()
+        verify(tokens[index % len(tokens)])
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def run(verify: Callable[[str], Any], tokens: List[str], calls: int, threads: int) -> Dict[str, float]:
+    """One run of calls verifications, on the calling thread (threads=0) or split over a pool"""
+    start = time.perf_counter()
+    if threads:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            chunks = [range(worker, calls, threads) for worker in range(threads)]
+            latencies = [value for chunk in pool.map(lambda c: timed_calls(verify, tokens, c), chunks) for value in chunk]
+    else:
+        latencies = timed_calls(verify, tokens, range(calls))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'per_second': round(calls / elapsed, 1),
+        'mean_us': round(statistics.fmean(latencies), 1),
+        'p50_us': round(latencies[len(latencies) // 2], 1),
+        'p90_us': round(latencies[int(len(latencies) * 0.9)], 1),
+        'p99_us': round(latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)], 1),
+    }
+
+
+def benchmark(key_type: str, mode: str, tokens: List[str], key: Dict[str, Any], threads: int) -> Dict[str, Any]:
+    verify = make_verifier(key, mode)
+    verify(tokens[0])
+    result = {'key': key_type, 'mode': mode, 'threads': threads or 1}
+    runs = sorted((run(verify, tokens, args.calls, threads) for _ in range(args.repeat)), key=lambda r: r['per_second'])
+    result.update(runs[len(runs) // 2])
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        from cryptography.hazmat.backends.openssl.backend import backend
+        openssl = backend.openssl_version_text()
+    except Exception:
+        openssl = 'unknown'
+    return {
+        'python': platform.python_version(),
+        'jwt': jwt.__version__,
+        'cryptography': cryptography.__version__,
+        'openssl': openssl,
+        'machine': platform.machine(),
+        'cpus': len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count(),
+    }
+
+
+def main() -> None:
+    results = []
+    for key_type in args.keys:
+        key = make_key(key_type)
+        tokens = make_tokens(key, args.tokens)
+        for mode in args.modes:
+            results.append(benchmark(key_type, mode, tokens, key, 0))
+            if args.threads:
+                results.append(benchmark(key_type, mode, tokens, key, args.threads))
+
+    info = environment()
+    if args.json:
+        print(json.dumps({'environment': info, 'calls': args.calls, 'repeat': args.repeat, 'results': results}))
+        return
+
+    print(f"PyJWT {info['jwt']}, cryptography {info['cryptography']} ({info['openssl']}), "
+          f"Python {info['python']}, {info['cpus']} CPU(s) {info['machine']}; "
+          f"{args.calls} calls x {args.repeat} runs, median run")
+    print(f"  {'key':<11} {'mode':<7} {'threads':>7} {'per s':>9} {'mean us':>9} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9}")
+    for r in results:
+        print(f"  {r['key']:<11} {r['mode']:<7} {r['threads']:>7} {r['per_second']:>9.1f} {r['mean_us']:>9.1f} "
+              f"{r['p50_us']:>9.1f} {r['p90_us']:>9.1f} {r['p99_us']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
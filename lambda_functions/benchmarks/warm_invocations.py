@@ -0,0 +1,133 @@
+"""
+Per-request latency of the submission handler with and without the warm-container
+registry (common.clients).
+
+- per-request: clients, resources and services are dropped before every invocation
+  (the session is kept, like boto3's default session was), which is what building
+  SubmissionService() / boto3.resource('dynamodb') inside handler() used to cost
+- warm: the service and its resource are built once and reused
+
+Runs in-process against moto, so it measures client/resource construction and
+endpoint resolution only; TLS handshakes saved by connection reuse against real
+DynamoDB come on top of this.
+
+    python lambda_functions/benchmarks/warm_invocations.py --requests 200
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+sys.path.insert(0, os.path.join(LAMBDA_FUNCTIONS_DIR, 'submission'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-west-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ['SUBMISSIONS_TABLE_NAME'] = 'benchmark-submissions'
+
+import boto3
+from moto import mock_aws
+
+from common.clients import reset_registry
+import handler as submission_handler
+
+
+def create_table():
+    dynamodb = boto3.resource('dynamodb')
+    index = lambda name, range_key: {
+        'IndexName': name,
+        'KeySchema': [
+            {'AttributeName': 'trial_id', 'KeyType': 'HASH'},
+            {'AttributeName': range_key, 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'}
+    }
+    return dynamodb.create_table(
+        TableName='benchmark-submissions',
+        KeySchema=[
+            {'AttributeName': 'submission_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'recipe_id', 'KeyType': 'RANGE'}
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'submission_id', 'AttributeType': 'S'},
+            {'AttributeName': 'recipe_id', 'AttributeType': 'S'},
+            {'AttributeName': 'trial_id', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[index('trial_id_index', 'recipe_id')],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run(events, requests: int, reset_each_request: bool):
+    reset_registry()
+    timings = []
+    for position in range(requests):
+        if reset_each_request:
+            reset_registry(session=False)
+        start = time.perf_counter()
+        response = submission_handler.handler(events[position % len(events)], None)
+        timings.append(time.perf_counter() - start)
+        assert response['statusCode'] == 200, response
+    return {
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    with mock_aws():
+        table = create_table()
+        with table.batch_writer() as batch:
+            for index in range(20):
+                batch.put_item(Item={
+                    'submission_id': f"participant-{index}::recipe-1::sweetness",
+                    'recipe_id': "recipe-1",
+                    'trial_id': "trial-1",
+                    'participant_id': f"participant-{index}",
+                    'score': index % 10,
+                    'status': "saved"
+                })
+
+        events = [
+            {
+                'httpMethod': 'GET',
+                'resource': '/submission/{id}',
+                'pathParameters': {'id': f"participant-{index}::recipe-1::sweetness"},
+                'queryStringParameters': {'recipe_id': "recipe-1"}
+            }
+            for index in range(20)
+        ]
+
+        # Warm up imports and moto before timing anything
+        run(events, 10, reset_each_request=False)
+        results = {
+            'per-request': run(events, args.requests, reset_each_request=True),
+            'warm': run(events, args.requests, reset_each_request=False)
+        }
+
+    if args.json:
+        print(json.dumps({'requests': args.requests, **results}))
+        return
+
+    print(f"{args.requests} GET /submission/{{id}} invocations")
+    for name, result in results.items():
+        print(f"  {name:<12} p50 {result['p50_ms']:>8.3f} ms   p95 {result['p95_ms']:>8.3f} ms   mean {result['mean_ms']:>8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Code shared by several lambdas. Packaged via the lambda_functions root sys_path"""
@@ -0,0 +1,257 @@
+import os
+import json
+import fnmatch
+import functools
+from typing import Optional, Dict, Any, Callable, List
+
+try:
+    import jwt
+    from common.jwks import JwksError, get_jwks_cache
+except ImportError:
+    # PyJWT comes from the python-dependencies layer, which is only attached when needed
+    jwt = None
+
+from common.tokens import VerifiedTokenCache
+
+
+# Claims of tokens this container already verified
+verified_tokens = VerifiedTokenCache()
+
+
+@functools.lru_cache(maxsize=4)
+def parse_scope_policies(raw: str) -> Dict[str, List[str]]:
+    """Parsed AUTHORIZER_SCOPE_POLICIES value; raises ValueError when it is malformed"""
+    policies = json.loads(raw)
+    if not isinstance(policies, dict) or not all(
+        isinstance(patterns, list) and all(isinstance(pattern, str) for pattern in patterns)
+        for patterns in policies.values()
+    ):
+        raise ValueError("AUTHORIZER_SCOPE_POLICIES must map scopes to lists of METHOD/resource patterns")
+    return policies
+
+
+def load_scope_policies() -> Optional[Dict[str, List[str]]]:
+    """
+    Optional AUTHORIZER_SCOPE_POLICIES: JSON mapping a scope or permission to the
+    METHOD/resource patterns it allows, e.g. {"read:trials": ["GET/*"], "write:submissions": ["PUT/submission/*"]}.
+    Unset means every valid token may call the whole stage. Shared by the JWT authorizer and
+    @authenticate so both grant the same routes; read per request rather than at import, so a
+    malformed value rejects requests (ValueError) instead of failing INIT of every handler
+    """
+    raw = os.environ.get('AUTHORIZER_SCOPE_POLICIES')
+    if not raw:
+        return None
+    return parse_scope_policies(raw)
+
+
+def token_scopes(payload: Dict[str, Any]) -> List[str]:
+    """Space-delimited scope claim plus Auth0 RBAC permissions"""
+    scopes = (payload.get('scope') or '').split()
+    permissions = payload.get('permissions')
+    if isinstance(permissions, list):
+        scopes.extend(permission for permission in permissions if isinstance(permission, str))
+    return scopes
+
+
+def scope_patterns(payload: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    METHOD/resource patterns the token's scopes grant, or None when no scope policies are set.
+    Raises ValueError when AUTHORIZER_SCOPE_POLICIES is malformed
+    """
+    policies = load_scope_policies()
+    if policies is None:
+        return None
+
+    patterns = []
+    for scope in token_scopes(payload):
+        for pattern in policies.get(scope, []):
+            pattern = pattern.lstrip('/')
+            if pattern not in patterns:
+                patterns.append(pattern)
+    return patterns
+
+
+def stage_arn(method_arn: str) -> str:
+    """arn:aws:execute-api:region:account:api-id/stage from a method ARN"""
+    api_arn, stage = method_arn.split('/')[:2]
+    return f'{api_arn}/{stage}'
+
+
+def allowed_resources(method_arn: str, payload: Dict[str, Any]) -> List[str]:
+    """Method ARN patterns the token may invoke: the whole stage, or what its scopes grant"""
+    stage = stage_arn(method_arn)
+    patterns = scope_patterns(payload)
+    if patterns is None:
+        return [f'{stage}/*']
+    return [f'{stage}/{pattern}' for pattern in patterns]
+
+
+def request_allowed(event: Dict[str, Any], payload: Dict[str, Any]) -> bool:
+    """
+    Whether the token's scopes grant the request's httpMethod and resource, matched the way
+    API Gateway matches the authorizer's policy (* spans path segments)
+    """
+    patterns = scope_patterns(payload)
+    if patterns is None:
+        return True
+    route = f"{event.get('httpMethod', '')}/{(event.get('resource') or '').lstrip('/')}"
+    return any(fnmatch.fnmatchcase(route, pattern) for pattern in patterns)
+
+
+def in_handler_auth_enabled() -> bool:
+    """IN_HANDLER_AUTH=true makes @authenticate verify tokens instead of trusting the API Gateway authorizer"""
+    return os.environ.get('IN_HANDLER_AUTH', '').lower() == 'true'
+
+
+def get_jwks(auth0_domain: str):
+    """Shared JWKS cache of the tenant; AUTH0_JWKS_URL overrides the URL (local stand-ins)"""
+    jwks_url = os.environ.get('AUTH0_JWKS_URL') or f'https://{auth0_domain}/.well-known/jwks.json'
+    return get_jwks_cache(jwks_url)
+
+
+def verify_token(token: str, auth0_domain: str, auth0_audience: str) -> Dict[str, Any]:
+    """
+    Claims of a valid token, from the verified-token cache or a full RS256 verification.
+    Raises jwt.InvalidTokenError or JwksError
+    """
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        return payload
+
+    # Get the signing key for the token's kid from the cached JWKS
+    kid = jwt.get_unverified_header(token).get('kid')
+    signing_key = get_jwks(auth0_domain).get_signing_key(kid)
+
+    # Decode and verify the token
+    payload = jwt.decode(
+        token,
+        signing_key.key,
+        algorithms=["RS256"],
+        audience=auth0_audience,
+        issuer=f'https://{auth0_domain}/'
+    )
+    verified_tokens.put(token, payload)
+    return payload
+
+
+def get_bearer_token(event: Dict[str, Any]) -> Optional[str]:
+    headers = event.get('headers') or {}
+    for key, value in headers.items():
+        if key.lower() == 'authorization' and isinstance(value, str):
+            token = value[7:] if value.startswith('Bearer ') else value
+            return token.strip() or None
+    return None
+
+
+def get_claims(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Claims of the caller: verified in-handler by @authenticate, or the context the
+    API Gateway authorizer attached (userId, email, scope)
+    """
+    authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+    claims = authorizer.get('claims')
+    if isinstance(claims, dict):
+        return claims
+    if isinstance(claims, str):
+        try:
+            return json.loads(claims)
+        except json.JSONDecodeError:
+            pass
+    return {
+        'sub': authorizer.get('userId') or authorizer.get('principalId'),
+        'email': authorizer.get('email'),
+        'scope': authorizer.get('scope')
+    }
+
+
+def unauthorized(message: str) -> Dict[str, Any]:
+    return {
+        'statusCode': 401,
+        'headers': {
+            'Content-Type': 'application/json',
+            'WWW-Authenticate': 'Bearer',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+            'Access-Control-Allow-Methods': 'GET,POST,PUT,PATCH,DELETE,OPTIONS'
+        },
+        'body': json.dumps({'error': 'Unauthorized', 'message': message})
+    }
+
+
+def server_error(message: str) -> Dict[str, Any]:
+    return {
+        'statusCode': 500,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+            'Access-Control-Allow-Methods': 'GET,POST,PUT,PATCH,DELETE,OPTIONS'
+        },
+        'body': json.dumps({'error': 'Internal Server Error', 'message': message})
+    }
+
+
+def forbidden(message: str) -> Dict[str, Any]:
+    return {
+        'statusCode': 403,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+            'Access-Control-Allow-Methods': 'GET,POST,PUT,PATCH,DELETE,OPTIONS'
+        },
+        'body': json.dumps({'error': 'Forbidden', 'message': message})
+    }
+
+
+def authenticate(handler: Callable) -> Callable:
+    """
+    Decorator for API Gateway proxy handlers. With IN_HANDLER_AUTH=true the bearer token is
+    verified in-process (cached JWKS and claims) and the request is rejected with 401 otherwise,
+    or with 403 when AUTHORIZER_SCOPE_POLICIES do not grant its method and resource, so the
+    route needs no separate authorizer invocation. The verified claims are put in
+    requestContext.authorizer.claims for get_claims(). Without IN_HANDLER_AUTH the handler runs
+    as before behind the API Gateway authorizer. CORS preflight requests are never checked
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        if not isinstance(event, dict) or not in_handler_auth_enabled() or event.get('httpMethod') == 'OPTIONS':
+            return handler(event, context)
+
+        auth0_domain = os.environ.get('AUTH0_DOMAIN')
+        auth0_audience = os.environ.get('AUTH0_AUDIENCE')
+        if jwt is None or not auth0_domain or not auth0_audience:
+            print("ERROR: IN_HANDLER_AUTH needs PyJWT and AUTH0_DOMAIN/AUTH0_AUDIENCE")
+            return unauthorized('Authentication is not configured')
+
+        token = get_bearer_token(event)
+        if not token:
+            return unauthorized('Missing bearer token')
+
+        try:
+            claims = verify_token(token, auth0_domain, auth0_audience)
+        except jwt.ExpiredSignatureError:
+            return unauthorized('Token has expired')
+        except (jwt.InvalidTokenError, JwksError) as e:
+            print(f"ERROR: Invalid token: {str(e)}")
+            return unauthorized('Invalid token')
+
+        try:
+            allowed = request_allowed(event, claims)
+        except ValueError as e:
+            print(f"ERROR: {str(e)}")
+            return server_error('Authorization is not configured correctly')
+
+        if not allowed:
+            print(f"User {claims.get('sub')} has no scope that grants {event.get('httpMethod')} {event.get('resource')}")
+            return forbidden('Token scopes do not allow this request')
+
+        request_context = dict(event.get('requestContext') or {})
+        request_context['authorizer'] = dict(
+            request_context.get('authorizer') or {},
+            principalId=claims.get('sub', 'user'),
+            claims=claims
+        )
+        return handler(dict(event, requestContext=request_context), context)
+
+    return wrapper
@@ -0,0 +1,105 @@
+import os
+import threading
+import boto3
+from botocore.config import Config
+from typing import Optional, Dict, Any, Tuple, Type
+
+
+# Process-level registry of boto3 clients, resources and service objects.
+# Lambda keeps module state between invocations of a warm container, so anything
+# built here during INIT (or on first use) is reused and keeps its HTTPS connections open.
+
+_lock = threading.RLock()
+_session: Optional[boto3.session.Session] = None
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+_resources: Dict[Tuple[str, Optional[str]], Any] = {}
+_services: Dict[Tuple, Any] = {}
+
+
+def build_config(config: Optional[Config] = None) -> Config:
+    """
+    Default botocore config for Lambda: keep-alive, a connection pool large enough for
+    the batch thread pools, short timeouts and standard-mode retries.
+    Overridable through BOTO_* environment variables; config is merged on top
+    """
+    default = Config(
+        connect_timeout=float(os.environ.get('BOTO_CONNECT_TIMEOUT', '2')),
+        read_timeout=float(os.environ.get('BOTO_READ_TIMEOUT', '5')),
+        max_pool_connections=int(os.environ.get('BOTO_MAX_POOL_CONNECTIONS', '16')),
+        retries={
+            'mode': 'standard',
+            'max_attempts': int(os.environ.get('BOTO_MAX_ATTEMPTS', '3'))
+        },
+        tcp_keepalive=True
+    )
+    return default.merge(config) if config is not None else default
+
+
+def get_session() -> boto3.session.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            _session = boto3.session.Session()
+        return _session
+
+
+def get_client(service_name: str, region_name: Optional[str] = None, config: Optional[Config] = None):
+    """
+    Return the shared low-level client for a service (and region).
+    config only applies when the client is first created
+    """
+    key = (service_name, region_name)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = get_session().client(service_name, region_name=region_name, config=build_config(config))
+        return _clients[key]
+
+
+def get_resource(service_name: str, region_name: Optional[str] = None):
+    """Return the shared boto3 resource for a service (and region)"""
+    key = (service_name, region_name)
+    with _lock:
+        if key not in _resources:
+            _resources[key] = get_session().resource(service_name, region_name=region_name, config=build_config())
+        return _resources[key]
+
+
+def get_service(service_class: Type, *args):
+    """
+    Return the shared instance of a service class such as SubmissionService,
+    constructing it on first use
+    """
+    key = (service_class, args)
+    with _lock:
+        if key not in _services:
+            _services[key] = service_class(*args)
+        return _services[key]
+
+
+def prewarm(*service_classes: Type) -> None:
+    """
+    Build the given services during Lambda INIT so the first request does not pay for
+    client creation. Does nothing outside Lambda, so handlers stay importable in tests
+    """
+    if not os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        return
+    for service_class in service_classes:
+        try:
+            get_service(service_class)
+        except Exception as e:
+            # The request path raises the same error with a proper response
+            print(f"Could not prewarm {service_class.__name__}: {str(e)}")
+
+
+def reset_registry(session: bool = True) -> None:
+    """
+    Drop every cached client, resource and service (for tests).
+    session=False keeps the boto3 session and its loaded service models
+    """
+    global _session
+    with _lock:
+        if session:
+            _session = None
+        _clients.clear()
+        _resources.clear()
+        _services.clear()
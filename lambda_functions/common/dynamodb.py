@@ -0,0 +1,147 @@
+import os
+import base64
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeSerializer
+from typing import Optional, Dict, Any
+from common.clients import get_client
+
+
+# DYNAMODB_READ_MODE=native reads through NativeTable instead of the boto3 resource
+NATIVE_READ_MODE = 'native'
+
+serializer = TypeSerializer()
+
+
+def native_reads_enabled() -> bool:
+    """Whether services should read with the low-level client fast path"""
+    return os.environ.get('DYNAMODB_READ_MODE', 'resource') == NATIVE_READ_MODE
+
+
+def number_from_wire(value: str):
+    """
+    Convert a DynamoDB number string to int or float.
+    Integral values stay exact; anything with a fraction or exponent becomes a float
+    """
+    if '.' in value or 'e' in value or 'E' in value:
+        return float(value)
+    return int(value)
+
+
+def from_wire(attribute_value: Dict[str, Any]) -> Any:
+    """
+    Convert one typed attribute value ({'N': '7'}, {'S': 'x'}, ...) straight to a
+    JSON-ready Python value, without going through Decimal
+    """
+    (type_code, value), = attribute_value.items()
+    if type_code == 'S':
+        return value
+    if type_code == 'N':
+        return number_from_wire(value)
+    if type_code == 'M':
+        return {key: from_wire(item) for key, item in value.items()}
+    if type_code == 'L':
+        return [from_wire(item) for item in value]
+    if type_code == 'BOOL':
+        return value
+    if type_code == 'NULL':
+        return None
+    if type_code == 'SS':
+        return list(value)
+    if type_code == 'NS':
+        return [number_from_wire(item) for item in value]
+    if type_code == 'B':
+        return base64.b64encode(value).decode('ascii')
+    if type_code == 'BS':
+        return [base64.b64encode(item).decode('ascii') for item in value]
+    raise TypeError(f"Unknown DynamoDB type: {type_code}")
+
+
+def item_from_wire(item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Convert a typed item (or key) to a plain dict of JSON-ready values"""
+    if item is None:
+        return None
+    return {key: from_wire(value) for key, value in item.items()}
+
+
+def item_to_wire(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a plain item (or key) to the typed wire format"""
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+
+class NativeTable:
+    """
+    Read-only table wrapper over the low-level DynamoDB client.
+
+    Accepts the same keyword arguments as the boto3 Table methods it mirrors
+    (condition objects, plain keys) but returns items with int/float/str values
+    instead of Decimal, so responses can be passed to json.dumps without a default hook
+    """
+
+    def __init__(self, table_name: str, client=None):
+        self.table_name = table_name
+        self.client = client or get_client('dynamodb')
+
+    @staticmethod
+    def _build_expressions(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Compile condition objects and serialize plain values like the resource layer does"""
+        kwargs = dict(kwargs)
+        names = dict(kwargs.pop('ExpressionAttributeNames', {}))
+        values = {
+            placeholder: serializer.serialize(value)
+            for placeholder, value in kwargs.pop('ExpressionAttributeValues', {}).items()
+        }
+
+        builder = ConditionExpressionBuilder()
+        for parameter, is_key_condition in (('KeyConditionExpression', True), ('FilterExpression', False)):
+            condition = kwargs.get(parameter)
+            if condition is None or isinstance(condition, str):
+                continue
+            built = builder.build_expression(condition, is_key_condition=is_key_condition)
+            kwargs[parameter] = built.condition_expression
+            names.update(built.attribute_name_placeholders)
+            values.update({
+                placeholder: serializer.serialize(value)
+                for placeholder, value in built.attribute_value_placeholders.items()
+            })
+
+        if names:
+            kwargs['ExpressionAttributeNames'] = names
+        if values:
+            kwargs['ExpressionAttributeValues'] = values
+        if 'ExclusiveStartKey' in kwargs:
+            kwargs['ExclusiveStartKey'] = item_to_wire(kwargs['ExclusiveStartKey'])
+        return kwargs
+
+    def get_item(self, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        response = self.client.get_item(TableName=self.table_name, Key=item_to_wire(Key), **kwargs)
+        if 'Item' in response:
+            response['Item'] = item_from_wire(response['Item'])
+        return response
+
+    def query(self, **kwargs) -> Dict[str, Any]:
+        response = self.client.query(TableName=self.table_name, **self._build_expressions(kwargs))
+        response['Items'] = [item_from_wire(item) for item in response.get('Items', [])]
+        if 'LastEvaluatedKey' in response:
+            response['LastEvaluatedKey'] = item_from_wire(response['LastEvaluatedKey'])
+        return response
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        BatchGetItem for this table only. Keys in the request and in UnprocessedKeys
+        are plain dicts, so unprocessed keys can be passed straight back in
+        """
+        request = dict(RequestItems[self.table_name])
+        request['Keys'] = [item_to_wire(key) for key in request['Keys']]
+        response = self.client.batch_get_item(RequestItems={self.table_name: request})
+
+        response['Responses'] = {
+            self.table_name: [item_from_wire(item) for item in response.get('Responses', {}).get(self.table_name, [])]
+        }
+        unprocessed = (response.get('UnprocessedKeys') or {}).get(self.table_name)
+        if unprocessed:
+            response['UnprocessedKeys'] = {
+                self.table_name: dict(unprocessed, Keys=[item_from_wire(key) for key in unprocessed['Keys']])
+            }
+        else:
+            response['UnprocessedKeys'] = {}
+        return response
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import threading
+import urllib.request
+from typing import Optional, Dict, Any, Callable
+
+from jwt import PyJWK
+from jwt.exceptions import PyJWKError
+
+
+# Process-level JWKS cache. Keys are parsed once per fetch and indexed by kid, so a warm
+# container verifies tokens without downloading /.well-known/jwks.json again.
+# Defaults match the Node.js authorizer's jwks-rsa settings (10 minute cache, 10 fetches a minute)
+
+JWKS_TTL_SECONDS = float(os.environ.get('JWKS_CACHE_TTL_SECONDS', '600'))
+JWKS_MIN_REFRESH_SECONDS = float(os.environ.get('JWKS_MIN_REFRESH_SECONDS', '6'))
+JWKS_FETCH_TIMEOUT_SECONDS = float(os.environ.get('JWKS_FETCH_TIMEOUT_SECONDS', '3'))
+
+# Snapshot baked into the bundle at deploy time (infra/modules/util_packager/jwks_snapshot), so a
+# cold start verifies tokens without fetching the JWKS first. It is trusted until it is
+# JWKS_SNAPSHOT_MAX_AGE_SECONDS old; unknown kids still refresh from the network
+JWKS_SNAPSHOT_PATH = os.environ.get('JWKS_SNAPSHOT_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'jwks_snapshot', 'jwks.json'
+)
+JWKS_SNAPSHOT_MAX_AGE_SECONDS = float(os.environ.get('JWKS_SNAPSHOT_MAX_AGE_SECONDS', '86400'))
+
+_lock = threading.Lock()
+_caches: Dict[str, 'JwksCache'] = {}
+
+
+class JwksError(Exception):
+    """No usable signing key: the kid is unknown or the JWKS could not be fetched"""
+
+
+class JwksCache:
+    """
+    Signing keys of one JWKS URL, indexed by kid.
+
+    - The key set is refetched once it is older than ttl.
+    - A kid that is not in the set triggers a refetch (key rotation), at most once per
+      min_refresh_interval, so tokens with made-up kids cannot turn into a fetch each.
+    - A failed fetch keeps serving the keys already known; it is retried after
+      min_refresh_interval.
+    - load_snapshot() starts from a bundled snapshot instead of a fetch; it counts as
+      fresh until it is max_age old.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float = JWKS_TTL_SECONDS,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_SECONDS,
+        timeout: float = JWKS_FETCH_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.clock = clock
+        self.keys: Dict[str, PyJWK] = {}
+        self.fetched_at: Optional[float] = None
+        self.expires_at: Optional[float] = None
+        self.last_attempt: Optional[float] = None
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.lock = threading.Lock()
+
+    def fetch(self) -> Dict[str, Any]:
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+            return json.load(response)
+
+    def load(self, jwks: Dict[str, Any], max_age: Optional[float] = None) -> None:
+        """
+        Replace the key set; keys without a kid or that PyJWT cannot use are skipped.
+        The set is refetched after max_age seconds (default ttl)
+        """
+        keys = {}
+        for data in jwks.get('keys', []):
+            if not data.get('kid') or data.get('use', 'sig') != 'sig':
+                continue
+            try:
+                keys[data['kid']] = PyJWK(data)
+            except PyJWKError as e:
+                print(f"Skipping JWKS key {data['kid']}: {str(e)}")
+        self.keys = keys
+        self.fetched_at = self.clock()
+        self.expires_at = self.fetched_at + (self.ttl if max_age is None else max(max_age, 0))
+
+    def load_snapshot(self, snapshot: Dict[str, Any], max_age: float = JWKS_SNAPSHOT_MAX_AGE_SECONDS) -> bool:
+        """
+        Start from a snapshot ({"url", "fetched_at" epoch seconds, "keys"}) of this URL.
+        An old snapshot is still loaded: it is refetched on first use, and its keys are
+        served if that fails
+        """
+        if snapshot.get('url') != self.url or not isinstance(snapshot.get('keys'), list):
+            return False
+        age = time.time() - float(snapshot.get('fetched_at') or 0)
+        self.load(snapshot, max_age=max_age - age)
+        return bool(self.keys)
+
+    def can_refresh(self, now: float) -> bool:
+        return self.last_attempt is None or now - self.last_attempt >= self.min_refresh_interval
+
+    def refresh(self, now: float) -> None:
+        self.last_attempt = now
+        self.fetches += 1
+        try:
+            jwks = self.fetch()
+        except Exception as e:
+            self.fetch_errors += 1
+            if not self.keys:
+                raise JwksError(f"Could not fetch JWKS from {self.url}: {str(e)}")
+            print(f"WARNING: JWKS refresh failed, serving {len(self.keys)} cached keys: {str(e)}")
+            return
+        self.load(jwks)
+
+    def get_signing_key(self, kid: Optional[str]) -> PyJWK:
+        if not kid:
+            raise JwksError("Token header has no kid")
+
+        with self.lock:
+            now = self.clock()
+            expired = self.expires_at is None or now >= self.expires_at
+            if expired and self.can_refresh(now):
+                self.refresh(now)
+            elif kid not in self.keys and self.can_refresh(now):
+                self.refresh(now)
+
+            key = self.keys.get(kid)
+        if key is None:
+            raise JwksError(f"No signing key with kid {kid}")
+        return key
+
+
+def read_jwks_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    """The bundled snapshot, or None when there is none (or it cannot be read)"""
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"WARNING: Ignoring JWKS snapshot {path}: {str(e)}")
+        return None
+    return snapshot if isinstance(snapshot, dict) else None
+
+
+def get_jwks_cache(url: str) -> JwksCache:
+    """Return the shared cache for a JWKS URL, creating it on first use from the bundled snapshot if any"""
+    with _lock:
+        if url not in _caches:
+            cache = JwksCache(url)
+            snapshot = read_jwks_snapshot(JWKS_SNAPSHOT_PATH)
+            if snapshot is not None and not cache.load_snapshot(snapshot):
+                print(f"WARNING: JWKS snapshot {JWKS_SNAPSHOT_PATH} has no keys for {url}, fetching instead")
+            _caches[url] = cache
+        return _caches[url]
+
+
+def reset_jwks_caches() -> None:
+    """Drop every cached key set (for tests)"""
+    with _lock:
+        _caches.clear()
@@ -0,0 +1,11 @@
+# Submission ids are participant::recipe::outcome; trial stats and the running aggregates
+# both group scores by the outcome part
+
+
+def parse_outcome(submission_id: str) -> str:
+    """
+    Get the outcome from a participant::recipe::outcome submission_id.
+    Submissions with a non-deterministic id are grouped under "unknown"
+    """
+    parts = submission_id.split('::')
+    return parts[2] if len(parts) >= 3 else 'unknown'
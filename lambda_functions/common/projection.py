@@ -0,0 +1,39 @@
+import re
+from typing import Optional, Dict, Any, List
+
+
+# Sparse field selection (fields= query parameter) shared by the list endpoints
+
+MAX_PROJECTION_FIELDS = 20
+FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def parse_fields(query_params: dict) -> Optional[List[str]]:
+    """Split the optional comma-separated fields query parameter into attribute names"""
+    fields = query_params.get('fields')
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+def build_projection(fields: Optional[List[str]], key_attributes: List[str]) -> Dict[str, Any]:
+    """
+    Build ProjectionExpression arguments for a sparse field selection.
+    Key attributes are always included so projected items stay addressable
+    """
+    if not fields:
+        return {}
+    if len(fields) > MAX_PROJECTION_FIELDS:
+        raise ValueError(f"fields may contain at most {MAX_PROJECTION_FIELDS} attributes")
+
+    attributes = list(key_attributes)
+    for field in fields:
+        if not FIELD_NAME_PATTERN.match(field):
+            raise ValueError(f"Invalid field name: {field}")
+        if field not in attributes:
+            attributes.append(field)
+
+    return {
+        'ProjectionExpression': ", ".join(f"#{attribute}" for attribute in attributes),
+        'ExpressionAttributeNames': {f"#{attribute}": attribute for attribute in attributes}
+    }
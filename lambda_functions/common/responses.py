@@ -0,0 +1,109 @@
+import os
+import gzip
+import base64
+import functools
+from typing import Optional, Dict, Any, Callable
+
+
+# Bodies smaller than this are sent uncompressed; compression would not pay for itself
+COMPRESSION_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+
+
+def get_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """Case-insensitive lookup of a request header in an API Gateway proxy event"""
+    headers = event.get('headers') or {}
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a supported encoding from an Accept-Encoding header; only gzip is supported
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, parameters = part.strip().partition(';')
+        coding = coding.strip().lower()
+        quality = 1.0
+        parameter = parameters.strip()
+        if parameter.startswith('q='):
+            try:
+                quality = float(parameter[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            qualities[coding] = quality
+
+    quality = qualities.get('gzip', qualities.get('*', 0.0))
+    return 'gzip' if quality > 0 else None
+
+
+def compress_response(event: Dict[str, Any], response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compress a create_response result according to the request's Accept-Encoding.
+    Compressed bodies are base64 encoded with isBase64Encoded set, which API Gateway
+    turns back into binary because the API declares */* as a binary media type
+    """
+    body = response.get('body')
+    if not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+
+    headers = response.get('headers') or {}
+    if any(key.lower() == 'content-encoding' for key in headers):
+        return response
+
+    raw = body.encode('utf-8')
+    if len(raw) < COMPRESSION_MIN_BYTES:
+        return response
+
+    headers = dict(headers, Vary='Accept-Encoding')
+    encoding = choose_encoding(get_header(event, 'Accept-Encoding'))
+    if encoding is None:
+        return dict(response, headers=headers)
+
+    compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    if len(compressed) >= len(raw):
+        return dict(response, headers=headers)
+
+    headers['Content-Encoding'] = encoding
+    return dict(
+        response,
+        headers=headers,
+        body=base64.b64encode(compressed).decode('ascii'),
+        isBase64Encoded=True
+    )
+
+
+def decode_request_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Undo API Gateway's base64 encoding of request bodies, which applies to every
+    content type once */* is a binary media type
+    """
+    if event.get('isBase64Encoded') and isinstance(event.get('body'), str):
+        return dict(event, body=base64.b64decode(event['body']).decode('utf-8'), isBase64Encoded=False)
+    return event
+
+
+def handle_content_encoding(handler: Callable) -> Callable:
+    """
+    Decorator for API Gateway proxy handlers: decodes base64 request bodies and
+    compresses large responses for clients that accept gzip
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        if not isinstance(event, dict):
+            return handler(event, context)
+        event = decode_request_body(event)
+        response = handler(event, context)
+        if isinstance(response, dict) and 'statusCode' in response:
+            return compress_response(event, response)
+        return response
+
+    return wrapper
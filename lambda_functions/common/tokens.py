@@ -0,0 +1,81 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Tuple
+
+
+# Claims of already verified bearer tokens, per container. A proctor sends the same token with
+# every request of a session, so after the first verification the signature check is skipped
+# until shortly before the token expires
+
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '1024'))
+TOKEN_CACHE_SKEW_SECONDS = float(os.environ.get('TOKEN_CACHE_SKEW_SECONDS', '30'))
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified claims keyed by the SHA-256 digest of the token, so raw tokens are
+    not kept in memory. An entry expires skew seconds before the token's exp claim; tokens
+    without exp are not cached. Only put claims that came out of a full verification with the
+    same audience and issuer the cache's users expect
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TOKEN_CACHE_MAX_ENTRIES,
+        skew: float = TOKEN_CACHE_SKEW_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.skew = skew
+        self.clock = clock
+        self.entries: 'OrderedDict[bytes, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Cached claims of a token, or None when it has to be verified"""
+        key = self.digest(token)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        exp = claims.get('exp')
+        if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+            return
+        expires_at = exp - self.skew
+        if expires_at <= self.clock():
+            return
+
+        key = self.digest(token)
+        with self.lock:
+            self.entries[key] = (expires_at, dict(claims))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
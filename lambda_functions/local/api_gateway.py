@@ -0,0 +1,620 @@
+"""
+Local API Gateway for the backend handlers.
+
+The routes are read from infra/backend/api_gw.tf and served the way the deployed REST API serves
+them: requests become proxy events (base64 bodies, as */* is a binary media type), the route's
+TOKEN authorizer runs first and the response's base64 body is decoded again. Like API Gateway, the
+authorizer's policy is cached per token for --authorizer-ttl seconds and evaluated against the
+method ARN of every later request with that token. Every function runs as a pool of worker
+processes laid out like its Lambda package, so module state, prewarm() and cold starts behave as
+in Lambda; a pool grows up to --max-concurrency workers and further requests queue. Services point at a local DynamoDB/S3
+stand-in (moto's server seeded with one trial, or --endpoint-url).
+
+    python lambda_functions/local/api_gateway.py --port 3000
+    curl -s localhost:3000/_local/token
+    curl -s -H "Authorization: Bearer $TOKEN" 'localhost:3000/submission?trial_id=trial-1'
+
+The JWT authorizer verifies tokens signed by a key generated at startup, whose JWKS the
+authorizer workers fetch from a local stand-in of the tenant; GET /_local/token issues tokens.
+The webhook authorizer expects --webhook-secret. --authorizer in-handler serves the API as deployed
+with enable_in_handler_auth (the entity routes have no authorizer, their handlers verify the token);
+--authorizer none skips every authorizer.
+Responses carry X-Local-Cold-Start and X-Local-Duration-Ms. The built-in stand-in needs moto[server].
+"""
+import os
+import re
+import sys
+import json
+import time
+import base64
+import fnmatch
+import argparse
+import threading
+import subprocess
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+
+LAMBDA_FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+REPO_DIR = os.path.dirname(LAMBDA_FUNCTIONS_DIR)
+API_GW_TF = os.path.join(REPO_DIR, 'infra', 'backend', 'api_gw.tf')
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+
+from local.aws import start_local_aws, connect, seed_trial, lambda_environment, REGION
+
+ACCOUNT_ID = '123456789012'
+API_ID = 'local'
+# authorizer_result_ttl_in_seconds in infra/backend/authorizers.tf
+AUTHORIZER_TTL_SECONDS = 300
+AUTH0_DOMAIN = 'auth0.local'
+AUTH0_AUDIENCE = 'https://api.local'
+CORS_HEADERS = {
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With',
+    'Access-Control-Allow-Methods': 'OPTIONS,POST',
+    'Access-Control-Allow-Origin': '*'
+}
+
+# Terraform module expressions in api_gw.tf -> handler directory under lambda_functions
+FUNCTION_DIRS = {
+    'module.create_user_lambda': 'webhooks/auth0/create_user',
+    'module.lambdas.transcription_lambda': 'transcription',
+    'module.authorizers_jwt_auth0_authorizer': 'authorizers/jwt/auth0',
+    'module.authorizers_webhooks_auth0_authorizer': 'authorizers/webhooks/auth0',
+}
+
+# Runs in every worker process. Handler output goes to stderr so stdout carries one JSON line per
+# invocation. Requests to URLs in LOCAL_HTTP_RESPONSES (the JWKS) are answered locally
+WORKER_SCRIPT = """
+import sys, os, io, json, time
+started = time.perf_counter()
+protocol = sys.stdout
+sys.stdout = sys.stderr
+
+responses = json.loads(os.environ.get('LOCAL_HTTP_RESPONSES', '{{}}'))
+if responses:
+    import urllib.request, urllib.response, email.message
+    real_open = urllib.request.OpenerDirector.open
+
+    # Patched below urlopen(): PyJWT builds its own opener in newer releases
+    def open_url(opener, request, *args, **kwargs):
+        url = request if isinstance(request, str) else request.full_url
+        if url not in responses:
+            return real_open(opener, request, *args, **kwargs)
+        headers = email.message.Message()
+        headers['Content-Type'] = 'application/json'
+        return urllib.response.addinfourl(io.BytesIO(responses[url].encode()), headers, url, 200)
+
+    urllib.request.OpenerDirector.open = open_url
+
+sys.path[:0] = [{handler_dir!r}, {root_dir!r}]
+import handler
+protocol.write(json.dumps({{'init_ms': (time.perf_counter() - started) * 1000}}) + '\\n')
+protocol.flush()
+
+for line in sys.stdin:
+    event = json.loads(line)
+    invoked = time.perf_counter()
+    try:
+        outcome = {{'result': handler.handler(event, None)}}
+    except Exception as e:
+        outcome = {{'error': str(e), 'error_type': type(e).__name__}}
+    outcome['duration_ms'] = (time.perf_counter() - invoked) * 1000
+    protocol.write(json.dumps(outcome, default=str) + '\\n')
+    protocol.flush()
+"""
+
+
+class InvocationError(Exception):
+    """The worker process died or answered with something that is not an outcome"""
+
+
+class Route:
+    def __init__(self, http_method: str, path: str, function: str, authorizer: Optional[str], cors: bool):
+        self.http_method = http_method
+        self.resource = '/' + path.strip('/')
+        self.function = function
+        self.authorizer = authorizer
+        self.cors = cors
+        self.parameters = re.findall(r'\{(\w+)\}', self.resource)
+        pattern = re.sub(r'\\\{(\w+)\\\}', r'(?P<\1>[^/]+)', re.escape(self.resource))
+        self.pattern = re.compile(f'^{pattern}$')
+
+    def match(self, path: str) -> Optional[Dict[str, str]]:
+        match = self.pattern.match(path)
+        if match is None:
+            return None
+        return {name: urllib.parse.unquote(value) for name, value in match.groupdict().items()}
+
+
+def function_dir(expression: str) -> str:
+    """Handler directory for a module expression such as module.lambdas.entity_lambdas.trial.name"""
+    expression = re.sub(r'\.(name|invoke_arn|authorizer_id)$', '', expression)
+    entity = re.match(r'^module\.lambdas\.entity_lambdas\.(\w+)$', expression)
+    if entity:
+        return entity.group(1)
+    if expression not in FUNCTION_DIRS:
+        raise ValueError(f"No local handler for {expression}")
+    return FUNCTION_DIRS[expression]
+
+
+def evaluate_flag(expression: str, variables: Dict[str, bool]) -> bool:
+    """A boolean route attribute: true/false or a (negated) Terraform variable"""
+    name = expression.lstrip('!')
+    value = name == 'true' if name in ('true', 'false') else bool(variables.get(name, False))
+    return value != expression.startswith('!')
+
+
+def parse_routes(path: str = API_GW_TF, variables: Optional[Dict[str, bool]] = None) -> Tuple[List[Route], str]:
+    """Routes and stage name declared in api_gw.tf, with variables set as given (default false)"""
+    variables = variables or {}
+    with open(path, 'r') as file:
+        source = file.read()
+
+    stage = re.search(r'stage_name\s*=\s*"([^"]+)"', source)
+    routes = []
+    # Route blocks contain no nested blocks, only {parameter} placeholders in their path
+    content = r'(?:[^{}]|\{\w+\})*'
+    for block in re.findall(r'\{(' + content + r'http_method' + content + r')\}', source):
+        attributes = dict(re.findall(r'^\s*(\w+)\s*=\s*(.+?)\s*$', block, re.MULTILINE))
+        values = {name: value.strip('"') for name, value in attributes.items()}
+        routes.append(Route(
+            http_method=values['http_method'],
+            path=values['path'],
+            function=function_dir(values['lambda_function_name']),
+            authorizer=function_dir(values['authorizer_id'])
+            if evaluate_flag(values.get('use_authorizer', 'false'), variables) else None,
+            cors=evaluate_flag(values.get('enable_cors_all', 'false'), variables)
+        ))
+
+    # Literal segments win over path parameters (submission/batch before submission/{id})
+    routes.sort(key=lambda route: len(route.parameters))
+    return routes, stage.group(1) if stage else 'dev'
+
+
+class Worker:
+    """One warm Lambda execution environment: a handler imported in its own interpreter"""
+
+    def __init__(self, name: str, handler_dir: str, environment: Dict[str, str], handler_logs: bool):
+        script = WORKER_SCRIPT.format(handler_dir=handler_dir, root_dir=LAMBDA_FUNCTIONS_DIR)
+        env = dict(os.environ, **environment)
+        env['AWS_LAMBDA_FUNCTION_NAME'] = f"local-{name.replace('/', '-')}"
+        env.pop('PYTHONPATH', None)
+        self.process = subprocess.Popen(
+            [sys.executable, '-c', script],
+            env=env, cwd=handler_dir, text=True, bufsize=1,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=None if handler_logs else subprocess.DEVNULL
+        )
+        self.init_ms = self.read()['init_ms']
+        self.last_used = time.monotonic()
+
+    def read(self) -> Dict[str, Any]:
+        line = self.process.stdout.readline()
+        if not line:
+            raise InvocationError(f"worker exited with {self.process.wait()}")
+        return json.loads(line)
+
+    def invoke(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            self.process.stdin.write(json.dumps(event) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise InvocationError(str(e))
+        outcome = self.read()
+        self.last_used = time.monotonic()
+        return outcome
+
+    def stop(self) -> None:
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class FunctionPool:
+    """
+    Workers of one function. Idle workers are reused most recently used first, like Lambda
+    routes to warm environments; workers idle for longer than idle_timeout are discarded
+    """
+
+    def __init__(
+        self,
+        name: str,
+        environment: Dict[str, str],
+        max_concurrency: int,
+        idle_timeout: Optional[float] = None,
+        handler_logs: bool = False
+    ):
+        self.name = name
+        self.handler_dir = os.path.join(LAMBDA_FUNCTIONS_DIR, name)
+        self.environment = environment
+        self.idle_timeout = idle_timeout
+        self.handler_logs = handler_logs
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.idle: List[Worker] = []
+        self.cold_starts = 0
+        self.invocations = 0
+
+    def acquire(self) -> Tuple[Worker, bool]:
+        expired = []
+        with self.lock:
+            if self.idle_timeout is not None:
+                now = time.monotonic()
+                expired = [worker for worker in self.idle if now - worker.last_used > self.idle_timeout]
+                self.idle = [worker for worker in self.idle if worker not in expired]
+            worker = self.idle.pop() if self.idle else None
+        for stale in expired:
+            stale.stop()
+        if worker is not None:
+            return worker, False
+
+        worker = Worker(self.name, self.handler_dir, self.environment, self.handler_logs)
+        with self.lock:
+            self.cold_starts += 1
+        return worker, True
+
+    def invoke(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Outcome of one invocation, with cold_start and init_ms added"""
+        with self.slots:
+            worker, cold = self.acquire()
+            try:
+                outcome = worker.invoke(event)
+            except InvocationError:
+                worker.stop()
+                raise
+            with self.lock:
+                self.idle.append(worker)
+                self.invocations += 1
+        outcome['cold_start'] = cold
+        outcome['init_ms'] = worker.init_ms if cold else 0.0
+        return outcome
+
+    def stop(self) -> None:
+        with self.lock:
+            workers, self.idle = self.idle, []
+        for worker in workers:
+            worker.stop()
+
+
+class LocalIssuer:
+    """Signing key and JWKS standing in for the Auth0 tenant"""
+
+    def __init__(self, domain: str = AUTH0_DOMAIN, audience: str = AUTH0_AUDIENCE):
+        import jwt
+        from jwt.algorithms import RSAAlgorithm
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        self.jwt = jwt
+        self.domain = domain
+        self.audience = audience
+        self.key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(RSAAlgorithm.to_jwk(self.key.public_key()))
+        jwk.update({'kid': 'local-key', 'use': 'sig', 'alg': 'RS256'})
+        self.jwks = {'keys': [jwk]}
+
+    @property
+    def jwks_url(self) -> str:
+        return f'https://{self.domain}/.well-known/jwks.json'
+
+    def issue(self, subject: str = 'auth0|local', scope: str = '', expires_in: int = 3600) -> str:
+        now = int(time.time())
+        claims = {
+            'sub': subject, 'iss': f'https://{self.domain}/', 'aud': self.audience,
+            'iat': now, 'exp': now + expires_in, 'scope': scope
+        }
+        return self.jwt.encode(claims, self.key, algorithm='RS256', headers={'kid': 'local-key'})
+
+
+def policy_allows(policy: Dict[str, Any], method_arn: str) -> bool:
+    """IAM evaluation of an authorizer policy: an explicit Deny wins, otherwise any Allow"""
+    allowed = False
+    for statement in policy.get('policyDocument', {}).get('Statement', []):
+        resources = statement.get('Resource', [])
+        resources = [resources] if isinstance(resources, str) else resources
+        if not any(fnmatch.fnmatchcase(method_arn, resource) for resource in resources):
+            continue
+        if statement.get('Effect') == 'Deny':
+            return False
+        allowed = allowed or statement.get('Effect') == 'Allow'
+    return allowed
+
+
+class LocalApiGateway:
+    """Routes, authorizer cache and function pools behind one HTTP server"""
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        host: str = '127.0.0.1',
+        port: int = 3000,
+        max_concurrency: int = 10,
+        idle_timeout: Optional[float] = None,
+        authorizer_mode: str = 'emulate',
+        authorizer_ttl: float = AUTHORIZER_TTL_SECONDS,
+        webhook_secret: str = 'local-webhook-secret',
+        handler_logs: bool = False,
+        access_log: bool = False
+    ):
+        self.routes, self.stage = parse_routes(variables={'var.enable_in_handler_auth': authorizer_mode == 'in-handler'})
+        self.authorizer_mode = authorizer_mode
+        self.authorizer_ttl = authorizer_ttl
+        self.access_log = access_log
+        self.issuer = LocalIssuer() if authorizer_mode != 'none' else None
+        self.authorizer_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self.cache_lock = threading.Lock()
+
+        environment = lambda_environment(endpoint_url)
+        environment['AUTH0_WEBHOOK_SECRET'] = webhook_secret
+        if self.issuer is not None:
+            environment.update({
+                'AUTH0_DOMAIN': self.issuer.domain,
+                'AUTH0_AUDIENCE': self.issuer.audience,
+                'LOCAL_HTTP_RESPONSES': json.dumps({self.issuer.jwks_url: json.dumps(self.issuer.jwks)})
+            })
+        if authorizer_mode == 'in-handler':
+            environment['IN_HANDLER_AUTH'] = 'true'
+
+        names = {route.function for route in self.routes}
+        names.update(route.authorizer for route in self.routes if route.authorizer)
+        self.pools = {
+            name: FunctionPool(name, environment, max_concurrency, idle_timeout, handler_logs)
+            for name in sorted(names)
+        }
+
+        handler_class = type('RequestHandler', (ApiGatewayRequestHandler,), {'gateway': self})
+        self.server = ThreadingHTTPServer((host, port), handler_class)
+        self.server.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        for pool in self.pools.values():
+            pool.stop()
+
+    def find_route(self, method: str, path: str) -> Tuple[Optional[Route], Dict[str, str], bool]:
+        """Route for the request, its path parameters and whether any resource matched the path"""
+        resource_matched = False
+        for route in self.routes:
+            parameters = route.match(path)
+            if parameters is None:
+                continue
+            resource_matched = True
+            if route.http_method == method:
+                return route, parameters, True
+        return None, {}, resource_matched
+
+    def method_arn(self, method: str, path: str) -> str:
+        return f'arn:aws:execute-api:{REGION}:{ACCOUNT_ID}:{API_ID}/{self.stage}/{method}/{path.lstrip("/")}'
+
+    def authorize(self, route: Route, token: Optional[str], method_arn: str) -> Tuple[Optional[int], Dict[str, Any]]:
+        """
+        Run the route's authorizer like API Gateway: a missing token or a raised "Unauthorized" is a
+        401, a policy that does not allow this method ARN is a 403. The policy is cached per token
+        and reused for other methods, so it has to cover them
+        """
+        if not token:
+            return 401, {'message': 'Unauthorized'}
+
+        key = (route.authorizer, token)
+        with self.cache_lock:
+            cached = self.authorizer_cache.get(key)
+        if cached and cached[0] > time.monotonic() and self.authorizer_ttl > 0:
+            policy = cached[1]
+        else:
+            try:
+                outcome = self.pools[route.authorizer].invoke(
+                    {'type': 'TOKEN', 'authorizationToken': token, 'methodArn': method_arn}
+                )
+            except InvocationError:
+                return 500, {'message': None}
+            if 'error' in outcome:
+                if outcome['error'] == 'Unauthorized':
+                    return 401, {'message': 'Unauthorized'}
+                return 500, {'message': None}
+            policy = outcome['result']
+            with self.cache_lock:
+                self.authorizer_cache[key] = (time.monotonic() + self.authorizer_ttl, policy)
+
+        if not policy_allows(policy, method_arn):
+            return 403, {'Message': 'User is not authorized to access this resource with an explicit deny'}
+
+        context = {name: str(value) for name, value in (policy.get('context') or {}).items()}
+        context['principalId'] = policy.get('principalId')
+        return None, context
+
+
+class ApiGatewayRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    gateway: LocalApiGateway
+
+    def do_GET(self):
+        self.dispatch()
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status: int, headers: Dict[str, Any], body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            for single in value if isinstance(value, list) else [value]:
+                self.send_header(name, str(single))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def send_json(self, status: int, body: Any, headers: Optional[Dict[str, Any]] = None) -> None:
+        self.send(status, dict({'Content-Type': 'application/json'}, **(headers or {})), json.dumps(body).encode())
+
+    def dispatch(self) -> None:
+        started = time.perf_counter()
+        gateway = self.gateway
+        url = urllib.parse.urlsplit(self.path)
+        path = url.path
+        if path == f'/{gateway.stage}' or path.startswith(f'/{gateway.stage}/'):
+            path = path[len(gateway.stage) + 1:] or '/'
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        if path == '/_local/token':
+            if gateway.issuer is None:
+                self.send_json(404, {'message': 'No token issuer with --authorizer none'})
+                return
+            query = dict(urllib.parse.parse_qsl(url.query))
+            token = gateway.issuer.issue(query.get('sub', 'auth0|local'), query.get('scope', ''))
+            self.send_json(200, {'access_token': token, 'token_type': 'Bearer', 'expires_in': 3600})
+            return
+
+        route, path_parameters, resource_matched = gateway.find_route(self.command, path)
+        if route is None:
+            if self.command == 'OPTIONS' and resource_matched:
+                self.send(200, dict(CORS_HEADERS, **{'Content-Type': 'application/json'}), b'{}')
+            else:
+                self.send_json(403, {'message': 'Missing Authentication Token'})
+            self.log_request_line(path, 200 if self.command == 'OPTIONS' and resource_matched else 403, started)
+            return
+
+        method_arn = gateway.method_arn(self.command, path)
+        authorizer_context: Dict[str, Any] = {}
+        if route.authorizer and gateway.authorizer_mode != 'none':
+            status, authorizer_context = gateway.authorize(route, self.headers.get('Authorization'), method_arn)
+            if status is not None:
+                self.send_json(status, authorizer_context)
+                self.log_request_line(path, status, started)
+                return
+
+        event = self.build_event(route, path, url.query, path_parameters, body, authorizer_context)
+        try:
+            outcome = gateway.pools[route.function].invoke(event)
+        except InvocationError:
+            outcome = {'error': 'worker exited', 'cold_start': True, 'init_ms': 0.0, 'duration_ms': 0.0}
+
+        local_headers = {
+            'X-Local-Function': route.function,
+            'X-Local-Cold-Start': 'true' if outcome['cold_start'] else 'false',
+            'X-Local-Init-Ms': f"{outcome['init_ms']:.1f}",
+            'X-Local-Duration-Ms': f"{outcome['duration_ms']:.1f}"
+        }
+        response = outcome.get('result')
+        if 'error' in outcome or not isinstance(response, dict) or 'statusCode' not in response:
+            self.send_json(502, {'message': 'Internal server error'}, local_headers)
+            self.log_request_line(path, 502, started)
+            return
+
+        headers = dict(response.get('headers') or {})
+        for name, values in (response.get('multiValueHeaders') or {}).items():
+            headers[name] = values
+        headers.update(local_headers)
+        payload = response.get('body') or ''
+        payload = base64.b64decode(payload) if response.get('isBase64Encoded') else payload.encode('utf-8')
+        self.send(int(response['statusCode']), headers, payload)
+        self.log_request_line(path, int(response['statusCode']), started, outcome['cold_start'])
+
+    def build_event(
+        self,
+        route: Route,
+        path: str,
+        query: str,
+        path_parameters: Dict[str, str],
+        body: bytes,
+        authorizer_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """REST API proxy event; with */* as a binary media type every body arrives base64 encoded"""
+        multi_query: Dict[str, List[str]] = {}
+        for name, value in urllib.parse.parse_qsl(query, keep_blank_values=True):
+            multi_query.setdefault(name, []).append(value)
+        multi_headers: Dict[str, List[str]] = {}
+        for name, value in self.headers.items():
+            multi_headers.setdefault(name, []).append(value)
+
+        return {
+            'resource': route.resource,
+            'path': path,
+            'httpMethod': self.command,
+            'headers': {name: values[-1] for name, values in multi_headers.items()} or None,
+            'multiValueHeaders': multi_headers or None,
+            'queryStringParameters': {name: values[-1] for name, values in multi_query.items()} or None,
+            'multiValueQueryStringParameters': multi_query or None,
+            'pathParameters': path_parameters or None,
+            'stageVariables': None,
+            'requestContext': {
+                'accountId': ACCOUNT_ID,
+                'apiId': API_ID,
+                'stage': self.gateway.stage,
+                'resourcePath': route.resource,
+                'httpMethod': self.command,
+                'path': f'/{self.gateway.stage}{path}',
+                'protocol': self.request_version,
+                'requestId': f'{time.time_ns():x}',
+                'requestTimeEpoch': int(time.time() * 1000),
+                'identity': {'sourceIp': self.client_address[0], 'userAgent': self.headers.get('User-Agent')},
+                'authorizer': authorizer_context or None
+            },
+            'body': base64.b64encode(body).decode('ascii') if body else None,
+            'isBase64Encoded': bool(body)
+        }
+
+    def log_request_line(self, path: str, status: int, started: float, cold: bool = False) -> None:
+        if self.gateway.access_log:
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{self.command:<7} {path:<48} {status} {elapsed:8.1f} ms{'  cold' if cold else ''}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--endpoint-url', help="Use an already running DynamoDB/S3 stand-in instead of moto")
+    parser.add_argument('--participants', type=int, default=5, help="Participants in the seeded trial")
+    parser.add_argument('--recipes', type=int, default=3, help="Recipes in the seeded trial")
+    parser.add_argument('--max-concurrency', type=int, default=10, help="Workers per function")
+    parser.add_argument('--idle-timeout', type=float, help="Discard workers idle for this many seconds")
+    parser.add_argument('--authorizer', choices=['emulate', 'in-handler', 'none'], default='emulate',
+                        help="in-handler: deploy as with enable_in_handler_auth, the handlers verify tokens")
+    parser.add_argument('--authorizer-ttl', type=float, default=AUTHORIZER_TTL_SECONDS,
+                        help="Seconds an authorizer policy is cached per token, 0 disables the cache")
+    parser.add_argument('--webhook-secret', default='local-webhook-secret')
+    parser.add_argument('--handler-logs', action='store_true', help="Pass handler output through to stderr")
+    args = parser.parse_args()
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        server, endpoint_url = start_local_aws()
+        seed_trial(connect(endpoint_url), participants=args.participants, recipes=args.recipes)
+
+    gateway = LocalApiGateway(
+        endpoint_url, args.host, args.port, args.max_concurrency, args.idle_timeout,
+        args.authorizer, args.authorizer_ttl, args.webhook_secret, args.handler_logs, access_log=True
+    )
+    for route in gateway.routes:
+        print(f"{route.http_method:<7} {route.resource:<32} -> {route.function}", file=sys.stderr)
+    print(f"Listening on {gateway.url} (services at {endpoint_url})", file=sys.stderr)
+
+    try:
+        gateway.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gateway.stop()
+        if server is not None:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
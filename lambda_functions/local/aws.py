@@ -0,0 +1,178 @@
+import socket
+import logging
+import boto3
+from decimal import Decimal
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# Local copies of the tables in infra/dynamodb.tf, keyed by the environment variable
+# each lambda reads the table name from
+TABLES: Dict[str, Dict[str, Any]] = {
+    'PARTICIPANTS_TABLE_NAME': {
+        'TableName': 'participant',
+        'KeySchema': [('participant_id', 'HASH')],
+        'Attributes': ['participant_id', 'code', 'trial_id'],
+        'Indexes': {
+            'code_index': [('code', 'HASH'), ('participant_id', 'RANGE')],
+            'trial_id_index': [('trial_id', 'HASH'), ('participant_id', 'RANGE')]
+        }
+    },
+    'RECIPES_TABLE_NAME': {
+        'TableName': 'recipe',
+        'KeySchema': [('recipe_id', 'HASH'), ('trial_id', 'RANGE')],
+        'Attributes': ['recipe_id', 'trial_id'],
+        'Indexes': {
+            'trial_id_index': [('trial_id', 'HASH'), ('recipe_id', 'RANGE')]
+        }
+    },
+    'TRIALS_TABLE_NAME': {
+        'TableName': 'trial',
+        'KeySchema': [('trial_id', 'HASH')],
+        'Attributes': ['trial_id'],
+        'Indexes': {}
+    },
+    'SUBMISSIONS_TABLE_NAME': {
+        'TableName': 'submission',
+        'KeySchema': [('submission_id', 'HASH'), ('recipe_id', 'RANGE')],
+        'Attributes': ['submission_id', 'recipe_id', 'participant_id', 'trial_id', 'last_updated'],
+        'Indexes': {
+            'participant_id_index': [('participant_id', 'HASH'), ('recipe_id', 'RANGE')],
+            'trial_id_index': [('trial_id', 'HASH'), ('recipe_id', 'RANGE')],
+            'recipe_id_index': [('recipe_id', 'HASH'), ('submission_id', 'RANGE')],
+            'trial_id_last_updated_index': [('trial_id', 'HASH'), ('last_updated', 'RANGE')]
+        }
+    },
+    'AGGREGATES_TABLE_NAME': {
+        'TableName': 'submission-aggregate',
+        'KeySchema': [('trial_id', 'HASH'), ('aggregate_key', 'RANGE')],
+        'Attributes': ['trial_id', 'aggregate_key'],
+        'Indexes': {}
+    },
+    'USERS_TABLE_NAME': {
+        'TableName': 'user',
+        'KeySchema': [('user_id', 'HASH')],
+        'Attributes': ['user_id'],
+        'Indexes': {}
+    }
+}
+
+VOICE_MEMO_BUCKET = 'voice-memos'
+REGION = 'us-west-2'
+OUTCOMES = ['sweetness', 'texture', 'aroma', 'overall']
+
+
+def lambda_environment(endpoint_url: Optional[str] = None) -> Dict[str, str]:
+    """
+    Environment variables the backend lambdas expect, pointed at the local stand-in.
+    AWS_ENDPOINT_URL routes every boto3 client to endpoint_url
+    """
+    environment = {name: definition['TableName'] for name, definition in TABLES.items()}
+    environment.update({
+        'VOICE_MEMO_BUCKET': VOICE_MEMO_BUCKET,
+        'DYNAMODB_READ_MODE': 'native',
+        'AWS_REGION': REGION,
+        'AWS_DEFAULT_REGION': REGION,
+        'AWS_ACCESS_KEY_ID': 'local',
+        'AWS_SECRET_ACCESS_KEY': 'local'
+    })
+    if endpoint_url:
+        environment['AWS_ENDPOINT_URL'] = endpoint_url
+    return environment
+
+
+def create_tables(dynamodb) -> None:
+    """Create every backend table on a boto3 DynamoDB resource"""
+    for definition in TABLES.values():
+        kwargs = {
+            'TableName': definition['TableName'],
+            'KeySchema': [{'AttributeName': name, 'KeyType': key_type} for name, key_type in definition['KeySchema']],
+            'AttributeDefinitions': [{'AttributeName': name, 'AttributeType': 'S'} for name in definition['Attributes']],
+            'BillingMode': 'PAY_PER_REQUEST'
+        }
+        if definition['Indexes']:
+            kwargs['GlobalSecondaryIndexes'] = [
+                {
+                    'IndexName': index_name,
+                    'KeySchema': [{'AttributeName': name, 'KeyType': key_type} for name, key_type in key_schema],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+                for index_name, key_schema in definition['Indexes'].items()
+            ]
+        dynamodb.create_table(**kwargs)
+
+
+def seed_trial(
+    dynamodb,
+    trial_id: str = 'trial-1',
+    participants: int = 5,
+    recipes: int = 3
+) -> Dict[str, List[str]]:
+    """
+    Write one trial with its participants, recipes and one submission per
+    participant x recipe x outcome. Returns the ids that were created
+    """
+    table = lambda name: dynamodb.Table(TABLES[name]['TableName'])
+    participant_ids = [f"participant-{index}" for index in range(participants)]
+    recipe_ids = [f"recipe-{index}" for index in range(recipes)]
+
+    table('TRIALS_TABLE_NAME').put_item(Item={'trial_id': trial_id, 'name': "Local trial", 'status': "active"})
+    with table('RECIPES_TABLE_NAME').batch_writer() as batch:
+        for recipe_id in recipe_ids:
+            batch.put_item(Item={'recipe_id': recipe_id, 'trial_id': trial_id, 'name': recipe_id})
+    with table('PARTICIPANTS_TABLE_NAME').batch_writer() as batch:
+        for position, participant_id in enumerate(participant_ids):
+            batch.put_item(Item={'participant_id': participant_id, 'trial_id': trial_id, 'code': f"{1000 + position}"})
+    with table('SUBMISSIONS_TABLE_NAME').batch_writer() as batch:
+        for position, (participant_id, recipe_id, outcome) in enumerate(
+            (participant_id, recipe_id, outcome)
+            for participant_id in participant_ids for recipe_id in recipe_ids for outcome in OUTCOMES
+        ):
+            batch.put_item(Item={
+                'submission_id': f"{participant_id}::{recipe_id}::{outcome}",
+                'recipe_id': recipe_id,
+                'trial_id': trial_id,
+                'participant_id': participant_id,
+                'score': Decimal(position % 10),
+                'status': "saved",
+                'version': 1,
+                'created_at': "2024-12-11T10:00:00.000000",
+                'last_updated': "2024-12-11T10:00:00.000000"
+            })
+
+    return {'trial_ids': [trial_id], 'participant_ids': participant_ids, 'recipe_ids': recipe_ids}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_local_aws(port: Optional[int] = None) -> Tuple[Any, str]:
+    """
+    Start moto's threaded server as a local DynamoDB/S3 stand-in, with every backend
+    table and the voice memo bucket created. Requires moto[server].
+    Returns the server (call .stop()) and its endpoint URL
+    """
+    from moto.server import ThreadedMotoServer
+
+    # Keep the per-request access log of the server out of the harness output
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    port = port or free_port()
+    server = ThreadedMotoServer(ip_address='127.0.0.1', port=port, verbose=False)
+    server.start()
+    endpoint_url = f"http://127.0.0.1:{port}"
+
+    session = boto3.session.Session(aws_access_key_id='local', aws_secret_access_key='local', region_name=REGION)
+    create_tables(session.resource('dynamodb', endpoint_url=endpoint_url))
+    session.client('s3', endpoint_url=endpoint_url).create_bucket(
+        Bucket=VOICE_MEMO_BUCKET,
+        CreateBucketConfiguration={'LocationConstraint': REGION}
+    )
+    return server, endpoint_url
+
+
+def connect(endpoint_url: str):
+    """boto3 DynamoDB resource for a local stand-in"""
+    session = boto3.session.Session(aws_access_key_id='local', aws_secret_access_key='local', region_name=REGION)
+    return session.resource('dynamodb', endpoint_url=endpoint_url)
@@ -0,0 +1,238 @@
+"""
+Cold-start harness for the Python Lambda handlers.
+
+Every lambda_functions/*/handler.py is started N times in a fresh interpreter with
+`-X importtime`, laid out like its Lambda package (handler directory plus the
+lambda_functions root on sys.path) and pointed at a local DynamoDB/S3 stand-in
+(moto's server, or --endpoint-url for DynamoDB Local / LocalStack). Each run reports:
+
+- init_ms: importing the handler module, i.e. Lambda INIT including prewarm()
+- first_response_ms: the first invocation with a representative event
+- process_ms: wall time of the whole interpreter, including Python startup
+- peak_rss_kb: maximum resident set size
+- imports: import time per top-level package (sum of -X importtime self times)
+
+    python lambda_functions/local/cold_start.py --repetitions 5 --output cold-start.json
+    python lambda_functions/local/cold_start.py --handler submission --handler trial
+
+The "handler" import entry is the handler module body itself, including prewarm().
+-X importtime adds some overhead of its own; compare runs against each other, not
+against CloudWatch INIT durations. The built-in stand-in needs moto[server].
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Optional, Dict, Any, List
+
+LAMBDA_FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+
+from local.aws import start_local_aws, connect, seed_trial, lambda_environment
+
+# Runs in the fresh interpreter. Only sys and time are imported before the handler,
+# so everything the handler pulls in shows up in the import breakdown
+CHILD_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+sys.path[:0] = [{handler_dir!r}, {root_dir!r}]
+import handler
+initialized = time.perf_counter()
+import json, os, resource
+event = json.loads(os.environ['COLD_START_EVENT'])
+invoked = time.perf_counter()
+response = handler.handler(event, None)
+responded = time.perf_counter()
+# ru_maxrss survives fork+exec and would report the harness's own peak; VmHWM does not
+try:
+    with open('/proc/self/status') as status:
+        rss = int(next(line for line in status if line.startswith('VmHWM:')).split()[1])
+except (OSError, StopIteration):
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss = rss // 1024 if sys.platform == 'darwin' else rss
+print(json.dumps({{
+    'init_ms': (initialized - started) * 1000,
+    'first_response_ms': (responded - invoked) * 1000,
+    'status_code': response.get('statusCode') if isinstance(response, dict) else None,
+    'peak_rss_kb': rss
+}}))
+"""
+
+# A representative first request for every handler. Transcription gets an incomplete
+# request: a real one would start and poll a Transcribe job
+SAMPLE_EVENTS: Dict[str, Dict[str, Any]] = {
+    'participant': {
+        'httpMethod': 'GET', 'resource': '/participant',
+        'queryStringParameters': {'trial_id': 'trial-1'}, 'pathParameters': None
+    },
+    'recipe': {
+        'httpMethod': 'GET', 'resource': '/recipe',
+        'queryStringParameters': {'trial_id': 'trial-1'}, 'pathParameters': None
+    },
+    'trial': {
+        'httpMethod': 'GET', 'resource': '/trial/{id}',
+        'queryStringParameters': None, 'pathParameters': {'id': 'trial-1'}
+    },
+    'submission': {
+        'httpMethod': 'GET', 'resource': '/submission',
+        'queryStringParameters': {'trial_id': 'trial-1'}, 'pathParameters': None,
+        'headers': {'Accept-Encoding': 'gzip'}
+    },
+    'submission_aggregates': {
+        'Records': [{
+            'eventID': 'cold-start',
+            'eventName': 'INSERT',
+            'eventSource': 'aws:dynamodb',
+            'dynamodb': {
+                'Keys': {'submission_id': {'S': 'participant-9::recipe-0::sweetness'}, 'recipe_id': {'S': 'recipe-0'}},
+                'NewImage': {
+                    'submission_id': {'S': 'participant-9::recipe-0::sweetness'},
+                    'recipe_id': {'S': 'recipe-0'},
+                    'trial_id': {'S': 'trial-1'},
+                    'score': {'N': '7'},
+                    'status': {'S': 'saved'}
+                },
+                'SequenceNumber': '1',
+                'StreamViewType': 'NEW_AND_OLD_IMAGES'
+            }
+        }]
+    },
+    'voice_memo': {
+        'httpMethod': 'POST', 'resource': '/voice-memo',
+        'body': json.dumps({'file_name': 'memo.webm', 'content_type': 'audio/webm'})
+    },
+    'transcription': {
+        'httpMethod': 'POST', 'resource': '/transcribe',
+        'body': json.dumps({'submission_id': 'participant-0::recipe-0::sweetness'})
+    }
+}
+
+
+def discover_handlers(selected: Optional[List[str]] = None) -> Dict[str, str]:
+    """Map handler name (its directory) to its directory for every lambda_functions/*/handler.py"""
+    handlers = {
+        os.path.basename(os.path.dirname(path)): os.path.dirname(path)
+        for path in sorted(glob.glob(os.path.join(LAMBDA_FUNCTIONS_DIR, '*', 'handler.py')))
+    }
+    if selected:
+        unknown = set(selected) - set(handlers)
+        if unknown:
+            raise ValueError(f"Unknown handlers: {', '.join(sorted(unknown))}")
+        handlers = {name: handlers[name] for name in selected}
+    return handlers
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """
+    Attribute -X importtime self times (ms) to top-level packages, so the handler's own
+    modules, boto3, botocore, numpy, ... each get the time spent executing their code
+    """
+    packages: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        self_us, _, name = fields
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1000
+    return packages
+
+
+def run_once(name: str, handler_dir: str, environment: Dict[str, str]) -> Dict[str, Any]:
+    env = dict(os.environ, **environment)
+    env['COLD_START_EVENT'] = json.dumps(SAMPLE_EVENTS.get(name, {}))
+    # Lambda sets this; prewarm() only builds services when it is present
+    env['AWS_LAMBDA_FUNCTION_NAME'] = f"cold-start-{name}"
+    env.pop('PYTHONPATH', None)
+
+    script = CHILD_SCRIPT.format(handler_dir=handler_dir, root_dir=LAMBDA_FUNCTIONS_DIR)
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        env=env, capture_output=True, text=True, cwd=handler_dir
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} failed to start:\n{completed.stderr[-2000:]}")
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['process_ms'] = process_ms
+    result['imports'] = parse_importtime(completed.stderr)
+    return result
+
+
+def summarize(runs: List[Dict[str, Any]], top_imports: int) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {'repetitions': len(runs), 'status_code': runs[-1]['status_code']}
+    for metric in ('init_ms', 'first_response_ms', 'process_ms', 'peak_rss_kb'):
+        values = [run[metric] for run in runs]
+        summary[metric] = {
+            'median': round(statistics.median(values), 2),
+            'min': round(min(values), 2),
+            'max': round(max(values), 2)
+        }
+
+    packages = {package for run in runs for package in run['imports']}
+    import_medians = {
+        package: round(statistics.median(run['imports'].get(package, 0.0) for run in runs), 2)
+        for package in packages
+    }
+    summary['imports_ms'] = dict(sorted(import_medians.items(), key=lambda item: -item[1])[:top_imports])
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repetitions', '-n', type=int, default=5)
+    parser.add_argument('--handler', action='append', help="Only measure this handler (repeatable)")
+    parser.add_argument('--endpoint-url', help="Use an already running DynamoDB/S3 stand-in instead of moto")
+    parser.add_argument('--top-imports', type=int, default=10)
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    handlers = discover_handlers(args.handler)
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        server, endpoint_url = start_local_aws()
+        seed_trial(connect(endpoint_url))
+
+    try:
+        environment = lambda_environment(endpoint_url)
+        report: Dict[str, Any] = {
+            'python': sys.version.split()[0],
+            'repetitions': args.repetitions,
+            'handlers': {}
+        }
+        for name, handler_dir in handlers.items():
+            runs = [run_once(name, handler_dir, environment) for _ in range(args.repetitions)]
+            report['handlers'][name] = summarize(runs, args.top_imports)
+            result = report['handlers'][name]
+            print(
+                f"{name:<22} init {result['init_ms']['median']:>8.1f} ms   "
+                f"first response {result['first_response_ms']['median']:>8.1f} ms   "
+                f"process {result['process_ms']['median']:>8.1f} ms   "
+                f"peak RSS {result['peak_rss_kb']['median'] / 1024:>6.1f} MiB",
+                file=sys.stderr
+            )
+    finally:
+        if server is not None:
+            server.stop()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
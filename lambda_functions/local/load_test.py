@@ -0,0 +1,322 @@
+"""
+Asyncio load generator replaying tasting sessions against the API.
+
+Every proctor is one keep-alive connection running a session like the frontend does: load the
+trial, its participants, recipes and submissions, then for each of its participants score every
+recipe on the 4 outcomes with one PUT /submission/{id} upsert each, reloading the participant's
+submissions and the recipe list every --reload-every writes (a page reload) and fetching the trial
+stats at the end of each participant. Participants are dealt round-robin to proctors.
+
+    python lambda_functions/local/load_test.py --proctors 16 --participants-per-proctor 2
+    python lambda_functions/local/load_test.py --url http://127.0.0.1:3000 --token "$TOKEN"
+
+Without --url a local API Gateway (local/api_gateway.py) and a seeded DynamoDB/S3 stand-in are
+started in-process. The report has throughput, latency percentiles per route, status counts and
+the cold starts the gateway reported through X-Local-Cold-Start.
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+import urllib.parse
+import urllib.request
+from typing import Optional, Dict, Any, List, Tuple
+
+LAMBDA_FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+
+from local.aws import start_local_aws, connect, seed_trial, OUTCOMES
+from local.api_gateway import LocalApiGateway, AUTHORIZER_TTL_SECONDS
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client; the gateway always answers with Content-Length"""
+
+    def __init__(self, host: str, port: int, token: Optional[str]):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.reader = self.writer = None
+
+    async def request(self, method: str, target: str, body: Optional[Any] = None) -> Tuple[int, Dict[str, str], bytes]:
+        payload = json.dumps(body).encode() if body is not None else b''
+        lines = [
+            f'{method} {target} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            'Accept-Encoding: gzip',
+            f'Content-Length: {len(payload)}'
+        ]
+        if payload:
+            lines.append('Content-Type: application/json')
+        if self.token:
+            lines.append(f'Authorization: Bearer {self.token}')
+        message = ('\r\n'.join(lines) + '\r\n\r\n').encode() + payload
+
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                self.writer.write(message)
+                await self.writer.drain()
+                return await self.read_response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server may drop an idle keep-alive connection; retry once on a new one
+                await self.close()
+                if attempt:
+                    raise
+        raise ConnectionError('unreachable')
+
+    async def read_response(self) -> Tuple[int, Dict[str, str], bytes]:
+        status_line = await self.reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = (await self.reader.readuntil(b'\r\n')).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('content-encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return status, headers, body
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: List[Tuple[str, int, float, bool]] = []
+        self.errors: List[str] = []
+
+    async def call(
+        self,
+        connection: Connection,
+        route: str,
+        method: str,
+        target: str,
+        body: Optional[Any] = None
+    ) -> Optional[Any]:
+        """Timed request; returns the parsed JSON body of a 2xx response"""
+        started = time.perf_counter()
+        try:
+            status, headers, payload = await connection.request(method, target, body)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            self.errors.append(f'{route}: {type(e).__name__}: {e}')
+            return None
+        self.samples.append((route, status, (time.perf_counter() - started) * 1000,
+                             headers.get('x-local-cold-start') == 'true'))
+        if 200 <= status < 300 and payload:
+            return json.loads(payload)
+        return None
+
+
+def quote(value: str) -> str:
+    return urllib.parse.quote(value, safe='')
+
+
+async def run_proctor(
+    index: int,
+    url: urllib.parse.SplitResult,
+    token: Optional[str],
+    trial_id: str,
+    args: argparse.Namespace,
+    recorder: Recorder
+) -> None:
+    connection = Connection(url.hostname, url.port or 80, token)
+    rng = random.Random(args.seed * 1000 + index)
+
+    async def think() -> None:
+        if args.think_ms:
+            await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+    try:
+        trial_query = f'trial_id={quote(trial_id)}'
+        await recorder.call(connection, 'GET /trial/{id}', 'GET', f'/trial/{quote(trial_id)}')
+        participants = await recorder.call(connection, 'GET /participant', 'GET', f'/participant?{trial_query}')
+        recipes = await recorder.call(connection, 'GET /recipe', 'GET', f'/recipe?{trial_query}')
+        await recorder.call(connection, 'GET /submission', 'GET', f'/submission?{trial_query}')
+        if not participants or not recipes:
+            recorder.errors.append(f'proctor {index}: could not load participants and recipes')
+            return
+
+        participant_ids = sorted(item['participant_id'] for item in participants['data'])
+        recipe_ids = sorted(item['recipe_id'] for item in recipes['data'])
+        assigned = [
+            participant_ids[(index + position * args.proctors) % len(participant_ids)]
+            for position in range(args.participants_per_proctor)
+        ]
+
+        writes = 0
+        for participant_id in assigned:
+            for recipe_id in recipe_ids:
+                for outcome in OUTCOMES:
+                    await think()
+                    submission_id = f'{participant_id}::{recipe_id}::{outcome}'
+                    await recorder.call(
+                        connection, 'PUT /submission/{id}', 'PUT',
+                        f'/submission/{quote(submission_id)}?recipe_id={quote(recipe_id)}',
+                        {
+                            'trial_id': trial_id,
+                            'participant_id': participant_id,
+                            'score': rng.randint(1, 9),
+                            'status': 'saved'
+                        }
+                    )
+                    writes += 1
+                    if args.reload_every and writes % args.reload_every == 0:
+                        await recorder.call(
+                            connection, 'GET /submission', 'GET',
+                            f'/submission?participant_id={quote(participant_id)}'
+                        )
+                        await recorder.call(connection, 'GET /recipe', 'GET', f'/recipe?{trial_query}')
+            await recorder.call(connection, 'GET /trial/{id}/stats', 'GET', f'/trial/{quote(trial_id)}/stats')
+    finally:
+        await connection.close()
+
+
+def summarize(latencies: List[float]) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))], 2)
+
+    return {
+        'requests': len(ordered),
+        'mean_ms': round(statistics.mean(ordered), 2),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': round(ordered[-1], 2)
+    }
+
+
+def build_report(recorder: Recorder, elapsed: float, args: argparse.Namespace) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        'python': sys.version.split()[0],
+        'proctors': args.proctors,
+        'participants_per_proctor': args.participants_per_proctor,
+        'think_ms': args.think_ms,
+        'authorizer': args.authorizer if args.url is None else None,
+        'duration_s': round(elapsed, 2),
+        'requests': len(recorder.samples),
+        'throughput_rps': round(len(recorder.samples) / elapsed, 1) if elapsed else 0.0,
+        'cold_starts': sum(1 for sample in recorder.samples if sample[3]),
+        'status_codes': {},
+        'errors': recorder.errors[:20],
+        'overall': summarize([sample[2] for sample in recorder.samples]) if recorder.samples else {},
+        'warm': {},
+        'routes': {}
+    }
+    for route, status, _, _ in recorder.samples:
+        report['status_codes'][str(status)] = report['status_codes'].get(str(status), 0) + 1
+
+    warm = [sample[2] for sample in recorder.samples if not sample[3]]
+    if warm:
+        report['warm'] = summarize(warm)
+    for route in sorted({sample[0] for sample in recorder.samples}):
+        report['routes'][route] = summarize([sample[2] for sample in recorder.samples if sample[0] == route])
+    return report
+
+
+async def run_load(url: str, tokens: List[Optional[str]], args: argparse.Namespace) -> Dict[str, Any]:
+    parsed = urllib.parse.urlsplit(url)
+    recorder = Recorder()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_proctor(index, parsed, tokens[index], args.trial_id, args, recorder) for index in range(args.proctors)
+    ))
+    return build_report(recorder, time.perf_counter() - started, args)
+
+
+def fetch_token(url: str, subject: str) -> Optional[str]:
+    """Token from the local gateway's issuer, None when it runs without authorizers"""
+    try:
+        with urllib.request.urlopen(f'{url}/_local/token?sub={quote(subject)}') as response:
+            return json.load(response)['access_token']
+    except OSError:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="Gateway to load; by default one is started in-process")
+    parser.add_argument('--token', help="Bearer token for every proctor; by default the local gateway issues one each")
+    parser.add_argument('--proctors', type=int, default=8, help="Concurrent sessions, one connection each")
+    parser.add_argument('--participants-per-proctor', type=int, default=2)
+    parser.add_argument('--recipes', type=int, default=3, help="Recipes in the seeded trial")
+    parser.add_argument('--trial-id', default='trial-1')
+    parser.add_argument('--reload-every', type=int, default=8, help="Writes between page reloads, 0 disables")
+    parser.add_argument('--think-ms', type=float, default=0, help="Mean pause before each score, 0 for none")
+    parser.add_argument('--max-concurrency', type=int, default=10, help="Workers per function (in-process gateway)")
+    parser.add_argument('--authorizer', choices=['emulate', 'in-handler', 'none'], default='emulate',
+                        help="Authorization mode of the in-process gateway")
+    parser.add_argument('--authorizer-ttl', type=float, default=AUTHORIZER_TTL_SECONDS,
+                        help="Authorizer cache TTL of the in-process gateway")
+    parser.add_argument('--endpoint-url', help="Use an already running DynamoDB/S3 stand-in instead of moto")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    server = gateway = None
+    url = args.url
+    try:
+        if url is None:
+            endpoint_url = args.endpoint_url
+            if endpoint_url is None:
+                server, endpoint_url = start_local_aws()
+                seed_trial(
+                    connect(endpoint_url), trial_id=args.trial_id,
+                    participants=args.proctors * args.participants_per_proctor, recipes=args.recipes
+                )
+            gateway = LocalApiGateway(
+                endpoint_url, port=0, max_concurrency=args.max_concurrency,
+                authorizer_mode=args.authorizer, authorizer_ttl=args.authorizer_ttl
+            )
+            gateway.start()
+            url = gateway.url
+
+        # Every proctor signs in separately, so authorizer caching is per proctor as in production
+        tokens = [args.token or fetch_token(url, f'auth0|proctor-{index}') for index in range(args.proctors)]
+        report = asyncio.run(run_load(url, tokens, args))
+    finally:
+        if gateway is not None:
+            gateway.stop()
+        if server is not None:
+            server.stop()
+
+    print(
+        f"{report['requests']} requests in {report['duration_s']} s: {report['throughput_rps']} req/s, "
+        f"{report['cold_starts']} cold starts, status {report['status_codes']}",
+        file=sys.stderr
+    )
+    for route, result in report['routes'].items():
+        print(
+            f"{route:<22} n={result['requests']:<6} p50 {result['p50_ms']:>8.1f} ms   "
+            f"p95 {result['p95_ms']:>8.1f} ms   p99 {result['p99_ms']:>8.1f} ms",
+            file=sys.stderr
+        )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
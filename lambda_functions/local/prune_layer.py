@@ -0,0 +1,402 @@
+"""
+Import-trace-driven pruning of the python-dependencies layer.
+
+Every handler that uses the layer is started in a fresh interpreter (site-packages disabled, so
+only the handler, the lambda_functions root and the layer are importable) and replays a set of
+representative events under an import tracer: an audit hook records every file opened from the
+layer, and the modules left in sys.modules add native extensions, which are loaded without an
+`open` event. The union of those files, plus a safety allowlist, becomes a prune manifest.
+
+The manifest is then applied to a copy of the layer with the same prune.py the layer installer
+runs at deploy time, the events are replayed against the slim copy, and the report compares
+outcomes, size and INIT time:
+
+    python lambda_functions/local/prune_layer.py --layer-dir build/python \\
+        --manifest lambda_functions/layers/python-dependencies.manifest.json --output-dir dist/slim-layer
+
+The layer must be installed for the interpreter running this script (`pip install --target
+<dir>/python --python-version 3.12 --only-binary=:all: ...`, then run with python3.12);
+native modules built for another Python cannot be imported and the trace would be incomplete.
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+import statistics
+import importlib.util
+import subprocess
+from typing import Any, Callable, Dict, List, Optional
+
+LAMBDA_FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+REPO_DIR = os.path.dirname(LAMBDA_FUNCTIONS_DIR)
+PRUNE_SCRIPT = os.path.join(REPO_DIR, 'infra', 'modules', 'lambda_layer', 'python_dependencies', 'prune.py')
+DEFAULT_LAYER_DIR = os.path.join(LAMBDA_FUNCTIONS_DIR, 'layers', 'python-dependencies', 'python')
+
+# Kept whatever the trace says: package metadata (licenses, entry points, importlib.metadata
+# lookups) and all of jwt, which picks algorithm modules per token and is small anyway
+DEFAULT_ALLOWLIST = ['*.dist-info/*', 'jwt/*']
+
+# What the Lambda Python runtime provides besides the standard library. Entity handlers import
+# boto3; these packages are linked into a directory behind the layer on sys.path, so site-packages
+# stays disabled and anything else missing from the (pruned) layer still fails to import
+RUNTIME_PACKAGES = ['boto3', 'botocore', 's3transfer', 'jmespath', 'dateutil', 'six', 'urllib3']
+
+# Runs in the fresh interpreter. HTTP(S) responses are served from TRACE_HTTP_RESPONSES so
+# handlers that fetch remote documents (JWKS) run offline; urllib is stdlib, not layer code
+CHILD_SCRIPT = """
+import sys, os, io, json, time
+layer_dir = {layer_dir!r}
+opened = set()
+
+def audit(event, args):
+    if event == 'open' and isinstance(args[0], str) and args[0].startswith(layer_dir):
+        opened.add(args[0])
+
+sys.addaudithook(audit)
+
+import urllib.request, urllib.response, email.message
+responses = json.loads(os.environ.get('TRACE_HTTP_RESPONSES', '{{}}'))
+
+# Patched instead of install_opener(): callers passing an SSL context bypass the global opener
+def urlopen(request, *args, **kwargs):
+    url = request if isinstance(request, str) else request.full_url
+    if url not in responses:
+        raise urllib.error.URLError(f"no local response for {{url}}")
+    headers = email.message.Message()
+    headers['Content-Type'] = 'application/json'
+    return urllib.response.addinfourl(io.BytesIO(responses[url].encode()), headers, url, 200)
+
+urllib.request.urlopen = urlopen
+
+sys.path[:0] = [{handler_dir!r}, {root_dir!r}, layer_dir]
+sys.path.extend({runtime_dirs!r})
+started = time.perf_counter()
+import handler
+init_ms = (time.perf_counter() - started) * 1000
+
+import contextlib
+outcomes = []
+for event in json.loads(os.environ['TRACE_EVENTS']):
+    # Handlers often collapse failures into one error; their log lines tell the paths apart
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            outcome = {{'result': handler.handler(event, None)}}
+        except Exception as e:
+            outcome = {{'error': f"{{type(e).__name__}}: {{e}}"}}
+    outcome['log'] = log.getvalue()
+    outcomes.append(outcome)
+
+for module in list(sys.modules.values()):
+    path = getattr(module, '__file__', None)
+    if path and path.startswith(layer_dir):
+        opened.add(path)
+
+print(json.dumps({{'init_ms': init_ms, 'outcomes': outcomes, 'files': sorted(opened)}}, default=str))
+"""
+
+
+def trace_tenant() -> Dict[str, Any]:
+    """
+    A throwaway RSA key served as the tenant's JWKS, and a signer for tokens issued by it:
+    token(), token(overrides) and token(kid=...)
+    """
+    import jwt
+    from jwt.algorithms import RSAAlgorithm
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    domain = 'trace.auth0.local'
+    audience = 'https://api.trace.local'
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update({'kid': 'trace-key', 'use': 'sig', 'alg': 'RS256'})
+
+    now = int(time.time())
+    claims = {'sub': 'auth0|trace', 'iss': f'https://{domain}/', 'aud': audience, 'iat': now, 'exp': now + 3600}
+
+    def token(overrides: Optional[Dict[str, Any]] = None, kid: str = 'trace-key') -> str:
+        return jwt.encode(dict(claims, **(overrides or {})), key, algorithm='RS256', headers={'kid': kid})
+
+    return {
+        'environment': {'AUTH0_DOMAIN': domain, 'AUTH0_AUDIENCE': audience},
+        'http_responses': {f'https://{domain}/.well-known/jwks.json': json.dumps({'keys': [jwk]})},
+        'rejected_tokens': [
+            token({'exp': now - 60}),
+            token({'aud': 'https://someone-else'}),
+            token(kid='unknown-key'),
+            'not-a-jwt',
+            ''
+        ],
+        'token': token
+    }
+
+
+def auth0_jwt_scenario() -> Dict[str, Any]:
+    """A valid token plus the rejection paths (expired, wrong audience, unknown kid, malformed, missing)"""
+    tenant = trace_tenant()
+    method_arn = 'arn:aws:execute-api:us-west-2:123456789012:api/dev/GET/trial'
+    tokens = [f"Bearer {tenant['token']()}"] + tenant['rejected_tokens']
+    return {
+        'handler_dir': os.path.join(LAMBDA_FUNCTIONS_DIR, 'authorizers', 'jwt', 'auth0'),
+        'environment': tenant['environment'],
+        'http_responses': tenant['http_responses'],
+        'events': [
+            {'type': 'TOKEN', 'authorizationToken': value, 'methodArn': method_arn} for value in tokens
+        ]
+    }
+
+
+def in_handler_auth_scenario() -> Dict[str, Any]:
+    """
+    common.auth.authenticate on the trial handler with IN_HANDLER_AUTH: an allowed request, one its
+    scopes do not grant, the token rejection paths and a CORS preflight. DynamoDB points at a closed
+    port, so the allowed request ends in the handler's error response without leaving the machine
+    """
+    tenant = trace_tenant()
+    token = tenant['token']({'scope': 'openid read:trials'})
+
+    def event(method: str, value: str, resource: str = '/trial') -> Dict[str, Any]:
+        headers = {'Authorization': f'Bearer {value}'} if value else {}
+        return {'httpMethod': method, 'resource': resource, 'path': resource, 'headers': headers,
+                'queryStringParameters': None, 'pathParameters': None, 'body': None, 'requestContext': {}}
+
+    return {
+        'handler_dir': os.path.join(LAMBDA_FUNCTIONS_DIR, 'trial'),
+        'environment': dict(tenant['environment'], **{
+            'IN_HANDLER_AUTH': 'true',
+            'AUTHORIZER_SCOPE_POLICIES': json.dumps({'read:trials': ['GET/*']}),
+            'TRIALS_TABLE_NAME': 'trial',
+            'AWS_DEFAULT_REGION': 'us-west-2',
+            'AWS_ACCESS_KEY_ID': 'trace',
+            'AWS_SECRET_ACCESS_KEY': 'trace',
+            'AWS_ENDPOINT_URL': 'http://127.0.0.1:9',
+            'AWS_MAX_ATTEMPTS': '1'
+        }),
+        'http_responses': tenant['http_responses'],
+        'runtime_packages': RUNTIME_PACKAGES,
+        'events': [event('GET', token), event('POST', token)]
+        + [event('GET', value) for value in tenant['rejected_tokens']]
+        + [event('OPTIONS', '')]
+    }
+
+
+# Every handler that imports from the layer, with a builder for its replay events
+SCENARIOS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    'authorizers/jwt/auth0': auth0_jwt_scenario,
+    'trial': in_handler_auth_scenario,
+}
+
+
+def runtime_dir(packages: List[str]) -> str:
+    """Directory holding links to just the given packages of the running interpreter"""
+    directory = tempfile.mkdtemp(prefix='lambda-runtime-')
+    for package in packages:
+        spec = importlib.util.find_spec(package)
+        if spec is None or not spec.origin:
+            raise RuntimeError(f"{package} is not installed; the handlers need it from the Lambda runtime")
+        path = os.path.dirname(spec.origin) if spec.submodule_search_locations else spec.origin
+        os.symlink(path, os.path.join(directory, os.path.basename(path)))
+    return directory
+
+
+def run_handler(scenario: Dict[str, Any], layer_dir: str, python: str, bytecode: bool = False) -> Dict[str, Any]:
+    layer_dir = os.path.abspath(layer_dir)
+    env = dict(os.environ, **scenario['environment'])
+    env['TRACE_EVENTS'] = json.dumps(scenario['events'])
+    env['TRACE_HTTP_RESPONSES'] = json.dumps(scenario['http_responses'])
+    env.pop('PYTHONPATH', None)
+
+    runtime_dirs = [runtime_dir(scenario['runtime_packages'])] if scenario.get('runtime_packages') else []
+    script = CHILD_SCRIPT.format(
+        layer_dir=layer_dir, handler_dir=scenario['handler_dir'], root_dir=LAMBDA_FUNCTIONS_DIR,
+        runtime_dirs=runtime_dirs
+    )
+    # -S: no site-packages, so nothing outside the layer can satisfy an import.
+    # -B: no __pycache__ written into the layer; bytecode follows its source when pruning
+    flags = ['-S'] if bytecode else ['-S', '-B']
+    try:
+        completed = subprocess.run(
+            [python, *flags, '-c', script], env=env, capture_output=True, text=True, cwd=scenario['handler_dir']
+        )
+    finally:
+        for directory in runtime_dirs:
+            shutil.rmtree(directory)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Handler failed to start:\n{completed.stderr[-2000:]}")
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['files'] = [
+        os.path.relpath(path, layer_dir).replace(os.sep, '/') for path in result['files']
+        if '__pycache__' not in path
+    ]
+    return result
+
+
+def native_pattern(relative_path: str) -> str:
+    """
+    _cffi_backend.cpython-311-x86_64-linux-gnu.so -> _cffi_backend.*.so, so a manifest traced on one
+    interpreter still matches the extension built for the runtime; abi3 names carry no version
+    """
+    directory, name = os.path.split(relative_path)
+    module, _, suffix = name.partition('.')
+    if not suffix.startswith('cpython-'):
+        return relative_path
+    return '/'.join(filter(None, [directory, f"{module}.*.so"]))
+
+
+def distributions(layer_dir: str) -> List[str]:
+    return sorted(name[:-len('.dist-info')] for name in os.listdir(layer_dir) if name.endswith('.dist-info'))
+
+
+def layer_size(layer_dir: str) -> Dict[str, Any]:
+    """File count, bytes on disk and deflated zip size, overall and per top-level entry"""
+    buffer = io.BytesIO()
+    files = 0
+    total = 0
+    by_package: Dict[str, int] = {}
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for current, dirs, names in os.walk(layer_dir):
+            dirs.sort()
+            for name in sorted(names):
+                path = os.path.join(current, name)
+                relative_path = os.path.relpath(path, layer_dir)
+                size = os.path.getsize(path)
+                files += 1
+                total += size
+                package = relative_path.split(os.sep)[0]
+                by_package[package] = by_package.get(package, 0) + size
+                archive.write(path, os.path.join('python', relative_path))
+    return {'files': files, 'bytes': total, 'zip_bytes': len(buffer.getvalue()), 'by_package': by_package}
+
+
+def compiled_copy(layer_dir: str, destination: str, python: str) -> str:
+    """Copy a layer and precompile it the way the layer installer does, so INIT times are comparable"""
+    shutil.copytree(layer_dir, destination, ignore=shutil.ignore_patterns('__pycache__'))
+    subprocess.run(
+        [python, '-m', 'compileall', '-q', '-j', '0', '--invalidation-mode', 'unchecked-hash', destination],
+        stdout=subprocess.DEVNULL, check=True
+    )
+    return destination
+
+
+def init_times(
+    scenario: Dict[str, Any], layers: Dict[str, str], python: str, repetitions: int
+) -> Dict[str, float]:
+    """Median INIT per layer; runs alternate between layers so machine noise hits both alike"""
+    samples: Dict[str, List[float]] = {name: [] for name in layers}
+    for repetition in range(repetitions + 1):
+        for name, layer_dir in layers.items():
+            init_ms = run_handler(scenario, layer_dir, python, bytecode=True)['init_ms']
+            # The first round only warms the page cache
+            if repetition > 0:
+                samples[name].append(init_ms)
+    return {name: round(statistics.median(values), 2) for name, values in samples.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--layer-dir', default=DEFAULT_LAYER_DIR, help="The layer's python/ directory")
+    parser.add_argument('--python', default=sys.executable, help="Interpreter matching the layer's native modules")
+    parser.add_argument('--handler', action='append', choices=sorted(SCENARIOS), help="Only trace this handler")
+    parser.add_argument('--allow', action='append', default=[], help="Extra glob (relative to python/) to always keep")
+    parser.add_argument('--manifest', help="Write the prune manifest here")
+    parser.add_argument('--output-dir', help="Keep the slimmed layer here (as <dir>/python)")
+    parser.add_argument('--repetitions', '-n', type=int, default=5, help="Cold starts per INIT time measurement")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    layer_dir = os.path.abspath(args.layer_dir)
+    scenarios = {name: SCENARIOS[name]() for name in (args.handler or sorted(SCENARIOS))}
+
+    traced: Dict[str, Dict[str, Any]] = {name: run_handler(scenario, layer_dir, args.python)
+                                         for name, scenario in scenarios.items()}
+    manifest = {
+        'generated_by': 'lambda_functions/local/prune_layer.py',
+        'python': subprocess.run(
+            [args.python, '-c', 'import platform; print(platform.python_version())'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip(),
+        'handlers': sorted(scenarios),
+        'distributions': distributions(layer_dir),
+        'allowlist': DEFAULT_ALLOWLIST + args.allow,
+        'keep': sorted({
+            path for result in traced.values() for path in result['files'] if not path.endswith('.so')
+        }),
+        'native': sorted({
+            native_pattern(path) for result in traced.values() for path in result['files'] if path.endswith('.so')
+        })
+    }
+    if args.manifest:
+        with open(args.manifest, 'w') as file:
+            file.write(json.dumps(manifest, indent=2) + '\n')
+
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix='pruned-layer-')
+    pruned_dir = os.path.join(output_dir, 'python')
+    try:
+        if os.path.exists(pruned_dir):
+            shutil.rmtree(pruned_dir)
+        shutil.copytree(layer_dir, pruned_dir, ignore=shutil.ignore_patterns('__pycache__'))
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as file:
+            json.dump(manifest, file)
+        prune_result = json.loads(subprocess.run(
+            [sys.executable, PRUNE_SCRIPT, pruned_dir, file.name], capture_output=True, text=True, check=True
+        ).stdout)
+        os.remove(file.name)
+        if not prune_result['pruned']:
+            raise RuntimeError(f"prune.py refused the manifest: {prune_result['reason']}")
+
+        compiled = {
+            'full': compiled_copy(layer_dir, os.path.join(output_dir, 'compiled', 'full'), args.python),
+            'pruned': compiled_copy(pruned_dir, os.path.join(output_dir, 'compiled', 'pruned'), args.python)
+        }
+        report: Dict[str, Any] = {
+            'python': manifest['python'],
+            'size': {'full': layer_size(layer_dir), 'pruned': layer_size(pruned_dir)},
+            'handlers': {}
+        }
+        for name, scenario in scenarios.items():
+            replayed = run_handler(scenario, pruned_dir, args.python)
+            report['handlers'][name] = {
+                'events': len(scenario['events']),
+                'traced_files': len(traced[name]['files']),
+                # Same responses and errors, event by event, with the full and the pruned layer
+                'outcomes_match': replayed['outcomes'] == traced[name]['outcomes'],
+                'init_ms': init_times(scenario, compiled, args.python, args.repetitions)
+            }
+        shutil.rmtree(os.path.join(output_dir, 'compiled'))
+    finally:
+        if not args.output_dir:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    full, pruned = report['size']['full'], report['size']['pruned']
+    print(
+        f"layer: {full['files']} -> {pruned['files']} files, "
+        f"{full['bytes'] / 1024:.0f} -> {pruned['bytes'] / 1024:.0f} KiB on disk, "
+        f"{full['zip_bytes'] / 1024:.0f} -> {pruned['zip_bytes'] / 1024:.0f} KiB zipped",
+        file=sys.stderr
+    )
+    for name, result in report['handlers'].items():
+        print(
+            f"{name:<24} INIT {result['init_ms']['full']:>7.1f} -> {result['init_ms']['pruned']:>7.1f} ms   "
+            f"outcomes match: {result['outcomes_match']}",
+            file=sys.stderr
+        )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if not all(result['outcomes_match'] for result in report['handlers'].values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,12 @@
 import json
 from services.participants import ParticipantService
 from decimal import Decimal
+from common.responses import handle_content_encoding
+from common.auth import authenticate
+from common.clients import get_service, prewarm
+from common.projection import parse_fields
+
+prewarm(ParticipantService)
 
 
 def decimal_default(obj):
@@ -24,6 +30,8 @@ def create_response(status_code: int, body: dict):
     }
 
 
+@authenticate
+@handle_content_encoding
 def handler(event, context):
     """
     Lambda handler for participant endpoints
@@ -34,7 +42,7 @@ def handler(event, context):
         query_params = event.get('queryStringParameters') or {}
         path_params = event.get('pathParameters') or {}
 
-        service = ParticipantService()
+        service = get_service(ParticipantService)
 
         # GET endpoint - retrieve participant by ID or by code
         if http_method == 'GET':
@@ -56,7 +64,13 @@ def handler(event, context):
             # Query by trial_id (without path param)
             elif 'trial_id' in query_params and 'id' not in path_params:
                 trial_id = query_params['trial_id']
-                participants = service.query_participants_by_trial(trial_id)
+                try:
+                    participants = service.query_participants_by_trial(trial_id, fields=parse_fields(query_params))
+                except ValueError as ve:
+                    return create_response(400, {
+                        'error': 'Invalid query parameter',
+                        'message': str(ve)
+                    })
 
                 return create_response(200, {
                     'message': 'Participants retrieved successfully',
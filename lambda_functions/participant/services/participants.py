@@ -1,15 +1,20 @@
 import os
-import boto3
 from boto3.dynamodb.conditions import Key
 from decimal import Decimal
 import uuid
 import random
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from common.clients import get_resource
+from common.projection import build_projection
+
+
+# Always included in fields= projections (common.projection)
+KEY_ATTRIBUTES = ['participant_id']
 
 
 class ParticipantService:
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.table_name = os.environ.get('PARTICIPANTS_TABLE_NAME')
         if not self.table_name:
             raise ValueError("PARTICIPANTS_TABLE_NAME environment variable is not set")
@@ -39,14 +44,16 @@ class ParticipantService:
         except Exception as e:
             raise Exception(f"Error retrieving participant by code: {str(e)}")
 
-    def query_participants_by_trial(self, trial_id: str):
+    def query_participants_by_trial(self, trial_id: str, fields: Optional[List[str]] = None):
         """
-        Query participants by trial_id using GSI
+        Query participants by trial_id using GSI, optionally reading only the given fields
         """
+        projection = build_projection(fields, KEY_ATTRIBUTES)
         try:
             response = self.table.query(
                 IndexName='trial_id_index',
-                KeyConditionExpression=Key('trial_id').eq(trial_id)
+                KeyConditionExpression=Key('trial_id').eq(trial_id),
+                **projection
             )
             return response.get('Items', [])
         except Exception as e:
@@ -1,14 +1,19 @@
 import os
-import boto3
 from boto3.dynamodb.conditions import Key
 from decimal import Decimal
 import uuid
 from typing import Optional, Dict, Any, List
+from common.clients import get_resource
+from common.projection import build_projection
+
+
+# Always included in fields= projections (common.projection)
+KEY_ATTRIBUTES = ['recipe_id', 'trial_id']
 
 
 class RecipeService:
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.table_name = os.environ.get('RECIPES_TABLE_NAME')
         if not self.table_name:
             raise ValueError("RECIPES_TABLE_NAME environment variable is not set")
@@ -29,14 +34,16 @@ class RecipeService:
         except Exception as e:
             raise Exception(f"Error retrieving recipe by ID: {str(e)}")
 
-    def query_recipes_by_trial(self, trial_id: str) -> List[Dict[str, Any]]:
+    def query_recipes_by_trial(self, trial_id: str, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
-        Query recipes by trial_id using GSI
+        Query recipes by trial_id using GSI, optionally reading only the given fields
         """
+        projection = build_projection(fields, KEY_ATTRIBUTES)
         try:
             response = self.table.query(
                 IndexName='trial_id_index',
-                KeyConditionExpression=Key('trial_id').eq(trial_id)
+                KeyConditionExpression=Key('trial_id').eq(trial_id),
+                **projection
             )
             return response.get('Items', [])
         except Exception as e:
@@ -0,0 +1,86 @@
+import json
+from common.responses import handle_content_encoding
+
+
+def load_participant():
+    from participant import handler
+    return handler
+
+
+def load_recipe():
+    from recipe import handler
+    return handler
+
+
+def load_trial():
+    from trial import handler
+    return handler
+
+
+def load_submission():
+    from submission import handler
+    return handler
+
+
+def load_voice_memo():
+    from voice_memo import handler
+    return handler
+
+
+# First path segment -> loader of the entity's controller module. The imports live in the loaders
+# so a container only pays for the entities it actually serves, while the packager still sees them
+ENTITY_LOADERS = {
+    'participant': load_participant,
+    'recipe': load_recipe,
+    'trial': load_trial,
+    'submission': load_submission,
+    'voice-memo': load_voice_memo,
+}
+
+loaded_entities = {}
+
+
+def create_response(status_code: int, body: dict):
+    """Create a standardized API Gateway response"""
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Headers': 'Content-Type',
+            'Access-Control-Allow-Methods': 'GET,POST,PUT,PATCH,DELETE,OPTIONS'
+        },
+        'body': json.dumps(body)
+    }
+
+
+def resolve_entity(event: dict):
+    """Entity name from the API Gateway resource (e.g. /trial/{id}/stats), falling back to the raw path"""
+    route = event.get('resource') or event.get('path') or ''
+    return route.strip('/').split('/')[0] or None
+
+
+def get_entity_handler(entity: str):
+    if entity not in loaded_entities:
+        loaded_entities[entity] = ENTITY_LOADERS[entity]()
+    return loaded_entities[entity]
+
+
+def handler(event, context):
+    """
+    Single entry point for all entity routes, dispatching to the existing per-entity controllers.
+    Each controller handles its own validation, errors and response encoding
+    """
+    entity = resolve_entity(event)
+    if entity not in ENTITY_LOADERS:
+        return not_found(event, context)
+
+    return get_entity_handler(entity).handler(event, context)
+
+
+@handle_content_encoding
+def not_found(event, context):
+    return create_response(404, {
+        'error': 'Not Found',
+        'message': f"No route for {event.get('httpMethod')} {event.get('resource') or event.get('path')}"
+    })
@@ -1,6 +1,18 @@
 import json
-from services.submissions import SubmissionService
+from services.submissions import SubmissionService, VersionConflictError, MAX_PAGE_SIZE, issue_watermark
 from decimal import Decimal
+from common.responses import handle_content_encoding
+from common.auth import authenticate
+from common.clients import get_service, prewarm
+from common.projection import parse_fields
+
+prewarm(SubmissionService)
+
+# Maximum number of submissions accepted by POST /submission/batch
+MAX_BATCH_SUBMISSIONS = 1000
+
+# Maximum number of keys accepted by POST /submission/batch-get
+MAX_BATCH_GET_KEYS = 5000
 
 
 def decimal_default(obj):
@@ -18,23 +30,242 @@ def create_response(status_code: int, body: dict):
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'GET,POST,PATCH,OPTIONS'
+            'Access-Control-Allow-Methods': 'GET,POST,PUT,PATCH,OPTIONS'
         },
         'body': json.dumps(body, default=decimal_default)
     }
 
 
+def list_submissions(service: SubmissionService, attribute: str, value: str, query_params: dict):
+    """
+    List submissions by recipe_id, trial_id or participant_id.
+    Returns a single page when limit or next_token is provided, otherwise every matching submission.
+    Trial listings include a watermark to send back as since for the next delta sync
+    """
+    since = query_params.get('since')
+    fields = parse_fields(query_params)
+    watermark = issue_watermark() if attribute == 'trial_id' else None
+
+    if 'limit' not in query_params and 'next_token' not in query_params:
+        try:
+            submissions = list(service.iter_submissions(attribute, value, since=since, fields=fields))
+        except ValueError as ve:
+            return create_response(400, {
+                'error': 'Invalid query parameter',
+                'message': str(ve)
+            })
+
+        body = {
+            'message': 'Submissions retrieved successfully',
+            'data': submissions,
+            'count': len(submissions)
+        }
+        if watermark is not None:
+            body['watermark'] = watermark
+        return create_response(200, body)
+
+    try:
+        limit = int(query_params.get('limit', MAX_PAGE_SIZE))
+    except (ValueError, TypeError):
+        return create_response(400, {
+            'error': 'Invalid query parameter',
+            'message': 'limit must be an integer'
+        })
+
+    try:
+        submissions, next_token = service.query_submissions_page(
+            attribute,
+            value,
+            limit=limit,
+            next_token=query_params.get('next_token'),
+            since=since,
+            fields=fields
+        )
+    except ValueError as ve:
+        return create_response(400, {
+            'error': 'Invalid query parameter',
+            'message': str(ve)
+        })
+
+    body = {
+        'message': 'Submissions retrieved successfully',
+        'data': submissions,
+        'count': len(submissions),
+        'next_token': next_token
+    }
+    if watermark is not None:
+        body['watermark'] = watermark
+    return create_response(200, body)
+
+
+def validate_batch_submission(submission) -> list:
+    """Return the validation errors for a single submission in a batch request"""
+    if not isinstance(submission, dict):
+        return ['submission must be an object']
+
+    errors = []
+    required_fields = ['recipe_id', 'trial_id', 'participant_id', 'score']
+    missing_fields = [field for field in required_fields if field not in submission]
+    if missing_fields:
+        errors.append(f'Required fields: {", ".join(missing_fields)}')
+
+    if 'score' in submission:
+        try:
+            float(submission['score'])
+        except (ValueError, TypeError):
+            errors.append('score must be a number')
+
+    if submission.get('status', 'draft') not in ['draft', 'saved']:
+        errors.append('status must be either "draft" or "saved"')
+
+    return errors
+
+
+def create_submissions_batch(service: SubmissionService, event: dict):
+    """
+    Create or update many submissions in one request.
+    Validates every submission up front and rejects the whole batch if any are invalid
+    """
+    try:
+        body = json.loads(event.get('body') or '{}')
+    except json.JSONDecodeError:
+        return create_response(400, {
+            'error': 'Invalid JSON',
+            'message': 'Request body must be valid JSON'
+        })
+
+    submissions = body.get('submissions') if isinstance(body, dict) else None
+    if not isinstance(submissions, list) or not submissions:
+        return create_response(400, {
+            'error': 'Missing required fields',
+            'message': 'submissions must be a non-empty list'
+        })
+
+    if len(submissions) > MAX_BATCH_SUBMISSIONS:
+        return create_response(400, {
+            'error': 'Batch too large',
+            'message': f'A batch may contain at most {MAX_BATCH_SUBMISSIONS} submissions'
+        })
+
+    errors = []
+    for index, submission in enumerate(submissions):
+        for message in validate_batch_submission(submission):
+            errors.append({'index': index, 'message': message})
+
+    if errors:
+        return create_response(400, {
+            'error': 'Validation error',
+            'message': 'One or more submissions are invalid',
+            'errors': errors
+        })
+
+    try:
+        written = service.batch_upsert_submissions([
+            {
+                'recipe_id': submission['recipe_id'],
+                'trial_id': submission['trial_id'],
+                'participant_id': submission['participant_id'],
+                'score': float(submission['score']),
+                'status': submission.get('status', 'draft'),
+                'notes': submission.get('notes'),
+                'voice_memo_key': submission.get('voice_memo_key'),
+                'submission_id': submission.get('submission_id'),
+                'transcription': submission.get('transcription')
+            }
+            for submission in submissions
+        ])
+    except ValueError as ve:
+        return create_response(400, {
+            'error': 'Validation error',
+            'message': str(ve)
+        })
+
+    return create_response(200, {
+        'message': 'Submissions saved successfully',
+        'data': written,
+        'count': len(written)
+    })
+
+
+def get_submissions_batch(service: SubmissionService, event: dict):
+    """
+    Fetch many submissions by (submission_id, recipe_id) in one request.
+    Results are returned in the order of the requested keys, with null for missing submissions
+    """
+    try:
+        body = json.loads(event.get('body') or '{}')
+    except json.JSONDecodeError:
+        return create_response(400, {
+            'error': 'Invalid JSON',
+            'message': 'Request body must be valid JSON'
+        })
+
+    keys = body.get('keys') if isinstance(body, dict) else None
+    if not isinstance(keys, list) or not keys:
+        return create_response(400, {
+            'error': 'Missing required fields',
+            'message': 'keys must be a non-empty list'
+        })
+
+    if len(keys) > MAX_BATCH_GET_KEYS:
+        return create_response(400, {
+            'error': 'Batch too large',
+            'message': f'A batch may contain at most {MAX_BATCH_GET_KEYS} keys'
+        })
+
+    errors = []
+    for index, key in enumerate(keys):
+        if not isinstance(key, dict) or not all(
+            isinstance(key.get(field), str) and key.get(field) for field in ('submission_id', 'recipe_id')
+        ):
+            errors.append({'index': index, 'message': 'submission_id and recipe_id must be non-empty strings'})
+
+    if errors:
+        return create_response(400, {
+            'error': 'Validation error',
+            'message': 'One or more keys are invalid',
+            'errors': errors
+        })
+
+    fields = body.get('fields')
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(field, str) for field in fields)):
+        return create_response(400, {
+            'error': 'Invalid field type',
+            'message': 'fields must be a list of attribute names'
+        })
+
+    try:
+        submissions = service.batch_get_submissions(
+            [{'submission_id': key['submission_id'], 'recipe_id': key['recipe_id']} for key in keys],
+            fields=fields
+        )
+    except ValueError as ve:
+        return create_response(400, {
+            'error': 'Validation error',
+            'message': str(ve)
+        })
+
+    return create_response(200, {
+        'message': 'Submissions retrieved successfully',
+        'data': submissions,
+        'count': len(submissions),
+        'missing_count': sum(1 for submission in submissions if submission is None)
+    })
+
+
+@authenticate
+@handle_content_encoding
 def handler(event, context):
     """
     Lambda handler for submission endpoints
-    Routes GET, POST, and PATCH requests
+    Routes GET, POST, PUT, and PATCH requests
     """
     try:
         http_method = event.get('httpMethod')
         query_params = event.get('queryStringParameters') or {}
         path_params = event.get('pathParameters') or {}
 
-        service = SubmissionService()
+        service = get_service(SubmissionService)
 
         # GET endpoint - retrieve submission by ID or query by recipe/trial/participant
         if http_method == 'GET':
@@ -57,36 +288,15 @@ def handler(event, context):
 
             # Query by recipe_id (without path param)
             elif 'recipe_id' in query_params and 'id' not in path_params:
-                recipe_id = query_params['recipe_id']
-                submissions = service.query_submissions_by_recipe(recipe_id)
-
-                return create_response(200, {
-                    'message': 'Submissions retrieved successfully',
-                    'data': submissions,
-                    'count': len(submissions)
-                })
+                return list_submissions(service, 'recipe_id', query_params['recipe_id'], query_params)
 
             # Query by trial_id
             elif 'trial_id' in query_params:
-                trial_id = query_params['trial_id']
-                submissions = service.query_submissions_by_trial(trial_id)
-
-                return create_response(200, {
-                    'message': 'Submissions retrieved successfully',
-                    'data': submissions,
-                    'count': len(submissions)
-                })
+                return list_submissions(service, 'trial_id', query_params['trial_id'], query_params)
 
             # Query by participant_id
             elif 'participant_id' in query_params:
-                participant_id = query_params['participant_id']
-                submissions = service.query_submissions_by_participant(participant_id)
-
-                return create_response(200, {
-                    'message': 'Submissions retrieved successfully',
-                    'data': submissions,
-                    'count': len(submissions)
-                })
+                return list_submissions(service, 'participant_id', query_params['participant_id'], query_params)
 
             else:
                 return create_response(400, {
@@ -94,6 +304,13 @@ def handler(event, context):
                     'message': 'Must provide either query parameters (recipe_id, trial_id, or participant_id) for listing, or path parameter (id) with recipe_id query parameter for single submission'
                 })
 
+        # POST endpoint - create or replace many submissions at once
+        elif http_method == 'POST' and event.get('resource') == '/submission/batch':
+            return create_submissions_batch(service, event)
+
+        elif http_method == 'POST' and event.get('resource') == '/submission/batch-get':
+            return get_submissions_batch(service, event)
+
         # POST endpoint - create new submission
         elif http_method == 'POST':
             try:
@@ -221,6 +438,91 @@ def handler(event, context):
                     'message': str(ve)
                 })
 
+        # PUT endpoint - create or update a submission in one idempotent write
+        elif http_method == 'PUT':
+            if 'id' not in path_params or 'recipe_id' not in query_params:
+                return create_response(400, {
+                    'error': 'Bad Request',
+                    'message': 'Must provide id in path and recipe_id in query parameters'
+                })
+
+            submission_id = path_params['id']
+            recipe_id = query_params['recipe_id']
+
+            try:
+                body = json.loads(event.get('body') or '{}')
+            except json.JSONDecodeError:
+                return create_response(400, {
+                    'error': 'Invalid JSON',
+                    'message': 'Request body must be valid JSON'
+                })
+
+            # Validate required fields
+            required_fields = ['trial_id', 'participant_id', 'score']
+            missing_fields = [field for field in required_fields if field not in body]
+
+            if missing_fields:
+                return create_response(400, {
+                    'error': 'Missing required fields',
+                    'message': f'Required fields: {", ".join(missing_fields)}'
+                })
+
+            # Validate score is numeric
+            try:
+                float(body['score'])
+            except (ValueError, TypeError):
+                return create_response(400, {
+                    'error': 'Invalid field type',
+                    'message': 'score must be a number'
+                })
+
+            # Validate status if provided
+            status = body.get('status', 'draft')
+            if status not in ['draft', 'saved']:
+                return create_response(400, {
+                    'error': 'Invalid status',
+                    'message': 'status must be either "draft" or "saved"'
+                })
+
+            # Validate expected_version if provided
+            expected_version = body.get('expected_version')
+            if expected_version is not None:
+                if isinstance(expected_version, bool) or not isinstance(expected_version, (int, float)) \
+                        or expected_version < 0 or int(expected_version) != expected_version:
+                    return create_response(400, {
+                        'error': 'Invalid field type',
+                        'message': 'expected_version must be a non-negative integer'
+                    })
+                expected_version = int(expected_version)
+
+            try:
+                submission = service.upsert_submission(
+                    submission_id=submission_id,
+                    recipe_id=recipe_id,
+                    trial_id=body['trial_id'],
+                    participant_id=body['participant_id'],
+                    score=float(body['score']),
+                    status=status,
+                    notes=body.get('notes'),
+                    voice_memo_key=body.get('voice_memo_key'),
+                    expected_version=expected_version
+                )
+            except ValueError as ve:
+                return create_response(400, {
+                    'error': 'Validation error',
+                    'message': str(ve)
+                })
+            except VersionConflictError as vce:
+                return create_response(409, {
+                    'error': 'Version conflict',
+                    'message': str(vce)
+                })
+
+            return create_response(200, {
+                'message': 'Submission saved successfully',
+                'data': submission
+            })
+
         elif http_method == 'OPTIONS':
             return create_response(200, {'message': 'OK'})
 
@@ -1,26 +1,161 @@
 import os
-import boto3
+import json
+import time
+import base64
+import random
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 from decimal import Decimal
 import uuid
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Iterator, Tuple
+from common.dynamodb import NativeTable, native_reads_enabled
+from common.clients import get_resource
+from common.projection import build_projection
+
+
+# GSI used for each attribute submissions can be listed by
+QUERY_INDEXES = {
+    'recipe_id': 'recipe_id_index',
+    'trial_id': 'trial_id_index',
+    'participant_id': 'participant_id_index'
+}
+
+# GSI on trial_id + last_updated used for delta sync
+TRIAL_UPDATES_INDEX = 'trial_id_last_updated_index'
+
+# Watermarks trail the server clock so writes that are still propagating to the
+# GSI when the watermark is issued are picked up by the next delta sync
+WATERMARK_LAG = timedelta(seconds=5)
+
+MAX_PAGE_SIZE = 1000
+
+# Always included in fields= projections (common.projection)
+KEY_ATTRIBUTES = ['submission_id', 'recipe_id']
+
+# BatchWriteItem accepts at most 25 put/delete requests per call
+BATCH_WRITE_SIZE = 25
+MAX_BATCH_WRITE_ATTEMPTS = 6
+# Stored attributes a batch write keeps when a submission leaves them out, as update_submission
+# would: the transcription flow and voice memo uploads write them outside the session page
+BATCH_PRESERVED_ATTRIBUTES = ['notes', 'voice_memo_key', 'transcription']
+BATCH_WRITE_BASE_DELAY = 0.05
+BATCH_WRITE_MAX_DELAY = 2.0
+
+# BatchGetItem returns at most 100 keys per call; chunks are fetched concurrently
+BATCH_GET_SIZE = 100
+BATCH_GET_WORKERS = 8
+MAX_BATCH_GET_ATTEMPTS = 6
+BATCH_GET_BASE_DELAY = 0.05
+BATCH_GET_MAX_DELAY = 1.0
+
+
+def batch_version() -> int:
+    """
+    Version stamped on items replaced by BatchWriteItem, which can neither ADD to the stored
+    version nor check it. The microsecond clock is far above any version reached by counting
+    single writes, so a client holding an earlier version of a replaced item gets a conflict
+    """
+    return time.time_ns() // 1000
+
+
+class VersionConflictError(Exception):
+    """Raised when a conditional write finds a different submission version than expected"""
+
+
+def encode_next_token(
+    last_evaluated_key: Optional[Dict[str, Any]],
+    index_name: Optional[str] = None,
+    value: Optional[str] = None,
+    since: Optional[str] = None
+) -> Optional[str]:
+    """
+    Encode a DynamoDB LastEvaluatedKey as an opaque, URL-safe pagination token, together with
+    the index, key value and since filter of the query it continues
+    """
+    if not last_evaluated_key:
+        return None
+    token = {'index': index_name, 'value': value, 'since': since, 'key': last_evaluated_key}
+    raw = json.dumps(token, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_next_token(
+    next_token: str,
+    index_name: Optional[str] = None,
+    value: Optional[str] = None,
+    since: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Decode a pagination token produced by encode_next_token back into an ExclusiveStartKey.
+    Raises ValueError when the token is malformed or was issued for a different query
+    """
+    try:
+        padding = '=' * (-len(next_token) % 4)
+        token = json.loads(base64.urlsafe_b64decode(next_token + padding).decode('utf-8'))
+    except (ValueError, TypeError):
+        raise ValueError("next_token is invalid")
+    key = token.get('key') if isinstance(token, dict) else None
+    if not isinstance(key, dict) or not all(isinstance(item, str) for item in key.values()):
+        raise ValueError("next_token is invalid")
+    if (token.get('index'), token.get('value'), token.get('since')) != (index_name, value, since):
+        raise ValueError("next_token does not belong to this query")
+    return key
+
+
+def normalize_since(since: str) -> str:
+    """
+    Parse an ISO 8601 timestamp and format it like last_updated (naive UTC, microseconds)
+    so it can be compared against the trial_id + last_updated index
+    """
+    try:
+        parsed = datetime.fromisoformat(since.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        raise ValueError("since must be an ISO 8601 timestamp")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat(timespec='microseconds')
+
+
+def current_timestamp() -> str:
+    """
+    last_updated for a write. Microseconds are always included, so stored values and
+    since watermarks compare correctly as strings
+    """
+    return datetime.utcnow().isoformat(timespec='microseconds')
+
+
+def issue_watermark() -> str:
+    """
+    Return the watermark a client should send as since on its next delta sync
+    """
+    return (datetime.utcnow() - WATERMARK_LAG).isoformat(timespec='microseconds')
 
 
 class SubmissionService:
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.table_name = os.environ.get('SUBMISSIONS_TABLE_NAME')
         if not self.table_name:
             raise ValueError("SUBMISSIONS_TABLE_NAME environment variable is not set")
         self.table = self.dynamodb.Table(self.table_name)
 
+        # Reads optionally bypass the resource layer and return int/float instead of Decimal
+        if native_reads_enabled():
+            self.reader = NativeTable(self.table_name)
+            self.batch_reader = self.reader
+        else:
+            self.reader = self.table
+            # The low-level client is thread-safe, unlike the resource it belongs to
+            self.batch_reader = self.dynamodb.meta.client
+
     def get_submission_by_id(self, submission_id: str, recipe_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a submission by its submission_id and recipe_id (composite key)
         """
         try:
-            response = self.table.get_item(
+            response = self.reader.get_item(
                 Key={
                     'submission_id': submission_id,
                     'recipe_id': recipe_id
@@ -30,44 +165,170 @@ class SubmissionService:
         except Exception as e:
             raise Exception(f"Error retrieving submission by ID: {str(e)}")
 
-    def query_submissions_by_recipe(self, recipe_id: str) -> List[Dict[str, Any]]:
+    def _query_pages(
+        self,
+        attribute: str,
+        value: str,
+        limit: Optional[int] = None,
+        exclusive_start_key: Optional[Dict[str, Any]] = None,
+        since: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Query submissions by recipe_id using GSI
+        Yield raw query responses from the GSI for the given attribute, following
+        LastEvaluatedKey until DynamoDB reports no more pages.
+        When since is given, only trial submissions updated after it are returned.
+        When fields is given, only those attributes (plus the key) are read
+        """
+        query_kwargs = {'IndexName': self._query_index(attribute, since)}
+        if since is not None:
+            query_kwargs['KeyConditionExpression'] = Key(attribute).eq(value) & Key('last_updated').gt(since)
+        else:
+            query_kwargs['KeyConditionExpression'] = Key(attribute).eq(value)
+        query_kwargs.update(build_projection(fields, KEY_ATTRIBUTES))
+        if limit is not None:
+            query_kwargs['Limit'] = limit
+        if exclusive_start_key is not None:
+            query_kwargs['ExclusiveStartKey'] = exclusive_start_key
+
+        while True:
+            response = self.reader.query(**query_kwargs)
+            yield response
+
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                return
+            query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+    @staticmethod
+    def _query_index(attribute: str, since: Optional[str]) -> str:
+        """GSI serving a query by attribute, with or without a since filter"""
+        return TRIAL_UPDATES_INDEX if since is not None else QUERY_INDEXES[attribute]
+
+    @staticmethod
+    def _validate_query(attribute: str, since: Optional[str]) -> Optional[str]:
+        """
+        Check the query attribute and return since normalized for the last_updated index
         """
+        if attribute not in QUERY_INDEXES:
+            raise ValueError(f"Cannot query submissions by {attribute}")
+        if since is None:
+            return None
+        if attribute != 'trial_id':
+            raise ValueError("since is only supported when querying by trial_id")
+        return normalize_since(since)
+
+    def iter_submissions(
+        self,
+        attribute: str,
+        value: str,
+        since: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every submission matching recipe_id, trial_id or participant_id,
+        one DynamoDB page at a time. For trial_id, since limits results to submissions
+        updated after that timestamp
+        """
+        since = self._validate_query(attribute, since)
+        build_projection(fields, KEY_ATTRIBUTES)
         try:
-            response = self.table.query(
-                IndexName='recipe_id_index',
-                KeyConditionExpression=Key('recipe_id').eq(recipe_id)
-            )
-            return response.get('Items', [])
+            for page in self._query_pages(attribute, value, since=since, fields=fields):
+                yield from page.get('Items', [])
         except Exception as e:
-            raise Exception(f"Error querying submissions by recipe_id: {str(e)}")
+            raise Exception(f"Error querying submissions by {attribute}: {str(e)}")
 
-    def query_submissions_by_trial(self, trial_id: str) -> List[Dict[str, Any]]:
+    def query_submissions_page(
+        self,
+        attribute: str,
+        value: str,
+        limit: int,
+        next_token: Optional[str] = None,
+        since: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        Query submissions by trial_id using GSI
+        Fetch a single page of submissions matching recipe_id, trial_id or participant_id.
+        Returns the items and an opaque token for the next page (None on the last page).
+        A token only continues the query it came from (same index, value and since)
         """
+        since = self._validate_query(attribute, since)
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        index_name = self._query_index(attribute, since)
+        exclusive_start_key = decode_next_token(next_token, index_name, value, since) if next_token else None
+        build_projection(fields, KEY_ATTRIBUTES)
+
         try:
-            response = self.table.query(
-                IndexName='trial_id_index',
-                KeyConditionExpression=Key('trial_id').eq(trial_id)
-            )
-            return response.get('Items', [])
+            response = next(self._query_pages(attribute, value, limit, exclusive_start_key, since, fields))
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            return response.get('Items', []), encode_next_token(last_evaluated_key, index_name, value, since)
         except Exception as e:
-            raise Exception(f"Error querying submissions by trial_id: {str(e)}")
+            raise Exception(f"Error querying submissions by {attribute}: {str(e)}")
+
+    def query_submissions_by_recipe(self, recipe_id: str) -> List[Dict[str, Any]]:
+        """
+        Query submissions by recipe_id using GSI
+        """
+        return list(self.iter_submissions('recipe_id', recipe_id))
+
+    def query_submissions_by_trial(self, trial_id: str) -> List[Dict[str, Any]]:
+        """
+        Query submissions by trial_id using GSI
+        """
+        return list(self.iter_submissions('trial_id', trial_id))
 
     def query_submissions_by_participant(self, participant_id: str) -> List[Dict[str, Any]]:
         """
         Query submissions by participant_id using GSI
         """
-        try:
-            response = self.table.query(
-                IndexName='participant_id_index',
-                KeyConditionExpression=Key('participant_id').eq(participant_id)
-            )
-            return response.get('Items', [])
-        except Exception as e:
-            raise Exception(f"Error querying submissions by participant_id: {str(e)}")
+        return list(self.iter_submissions('participant_id', participant_id))
+
+    @staticmethod
+    def _build_submission_item(
+        recipe_id: str,
+        trial_id: str,
+        participant_id: str,
+        score: float,
+        status: str = "draft",
+        notes: Optional[str] = None,
+        voice_memo_key: Optional[str] = None,
+        submission_id: Optional[str] = None,
+        transcription: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate submission fields and build the DynamoDB item
+        """
+        # Validate status
+        if status not in ["draft", "saved"]:
+            raise ValueError("Status must be 'draft' or 'saved'")
+
+        # Use provided submission_id or generate a new one
+        if submission_id is None:
+            submission_id = str(uuid.uuid4())
+        current_time = current_timestamp()
+
+        item = {
+            'submission_id': submission_id,
+            'recipe_id': recipe_id,
+            'trial_id': trial_id,
+            'participant_id': participant_id,
+            'score': Decimal(str(score)),
+            'status': status,
+            'last_updated': current_time,
+            'created_at': current_time
+        }
+
+        # Add optional fields if provided
+        if notes is not None:
+            item['notes'] = notes
+        if voice_memo_key is not None:
+            item['voice_memo_key'] = voice_memo_key
+        if transcription is not None:
+            item['transcription'] = transcription
+
+        return item
 
     def create_submission(
         self,
@@ -84,30 +345,18 @@ class SubmissionService:
         Create a new submission
         """
         try:
-            # Validate status
-            if status not in ["draft", "saved"]:
-                raise ValueError("Status must be 'draft' or 'saved'")
+            item = self._build_submission_item(
+                recipe_id=recipe_id,
+                trial_id=trial_id,
+                participant_id=participant_id,
+                score=score,
+                status=status,
+                notes=notes,
+                voice_memo_key=voice_memo_key,
+                submission_id=submission_id
+            )
 
-            # Use provided submission_id or generate a new one
-            if submission_id is None:
-                submission_id = str(uuid.uuid4())
-            current_time = datetime.utcnow().isoformat()
-
-            item = {
-                'submission_id': submission_id,
-                'recipe_id': recipe_id,
-                'trial_id': trial_id,
-                'participant_id': participant_id,
-                'score': Decimal(str(score)),
-                'status': status,
-                'last_updated': current_time
-            }
-
-            # Add optional fields if provided
-            if notes is not None:
-                item['notes'] = notes
-            if voice_memo_key is not None:
-                item['voice_memo_key'] = voice_memo_key
+            item['version'] = 1
 
             self.table.put_item(Item=item)
             return item
@@ -116,6 +365,227 @@ class SubmissionService:
         except Exception as e:
             raise Exception(f"Error creating submission: {str(e)}")
 
+    def upsert_submission(
+        self,
+        submission_id: str,
+        recipe_id: str,
+        trial_id: str,
+        participant_id: str,
+        score: float,
+        status: str = "draft",
+        notes: Optional[str] = None,
+        voice_memo_key: Optional[str] = None,
+        expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Create or update a submission with a single update_item call, so callers do not
+        need to read first to decide between create and update.
+        trial_id, participant_id and created_at are only written when the submission is created.
+        When expected_version is given, the write only succeeds if the stored version matches
+        (0 means the submission must not exist yet); otherwise VersionConflictError is raised
+        """
+        if status not in ["draft", "saved"]:
+            raise ValueError("Status must be 'draft' or 'saved'")
+
+        current_time = current_timestamp()
+        set_parts = [
+            "#score = :score",
+            "#status = :status",
+            "#last_updated = :last_updated",
+            "#trial_id = if_not_exists(#trial_id, :trial_id)",
+            "#participant_id = if_not_exists(#participant_id, :participant_id)",
+            "#created_at = if_not_exists(#created_at, :last_updated)"
+        ]
+        expression_attribute_names = {
+            '#score': 'score',
+            '#status': 'status',
+            '#last_updated': 'last_updated',
+            '#trial_id': 'trial_id',
+            '#participant_id': 'participant_id',
+            '#created_at': 'created_at',
+            '#version': 'version'
+        }
+        expression_attribute_values = {
+            ':score': Decimal(str(score)),
+            ':status': status,
+            ':last_updated': current_time,
+            ':trial_id': trial_id,
+            ':participant_id': participant_id,
+            ':one': 1
+        }
+
+        # Optional fields are only overwritten when provided
+        for field, value in (('notes', notes), ('voice_memo_key', voice_memo_key)):
+            if value is not None:
+                set_parts.append(f"#{field} = :{field}")
+                expression_attribute_names[f"#{field}"] = field
+                expression_attribute_values[f":{field}"] = value
+
+        update_kwargs = {
+            'Key': {
+                'submission_id': submission_id,
+                'recipe_id': recipe_id
+            },
+            'UpdateExpression': "SET " + ", ".join(set_parts) + " ADD #version :one",
+            'ExpressionAttributeNames': expression_attribute_names,
+            'ExpressionAttributeValues': expression_attribute_values,
+            'ReturnValues': "ALL_NEW"
+        }
+
+        if expected_version is not None:
+            if expected_version == 0:
+                # Keyed on the item itself, so rows written before versioning also count as existing
+                update_kwargs['ConditionExpression'] = "attribute_not_exists(submission_id)"
+            else:
+                update_kwargs['ConditionExpression'] = "#version = :expected_version"
+                expression_attribute_values[':expected_version'] = expected_version
+
+        try:
+            response = self.table.update_item(**update_kwargs)
+            return response.get('Attributes')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                raise VersionConflictError(
+                    f"Submission {submission_id} with recipe_id {recipe_id} is not at version {expected_version}"
+                )
+            raise Exception(f"Error upserting submission: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error upserting submission: {str(e)}")
+
+    def batch_upsert_submissions(self, submissions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create or update many submissions with chunked BatchWriteItem calls.
+        Every submission is validated before anything is written. Items are written whole, so
+        the stored notes, voice_memo_key, transcription and created_at of existing submissions
+        are read first (BatchGetItem) and kept unless the submission sets them; a write to those
+        attributes landing between the read and the batch write is lost. Each item gets a new
+        version from batch_version()
+        """
+        items = []
+        seen_keys = set()
+        for index, submission in enumerate(submissions):
+            try:
+                item = self._build_submission_item(**submission)
+            except TypeError as te:
+                raise ValueError(f"Submission at index {index} is invalid: {str(te)}")
+            except ValueError as ve:
+                raise ValueError(f"Submission at index {index} is invalid: {str(ve)}")
+
+            key = (item['submission_id'], item['recipe_id'])
+            if key in seen_keys:
+                raise ValueError(
+                    f"Submission at index {index} duplicates submission_id {key[0]} with recipe_id {key[1]}"
+                )
+            seen_keys.add(key)
+            items.append(item)
+
+        try:
+            stored_items = self.batch_get_submissions(
+                [{'submission_id': item['submission_id'], 'recipe_id': item['recipe_id']} for item in items],
+                fields=BATCH_PRESERVED_ATTRIBUTES + ['created_at']
+            )
+            version = batch_version()
+            for item, stored in zip(items, stored_items):
+                item['version'] = version
+                if stored is None:
+                    continue
+                for attribute in BATCH_PRESERVED_ATTRIBUTES:
+                    if attribute not in item and attribute in stored:
+                        item[attribute] = stored[attribute]
+                if 'created_at' in stored:
+                    item['created_at'] = stored['created_at']
+
+            for start in range(0, len(items), BATCH_WRITE_SIZE):
+                chunk = items[start:start + BATCH_WRITE_SIZE]
+                self._batch_write_chunk([{'PutRequest': {'Item': item}} for item in chunk])
+            return items
+        except Exception as e:
+            raise Exception(f"Error batch writing submissions: {str(e)}")
+
+    def _batch_write_chunk(self, write_requests: List[Dict[str, Any]]) -> None:
+        """
+        Write up to 25 requests with BatchWriteItem, retrying UnprocessedItems
+        with exponential backoff and jitter
+        """
+        request_items = {self.table_name: write_requests}
+        for attempt in range(MAX_BATCH_WRITE_ATTEMPTS):
+            response = self.dynamodb.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems') or {}
+            if not request_items:
+                return
+
+            delay = min(BATCH_WRITE_MAX_DELAY, BATCH_WRITE_BASE_DELAY * (2 ** attempt))
+            time.sleep(random.uniform(0, delay))
+
+        unprocessed = len(request_items.get(self.table_name, []))
+        raise Exception(f"{unprocessed} items were still unprocessed after {MAX_BATCH_WRITE_ATTEMPTS} attempts")
+
+    def batch_get_submissions(
+        self,
+        keys: List[Dict[str, str]],
+        fields: Optional[List[str]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch many submissions by (submission_id, recipe_id) with BatchGetItem.
+        Keys are fetched in chunks of 100 on a bounded thread pool. The result is in
+        input order, with None for submissions that do not exist
+        """
+        projection = build_projection(fields, KEY_ATTRIBUTES)
+
+        try:
+            # BatchGetItem rejects duplicate keys within one request
+            unique_keys = list({
+                (key['submission_id'], key['recipe_id']): None for key in keys
+            })
+            chunks = [
+                unique_keys[start:start + BATCH_GET_SIZE]
+                for start in range(0, len(unique_keys), BATCH_GET_SIZE)
+            ]
+
+            found = {}
+            if len(chunks) == 1:
+                found.update(self._batch_get_chunk(chunks[0], projection))
+            elif chunks:
+                with ThreadPoolExecutor(max_workers=min(BATCH_GET_WORKERS, len(chunks))) as executor:
+                    for chunk_items in executor.map(lambda chunk: self._batch_get_chunk(chunk, projection), chunks):
+                        found.update(chunk_items)
+
+            return [found.get((key['submission_id'], key['recipe_id'])) for key in keys]
+        except Exception as e:
+            raise Exception(f"Error batch getting submissions: {str(e)}")
+
+    def _batch_get_chunk(
+        self,
+        chunk: List[Tuple[str, str]],
+        projection: Dict[str, Any]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Get up to 100 keys with BatchGetItem, retrying UnprocessedKeys
+        with exponential backoff and jitter
+        """
+        request_items = {
+            self.table_name: dict(
+                Keys=[{'submission_id': submission_id, 'recipe_id': recipe_id} for submission_id, recipe_id in chunk],
+                **projection
+            )
+        }
+
+        found = {}
+        for attempt in range(MAX_BATCH_GET_ATTEMPTS):
+            response = self.batch_reader.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(self.table_name, []):
+                found[(item['submission_id'], item['recipe_id'])] = item
+
+            request_items = response.get('UnprocessedKeys') or {}
+            if not request_items:
+                return found
+
+            delay = min(BATCH_GET_MAX_DELAY, BATCH_GET_BASE_DELAY * (2 ** attempt))
+            time.sleep(random.uniform(0, delay))
+
+        unprocessed = len(request_items.get(self.table_name, {}).get('Keys', []))
+        raise Exception(f"{unprocessed} keys were still unprocessed after {MAX_BATCH_GET_ATTEMPTS} attempts")
+
     def update_submission(
         self,
         submission_id: str,
@@ -154,12 +624,16 @@ class SubmissionService:
             # Always update last_updated
             update_expression_parts.append("#last_updated = :last_updated")
             expression_attribute_names["#last_updated"] = "last_updated"
-            expression_attribute_values[":last_updated"] = datetime.utcnow().isoformat()
+            expression_attribute_values[":last_updated"] = current_timestamp()
 
             if not update_expression_parts:
                 raise ValueError("No valid fields to update")
 
-            update_expression = "SET " + ", ".join(update_expression_parts)
+            # Every single-item write bumps the version used by optimistic upserts
+            expression_attribute_names["#version"] = "version"
+            expression_attribute_values[":one"] = 1
+
+            update_expression = "SET " + ", ".join(update_expression_parts) + " ADD #version :one"
 
             response = self.table.update_item(
                 Key={
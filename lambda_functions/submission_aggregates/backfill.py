@@ -0,0 +1,93 @@
+"""
+Rebuild the submission aggregates from a scan of the submission table.
+
+Every scanned submission is added to its (trial_id, recipe_id, outcome) aggregate together with
+its ledger item, unless the stream consumer already wrote one (see AggregateService). The
+backfill can therefore run while the consumer is live, and running it again adds nothing.
+
+Run it once the consumer is deployed and before the trial function reads stats from the
+aggregates (enable_aggregate_stats in infra/backend):
+
+    python lambda_functions/submission_aggregates/backfill.py \\
+        --submissions-table submission --aggregates-table submission-aggregate --segments 8
+
+--reset first deletes everything in the aggregates table. It is only needed for a table written
+by a consumer without the ledger; disable the stream event source mapping while it runs, since
+the deletes would race with the consumer's writes.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common.clients import get_resource
+from services.aggregates import AggregateService
+
+
+def scan_segment(table, segment: int, total_segments: int):
+    scan_kwargs = {'Segment': segment, 'TotalSegments': total_segments}
+    while True:
+        response = table.scan(**scan_kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def backfill_segment(service: AggregateService, table, segment: int, total_segments: int) -> Dict[str, int]:
+    counts = {'scanned': 0, 'added': 0, 'skipped': 0}
+    for item in scan_segment(table, segment, total_segments):
+        counts['scanned'] += 1
+        if service.backfill_submission(item):
+            counts['added'] += 1
+        else:
+            counts['skipped'] += 1
+    return counts
+
+
+def reset_aggregates(service: AggregateService) -> int:
+    deleted = 0
+    with service.table.batch_writer() as batch:
+        for item in scan_segment(service.table, 0, 1):
+            batch.delete_item(Key={'trial_id': item['trial_id'], 'aggregate_key': item['aggregate_key']})
+            deleted += 1
+    return deleted
+
+
+def backfill(submissions_table_name: str, segments: int = 4, reset: bool = False) -> Dict[str, int]:
+    """Backfill the aggregates table named by AGGREGATES_TABLE_NAME; returns submission counts"""
+    service = AggregateService()
+    table = get_resource('dynamodb').Table(submissions_table_name)
+
+    totals = {'scanned': 0, 'added': 0, 'skipped': 0, 'deleted': reset_aggregates(service) if reset else 0}
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        for counts in executor.map(lambda segment: backfill_segment(service, table, segment, segments), range(segments)):
+            for name, value in counts.items():
+                totals[name] += value
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--submissions-table', required=True)
+    parser.add_argument('--aggregates-table', required=True)
+    parser.add_argument('--segments', type=int, default=4, help="Parallel scan segments")
+    parser.add_argument('--reset', action='store_true', help="Delete every aggregate and ledger item first")
+    args = parser.parse_args()
+
+    os.environ['AGGREGATES_TABLE_NAME'] = args.aggregates_table
+    start = time.perf_counter()
+    totals = backfill(args.submissions_table, args.segments, args.reset)
+    totals['seconds'] = round(time.perf_counter() - start, 1)
+    print(json.dumps(totals))
+
+
+if __name__ == '__main__':
+    main()
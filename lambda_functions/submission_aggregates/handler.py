@@ -0,0 +1,46 @@
+from boto3.dynamodb.types import TypeDeserializer
+from services.aggregates import AggregateService
+from common.clients import get_service, prewarm
+
+prewarm(AggregateService)
+
+deserializer = TypeDeserializer()
+
+
+def deserialize_image(image):
+    """Convert a DynamoDB stream image from the typed wire format to plain Python values"""
+    if not image:
+        return None
+    return {key: deserializer.deserialize(value) for key, value in image.items()}
+
+
+def handler(event, context):
+    """
+    DynamoDB Streams consumer for the submission table
+    Keeps per (trial_id, recipe_id, outcome) count, score sum and sum of squares up to date
+    from every INSERT, MODIFY and REMOVE record. Each record is applied at most once per
+    SequenceNumber (see AggregateService.apply_change), so replayed batches are harmless.
+
+    Reports the first failed record so Lambda retries from there
+    """
+    service = get_service(AggregateService)
+    records = event.get('Records', [])
+
+    for index, record in enumerate(records):
+        try:
+            stream_record = record.get('dynamodb', {})
+            service.apply_change(
+                deserialize_image(stream_record.get('OldImage')),
+                deserialize_image(stream_record.get('NewImage')),
+                stream_record['SequenceNumber']
+            )
+        except Exception as e:
+            print(f"Error applying stream record {record.get('eventID')}: {str(e)}")
+            return {
+                'batchItemFailures': [
+                    {'itemIdentifier': failed.get('dynamodb', {}).get('SequenceNumber')}
+                    for failed in records[index:]
+                ]
+            }
+
+    return {'batchItemFailures': []}
@@ -0,0 +1,239 @@
+import os
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from decimal import Decimal
+from typing import Optional, Dict, Any, List, Tuple
+from common.clients import get_resource
+from common.outcomes import parse_outcome
+
+
+# Every submission has a ledger item in the aggregates table recording what it currently adds
+# to the aggregates and the stream SequenceNumber that put it there. The ledger and the aggregate
+# updates are written in one transaction conditioned on the ledger being unchanged, so a record
+# that is delivered again (Lambda retries whole batches) is recognised and skipped.
+# Ledger items live in their own partitions (LEDGER_PREFIX + trial_id), away from trial queries
+LEDGER_PREFIX = 'ledger::'
+# Stream sequence numbers are 21-40 digit strings; padding makes them compare as strings
+SEQUENCE_NUMBER_WIDTH = 40
+# Sequence number of ledger items written by the backfill: any stream record is newer
+BACKFILL_SEQUENCE_NUMBER = '0' * SEQUENCE_NUMBER_WIDTH
+MAX_APPLY_ATTEMPTS = 5
+# Submission attributes the aggregates depend on, kept in the ledger
+CONTRIBUTING_ATTRIBUTES = ('submission_id', 'recipe_id', 'trial_id', 'score', 'status')
+
+
+class LedgerConflictError(Exception):
+    """The submission's ledger item changed between reading it and writing the update"""
+
+
+def normalize_sequence_number(sequence_number: str) -> str:
+    return str(sequence_number).zfill(SEQUENCE_NUMBER_WIDTH)
+
+
+def ledger_key(image: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        'trial_id': f"{LEDGER_PREFIX}{image['trial_id']}",
+        'aggregate_key': f"{image['submission_id']}::{image['recipe_id']}"
+    }
+
+
+def applied_image(image: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The part of a submission image that contributes to the aggregates, or None if it adds nothing"""
+    if not submission_contribution(image):
+        return None
+    return {attribute: image[attribute] for attribute in CONTRIBUTING_ATTRIBUTES if attribute in image}
+
+
+def submission_contribution(image: Optional[Dict[str, Any]]) -> Dict[Tuple[str, str, str], Dict[str, Decimal]]:
+    """
+    Get what a single submission image adds to its (trial_id, recipe_id, outcome) aggregate
+    """
+    if not image or 'score' not in image or 'trial_id' not in image:
+        return {}
+
+    score = Decimal(str(image['score']))
+    key = (image['trial_id'], image['recipe_id'], parse_outcome(image['submission_id']))
+    return {
+        key: {
+            'submission_count': Decimal(1),
+            'score_sum': score,
+            'score_sum_sq': score * score,
+            'saved_count': Decimal(1 if image.get('status') == 'saved' else 0)
+        }
+    }
+
+
+def compute_deltas(
+    old_image: Optional[Dict[str, Any]],
+    new_image: Optional[Dict[str, Any]]
+) -> Dict[Tuple[str, str, str], Dict[str, Decimal]]:
+    """
+    Compute the aggregate changes caused by a submission going from old_image to new_image.
+    Inserts have no old image and removals have no new image. Groups whose delta is all zero
+    (e.g. a notes-only update) are dropped so they cost no write
+    """
+    deltas: Dict[Tuple[str, str, str], Dict[str, Decimal]] = {}
+
+    for sign, image in ((-1, old_image), (1, new_image)):
+        for key, contribution in submission_contribution(image).items():
+            delta = deltas.setdefault(key, {field: Decimal(0) for field in contribution})
+            for field, value in contribution.items():
+                delta[field] += sign * value
+
+    return {
+        key: delta
+        for key, delta in deltas.items()
+        if any(value != 0 for value in delta.values())
+    }
+
+
+class AggregateService:
+    def __init__(self):
+        self.dynamodb = get_resource('dynamodb')
+        self.table_name = os.environ.get('AGGREGATES_TABLE_NAME')
+        if not self.table_name:
+            raise ValueError("AGGREGATES_TABLE_NAME environment variable is not set")
+        self.table = self.dynamodb.Table(self.table_name)
+        # The resource's client converts plain Python values like the Table methods do
+        self.client = self.dynamodb.meta.client
+
+    def delta_update(self, trial_id: str, recipe_id: str, outcome: str, delta: Dict[str, Decimal]) -> Dict[str, Any]:
+        """
+        Transaction item adding a delta to the running aggregate for (trial_id, recipe_id, outcome)
+        """
+        return {
+            'Update': {
+                'TableName': self.table_name,
+                'Key': {
+                    'trial_id': trial_id,
+                    'aggregate_key': f"{recipe_id}::{outcome}"
+                },
+                'UpdateExpression': (
+                    "SET #recipe_id = :recipe_id, #outcome = :outcome "
+                    "ADD #submission_count :submission_count, #score_sum :score_sum, "
+                    "#score_sum_sq :score_sum_sq, #saved_count :saved_count"
+                ),
+                'ExpressionAttributeNames': {
+                    '#recipe_id': 'recipe_id',
+                    '#outcome': 'outcome',
+                    '#submission_count': 'submission_count',
+                    '#score_sum': 'score_sum',
+                    '#score_sum_sq': 'score_sum_sq',
+                    '#saved_count': 'saved_count'
+                },
+                'ExpressionAttributeValues': {
+                    ':recipe_id': recipe_id,
+                    ':outcome': outcome,
+                    ':submission_count': delta['submission_count'],
+                    ':score_sum': delta['score_sum'],
+                    ':score_sum_sq': delta['score_sum_sq'],
+                    ':saved_count': delta['saved_count']
+                }
+            }
+        }
+
+    def write_contribution(
+        self,
+        key: Dict[str, str],
+        expected_sequence_number: Optional[str],
+        sequence_number: str,
+        applied: Optional[Dict[str, Any]],
+        deltas: Dict[Tuple[str, str, str], Dict[str, Decimal]]
+    ) -> None:
+        """
+        Replace a submission's ledger item and add its deltas in one transaction. The ledger
+        must still be at expected_sequence_number (None: must not exist), otherwise
+        LedgerConflictError is raised and nothing is written
+        """
+        ledger = dict(key, sequence_number=sequence_number)
+        if applied is not None:
+            ledger['applied'] = applied
+        put = {
+            'TableName': self.table_name,
+            'Item': ledger
+        }
+        if expected_sequence_number is None:
+            put['ConditionExpression'] = "attribute_not_exists(#sequence_number)"
+            put['ExpressionAttributeNames'] = {'#sequence_number': 'sequence_number'}
+        else:
+            put['ConditionExpression'] = "#sequence_number = :expected_sequence_number"
+            put['ExpressionAttributeNames'] = {'#sequence_number': 'sequence_number'}
+            put['ExpressionAttributeValues'] = {':expected_sequence_number': expected_sequence_number}
+
+        transact_items = [{'Put': put}] + [
+            self.delta_update(trial_id, recipe_id, outcome, delta)
+            for (trial_id, recipe_id, outcome), delta in deltas.items()
+        ]
+        try:
+            self.client.transact_write_items(TransactItems=transact_items)
+        except ClientError as e:
+            reasons = e.response.get('CancellationReasons') or []
+            if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                raise LedgerConflictError(f"Ledger of {key['aggregate_key']} changed")
+            raise Exception(f"Error updating submission aggregate: {str(e)}")
+
+    def apply_change(
+        self,
+        old_image: Optional[Dict[str, Any]],
+        new_image: Optional[Dict[str, Any]],
+        sequence_number: str
+    ) -> int:
+        """
+        Apply one stream record to the aggregates. The delta is taken against what the ledger says
+        the submission currently adds (not the record's old image), and records at or below the
+        ledger's sequence number were already applied and are skipped, so redelivered records
+        change nothing. Returns the number of aggregates updated
+        """
+        image = new_image or old_image
+        if not image or 'trial_id' not in image:
+            return 0
+
+        key = ledger_key(image)
+        sequence_number = normalize_sequence_number(sequence_number)
+        for _ in range(MAX_APPLY_ATTEMPTS):
+            ledger = self.table.get_item(Key=key, ConsistentRead=True).get('Item')
+            if ledger is not None and ledger['sequence_number'] >= sequence_number:
+                return 0
+
+            deltas = compute_deltas(ledger.get('applied') if ledger else None, new_image)
+            if not deltas:
+                return 0
+            try:
+                self.write_contribution(
+                    key, ledger['sequence_number'] if ledger else None, sequence_number, applied_image(new_image), deltas
+                )
+                return len(deltas)
+            except LedgerConflictError:
+                continue
+        raise Exception(f"Error updating submission aggregate: ledger of {key['aggregate_key']} keeps changing")
+
+    def backfill_submission(self, item: Dict[str, Any]) -> int:
+        """
+        Add a submission read by a table scan, unless the stream already tracks it.
+        Safe while the stream consumer runs: whichever writes the ledger first wins, and later
+        stream records are applied against the ledger. Returns the number of aggregates updated
+        """
+        deltas = compute_deltas(None, item)
+        if not deltas:
+            return 0
+        try:
+            self.write_contribution(ledger_key(item), None, BACKFILL_SEQUENCE_NUMBER, applied_image(item), deltas)
+            return len(deltas)
+        except LedgerConflictError:
+            return 0
+
+    def query_aggregates_by_trial(self, trial_id: str) -> List[Dict[str, Any]]:
+        """
+        Get every recipe/outcome aggregate for a trial
+        """
+        try:
+            query_kwargs = {'KeyConditionExpression': Key('trial_id').eq(trial_id)}
+            items = []
+            while True:
+                response = self.table.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return items
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            raise Exception(f"Error querying submission aggregates: {str(e)}")
@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import fnmatch
+import importlib.util
+
+import pytest
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+
+
+def load_handler(name, *path):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(LAMBDA_FUNCTIONS_DIR, *path, 'handler.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+jwt_authorizer = load_handler('auth0_authorizer', 'authorizers', 'jwt', 'auth0')
+webhook_authorizer = load_handler('webhook_authorizer', 'authorizers', 'webhooks', 'auth0')
+
+STAGE = 'arn:aws:execute-api:us-west-2:123456789012:abc123/dev'
+
+
+def allows(policy, method_arn):
+    """IAM-style evaluation of the single statement the authorizers emit"""
+    statement = policy['policyDocument']['Statement'][0]
+    resources = statement['Resource'] if isinstance(statement['Resource'], list) else [statement['Resource']]
+    matched = any(fnmatch.fnmatchcase(method_arn, resource) for resource in resources)
+    return matched and statement['Effect'] == 'Allow'
+
+
+def authorize(monkeypatch, payload, method_arn):
+    monkeypatch.setenv('AUTH0_DOMAIN', 'tenant.auth0.local')
+    monkeypatch.setenv('AUTH0_AUDIENCE', 'https://api.local')
+    monkeypatch.setattr(jwt_authorizer, 'verify_token', lambda token, domain, audience: payload)
+    return jwt_authorizer.handler({'authorizationToken': 'Bearer token', 'methodArn': method_arn}, None)
+
+
+class TestAuthorizerPolicies:
+
+    def test_jwt_policy_covers_the_whole_stage(self, monkeypatch):
+        """Test that a policy cached for one route also allows the others"""
+        monkeypatch.delenv('AUTHORIZER_SCOPE_POLICIES', raising=False)
+        policy = authorize(monkeypatch, {'sub': 'auth0|proctor'}, f'{STAGE}/GET/trial')
+
+        assert allows(policy, f'{STAGE}/PUT/submission/participant-0::recipe-0::aroma')
+        assert allows(policy, f'{STAGE}/GET/trial/trial-1/stats')
+        assert not allows(policy, 'arn:aws:execute-api:us-west-2:123456789012:abc123/prod/GET/trial')
+
+    def test_jwt_policy_is_restricted_by_scope(self, monkeypatch):
+        """Test that scope policies limit the stage-wide policy to what the token's scopes grant"""
+        monkeypatch.setenv('AUTHORIZER_SCOPE_POLICIES', json.dumps({
+            'read:trials': ['GET/*'],
+            'write:submissions': ['PUT/submission/*', 'POST/submission*']
+        }))
+        reader = authorize(monkeypatch, {'sub': 'auth0|viewer', 'scope': 'openid read:trials'}, f'{STAGE}/GET/trial')
+        assert allows(reader, f'{STAGE}/GET/submission')
+        assert not allows(reader, f'{STAGE}/PUT/submission/s-1')
+
+        proctor = authorize(monkeypatch, {'sub': 'auth0|proctor', 'permissions': ['read:trials', 'write:submissions']},
+                            f'{STAGE}/GET/trial')
+        assert allows(proctor, f'{STAGE}/PUT/submission/s-1')
+        assert allows(proctor, f'{STAGE}/POST/submission/batch')
+        assert not allows(proctor, f'{STAGE}/DELETE/trial/trial-1')
+
+        nobody = authorize(monkeypatch, {'sub': 'auth0|nobody', 'scope': 'openid'}, f'{STAGE}/GET/trial')
+        assert nobody['policyDocument']['Statement'][0] == {
+            'Action': 'execute-api:Invoke', 'Effect': 'Deny', 'Resource': [f'{STAGE}/*']
+        }
+
+    def test_malformed_scope_policies_reject_tokens(self, monkeypatch):
+        """Test that a malformed AUTHORIZER_SCOPE_POLICIES fails closed instead of allowing the stage"""
+        monkeypatch.setenv('AUTHORIZER_SCOPE_POLICIES', json.dumps({'read:trials': 'GET/*'}))
+
+        with pytest.raises(Exception, match='Unauthorized'):
+            authorize(monkeypatch, {'sub': 'auth0|viewer', 'scope': 'read:trials'}, f'{STAGE}/GET/trial')
+
+    def test_webhook_policy_covers_the_whole_stage(self, monkeypatch):
+        """Test that the webhook authorizer also answers for the stage"""
+        monkeypatch.setenv('AUTH0_WEBHOOK_SECRET', 'secret')
+        allowed = webhook_authorizer.handler({'authorizationToken': 'secret', 'methodArn': f'{STAGE}/POST/user'}, None)
+        denied = webhook_authorizer.handler({'authorizationToken': 'wrong', 'methodArn': f'{STAGE}/POST/user'}, None)
+
+        assert allows(allowed, f'{STAGE}/POST/user')
+        assert allowed['policyDocument']['Statement'][0]['Resource'] == f'{STAGE}/*'
+        assert denied['policyDocument']['Statement'][0]['Effect'] == 'Deny'
@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import gzip
+import base64
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from common.responses import choose_encoding, handle_content_encoding
+
+
+def make_response(body):
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps(body)
+    }
+
+
+class TestResponseCompression:
+
+    def test_choose_encoding(self):
+        """Test Accept-Encoding negotiation including q-values and wildcards"""
+        assert choose_encoding(None) is None
+        assert choose_encoding("identity") is None
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("gzip;q=0, deflate") is None
+        assert choose_encoding("*") == "gzip"
+        assert choose_encoding("br") is None
+        assert choose_encoding("br, gzip;q=0.8") == "gzip"
+
+    def test_large_response_is_gzipped_and_small_is_not(self):
+        """Test that only responses above the size threshold are compressed"""
+        submissions = [{'submission_id': f"participant-{index}::recipe-1::sweetness", 'notes': "too sweet"}
+                       for index in range(200)]
+
+        @handle_content_encoding
+        def handler(event, context):
+            return make_response({'data': submissions if event['queryStringParameters'] else []})
+
+        headers = {'accept-encoding': "gzip"}
+        large = handler({'headers': headers, 'queryStringParameters': {'trial_id': "trial-1"}}, None)
+        small = handler({'headers': headers, 'queryStringParameters': None}, None)
+
+        assert large['isBase64Encoded'] is True
+        assert large['headers']['Content-Encoding'] == "gzip"
+        assert large['headers']['Vary'] == "Accept-Encoding"
+        assert json.loads(gzip.decompress(base64.b64decode(large['body']))) == {'data': submissions}
+        assert small == make_response({'data': []})
+
+    def test_base64_request_body_is_decoded(self):
+        """Test that handlers see the JSON body when API Gateway base64 encodes it"""
+        @handle_content_encoding
+        def handler(event, context):
+            return make_response(json.loads(event['body']))
+
+        event = {
+            'headers': {},
+            'body': base64.b64encode(b'{"score": 7}').decode('ascii'),
+            'isBase64Encoded': True
+        }
+
+        assert json.loads(handler(event, None)['body']) == {'score': 7}
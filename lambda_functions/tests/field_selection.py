@@ -0,0 +1,77 @@
+import os
+import sys
+import json
+import importlib.util
+from decimal import Decimal
+
+import boto3
+import pytest
+from moto import mock_aws
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# The router package layout lets one test reach the recipe and participant controllers
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+for entity_dir in ('participant', 'recipe', 'trial', 'submission'):
+    sys.path.append(os.path.join(LAMBDA_FUNCTIONS_DIR, entity_dir))
+
+from common.clients import reset_registry
+from common.projection import build_projection, parse_fields
+from local.aws import create_tables, lambda_environment
+
+spec = importlib.util.spec_from_file_location('router_handler', os.path.join(LAMBDA_FUNCTIONS_DIR, 'router', 'handler.py'))
+router = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(router)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    for name, value in lambda_environment().items():
+        monkeypatch.setenv(name, value)
+    with mock_aws():
+        reset_registry()
+        dynamodb = boto3.resource('dynamodb')
+        create_tables(dynamodb)
+        dynamodb.Table('recipe').put_item(Item={
+            'recipe_id': 'recipe-1', 'trial_id': 'trial-1', 'name': 'Less sugar',
+            'sugar': Decimal('12.5'), 'stevia_extract': Decimal('0.2')
+        })
+        dynamodb.Table('participant').put_item(Item={
+            'participant_id': 'participant-1', 'trial_id': 'trial-1', 'code': '123456', 'name': 'Taster'
+        })
+        router.loaded_entities.clear()
+        yield
+        reset_registry()
+
+
+def list_trial(resource, fields):
+    event = {'httpMethod': 'GET', 'resource': resource, 'queryStringParameters': {'trial_id': 'trial-1', 'fields': fields}}
+    response = router.handler(event, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+class TestFieldSelection:
+
+    def test_parse_and_build_projection(self):
+        """Test that fields= is split, keys are always projected and unsafe names are rejected"""
+        fields = parse_fields({'fields': 'score, status,,'})
+        assert fields == ['score', 'status']
+        assert build_projection(fields, ['submission_id'])['ProjectionExpression'] == '#submission_id, #score, #status'
+        assert parse_fields({}) is None and build_projection(None, ['submission_id']) == {}
+        with pytest.raises(ValueError):
+            build_projection(['notes.length'], ['submission_id'])
+
+    def test_recipe_list_projects_fields(self, backend):
+        """Test that GET /recipe?fields= returns only the requested attributes plus the key"""
+        status, body = list_trial('/recipe', 'name')
+
+        assert status == 200
+        assert body['data'] == [{'recipe_id': 'recipe-1', 'trial_id': 'trial-1', 'name': 'Less sugar'}]
+        assert list_trial('/recipe', 'sugar;drop')[0] == 400
+
+    def test_participant_list_projects_fields(self, backend):
+        """Test that GET /participant?fields= returns only the requested attributes plus the key"""
+        status, body = list_trial('/participant', 'code')
+
+        assert status == 200
+        assert body['data'] == [{'participant_id': 'participant-1', 'code': '123456'}]
+        assert list_trial('/participant', ','.join(f'field_{index}' for index in range(21)))[0] == 400
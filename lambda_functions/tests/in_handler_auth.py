@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import time
+
+import jwt
+import pytest
+from jwt.algorithms import RSAAlgorithm
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from common import auth
+from common.auth import authenticate, get_claims
+from common.jwks import JwksCache
+
+DOMAIN = 'tenant.auth0.local'
+AUDIENCE = 'https://api.local'
+
+
+@authenticate
+def controller(event, context):
+    return {'statusCode': 200, 'body': json.dumps({'claims': get_claims(event)})}
+
+
+@pytest.fixture
+def signing_key(monkeypatch):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update({'kid': 'key-1', 'use': 'sig', 'alg': 'RS256'})
+    jwks = JwksCache('http://unused.local/jwks.json')
+    jwks.load({'keys': [jwk]})
+
+    monkeypatch.setattr(auth, 'get_jwks', lambda domain: jwks)
+    monkeypatch.setenv('IN_HANDLER_AUTH', 'true')
+    monkeypatch.setenv('AUTH0_DOMAIN', DOMAIN)
+    monkeypatch.setenv('AUTH0_AUDIENCE', AUDIENCE)
+    auth.verified_tokens.clear()
+    yield key
+    auth.verified_tokens.clear()
+
+
+def make_token(key, **claims):
+    now = int(time.time())
+    payload = dict({'sub': 'auth0|proctor', 'iss': f'https://{DOMAIN}/', 'aud': AUDIENCE,
+                    'iat': now, 'exp': now + 3600, 'scope': 'openid'}, **claims)
+    return jwt.encode(payload, key, algorithm='RS256', headers={'kid': 'key-1'})
+
+
+def request(token=None, method='GET', resource='/trial'):
+    return {
+        'httpMethod': method,
+        'resource': resource,
+        'headers': {'authorization': f'Bearer {token}'} if token else {},
+        'requestContext': {'stage': 'dev'}
+    }
+
+
+class TestInHandlerAuth:
+
+    def test_disabled_uses_the_api_gateway_authorizer_context(self, monkeypatch):
+        """Test that without IN_HANDLER_AUTH requests pass through and claims come from the authorizer"""
+        monkeypatch.delenv('IN_HANDLER_AUTH', raising=False)
+        event = {'httpMethod': 'GET', 'requestContext': {'authorizer': {'userId': 'auth0|proctor', 'scope': 'openid'}}}
+
+        response = controller(event, None)
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['claims']['sub'] == 'auth0|proctor'
+
+    def test_valid_token_exposes_claims(self, signing_key):
+        """Test that verified claims reach the controller"""
+        response = controller(request(make_token(signing_key, email='proctor@example.com')), None)
+
+        claims = json.loads(response['body'])['claims']
+        assert response['statusCode'] == 200
+        assert (claims['sub'], claims['email']) == ('auth0|proctor', 'proctor@example.com')
+
+    def test_missing_expired_and_foreign_tokens_are_rejected(self, signing_key):
+        """Test the 401 responses; CORS preflights are not checked"""
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        for token in (None, make_token(signing_key, exp=int(time.time()) - 60),
+                      make_token(signing_key, aud='https://someone-else'), make_token(other_key), 'not-a-jwt'):
+            response = controller(request(token), None)
+            assert response['statusCode'] == 401
+            assert response['headers']['WWW-Authenticate'] == 'Bearer'
+
+        assert controller(request(method='OPTIONS'), None)['statusCode'] == 200
+
+    def test_scope_policies_restrict_routes(self, signing_key, monkeypatch):
+        """Test that AUTHORIZER_SCOPE_POLICIES limit routes as they do in the JWT authorizer"""
+        monkeypatch.setenv('AUTHORIZER_SCOPE_POLICIES', json.dumps({
+            'read:trials': ['GET/*'],
+            'write:submissions': ['PUT/submission/*']
+        }))
+        reader = make_token(signing_key, scope='openid read:trials')
+        proctor = make_token(signing_key, permissions=['read:trials', 'write:submissions'])
+
+        assert controller(request(reader, resource='/trial/{trial_id}/stats'), None)['statusCode'] == 200
+        assert controller(request(reader, 'PUT', '/submission/{submission_id}'), None)['statusCode'] == 403
+        assert controller(request(proctor, 'PUT', '/submission/{submission_id}'), None)['statusCode'] == 200
+        assert controller(request(proctor, 'DELETE', '/trial/{trial_id}'), None)['statusCode'] == 403
+        assert controller(request(make_token(signing_key), 'GET', '/trial'), None)['statusCode'] == 403
+
+    def test_malformed_scope_policies_fail_closed(self, signing_key, monkeypatch):
+        """Test that a malformed AUTHORIZER_SCOPE_POLICIES rejects requests instead of failing the import"""
+        monkeypatch.setenv('AUTHORIZER_SCOPE_POLICIES', '{"read:trials": ')
+
+        response = controller(request(make_token(signing_key, scope='openid read:trials')), None)
+
+        assert response['statusCode'] == 500
+        assert json.loads(response['body'])['error'] == 'Internal Server Error'
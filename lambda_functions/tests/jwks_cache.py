@@ -0,0 +1,214 @@
+import os
+import sys
+import json
+import time
+import threading
+import importlib.util
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from jwt.algorithms import RSAAlgorithm
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+
+from common import jwks
+from common.jwks import JwksCache, JwksError, get_jwks_cache, reset_jwks_caches
+
+spec = importlib.util.spec_from_file_location(
+    'auth0_authorizer', os.path.join(LAMBDA_FUNCTIONS_DIR, 'authorizers', 'jwt', 'auth0', 'handler.py')
+)
+authorizer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(authorizer)
+
+DOMAIN = 'tenant.auth0.local'
+AUDIENCE = 'https://api.local'
+METHOD_ARN = 'arn:aws:execute-api:us-west-2:123456789012:api/dev/GET/trial'
+
+
+def make_key(kid):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update({'kid': kid, 'use': 'sig', 'alg': 'RS256'})
+    return key, jwk
+
+
+def make_token(key, kid, **claims):
+    now = int(time.time())
+    payload = dict({'sub': 'auth0|proctor', 'iss': f'https://{DOMAIN}/', 'aud': AUDIENCE,
+                    'iat': now, 'exp': now + 3600}, **claims)
+    return jwt.encode(payload, key, algorithm='RS256', headers={'kid': kid})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def tenant():
+    """Local JWKS endpoint standing in for the Auth0 tenant; counts requests and can fail on demand"""
+    state = {'keys': [], 'requests': 0, 'fail': False}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state['requests'] += 1
+            if state['fail']:
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = json.dumps({'keys': state['keys']}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state['url'] = f'http://127.0.0.1:{server.server_address[1]}/.well-known/jwks.json'
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+class TestJwksCache:
+
+    def test_keys_are_fetched_once_and_indexed_by_kid(self, tenant):
+        """Test that repeated lookups of known kids are served from one fetch"""
+        tenant['keys'] = [make_key('key-1')[1], make_key('key-2')[1]]
+        cache = JwksCache(tenant['url'], clock=FakeClock())
+
+        for _ in range(5):
+            assert cache.get_signing_key('key-1').key_id == 'key-1'
+            assert cache.get_signing_key('key-2').key_id == 'key-2'
+
+        assert tenant['requests'] == 1
+
+    def test_unknown_kid_refreshes_once_per_interval(self, tenant):
+        """Test that a rotated key is picked up and unknown kids are rate limited"""
+        tenant['keys'] = [make_key('key-1')[1]]
+        clock = FakeClock()
+        cache = JwksCache(tenant['url'], min_refresh_interval=30, clock=clock)
+        cache.get_signing_key('key-1')
+
+        clock.now += 31
+        tenant['keys'].append(make_key('key-2')[1])
+        assert cache.get_signing_key('key-2').key_id == 'key-2'
+        assert tenant['requests'] == 2
+
+        for kid in ('made-up-1', 'made-up-2', 'made-up-3'):
+            with pytest.raises(JwksError):
+                cache.get_signing_key(kid)
+        assert tenant['requests'] == 2
+
+        clock.now += 31
+        with pytest.raises(JwksError):
+            cache.get_signing_key('made-up-4')
+        assert tenant['requests'] == 3
+
+    def test_expired_keys_are_refetched_and_served_stale_on_error(self, tenant):
+        """Test the TTL refetch, and that a failing endpoint keeps the cached keys in use"""
+        tenant['keys'] = [make_key('key-1')[1]]
+        clock = FakeClock()
+        cache = JwksCache(tenant['url'], ttl=600, min_refresh_interval=30, clock=clock)
+        cache.get_signing_key('key-1')
+
+        clock.now += 601
+        tenant['fail'] = True
+        assert cache.get_signing_key('key-1').key_id == 'key-1'
+        assert cache.get_signing_key('key-1').key_id == 'key-1'
+        assert (tenant['requests'], cache.fetch_errors) == (2, 1)
+
+        clock.now += 31
+        tenant['fail'] = False
+        cache.get_signing_key('key-1')
+        assert tenant['requests'] == 3
+        assert cache.fetched_at == clock.now
+
+    def test_first_fetch_failure_is_an_error(self, tenant):
+        """Test that without cached keys a failing endpoint raises JwksError"""
+        tenant['fail'] = True
+        with pytest.raises(JwksError):
+            JwksCache(tenant['url'], clock=FakeClock()).get_signing_key('key-1')
+
+
+class TestJwksSnapshot:
+
+    def test_fresh_snapshot_is_used_without_fetching(self, tenant):
+        """Test that a bundled snapshot serves its keys and only unknown kids go to the network"""
+        snapshot_jwk = make_key('key-1')[1]
+        tenant['keys'] = [snapshot_jwk, make_key('key-2')[1]]
+        cache = JwksCache(tenant['url'], clock=FakeClock())
+        assert cache.load_snapshot({'url': tenant['url'], 'fetched_at': time.time() - 60, 'keys': [snapshot_jwk]})
+
+        assert cache.get_signing_key('key-1').key_id == 'key-1'
+        assert tenant['requests'] == 0
+        assert cache.get_signing_key('key-2').key_id == 'key-2'
+        assert tenant['requests'] == 1
+
+    def test_old_snapshot_is_refreshed_and_kept_on_error(self, tenant):
+        """Test that a snapshot older than max_age is refetched on first use, and still served if that fails"""
+        _, jwk = make_key('key-1')
+        tenant['keys'] = [jwk]
+        clock = FakeClock()
+        snapshot = {'url': tenant['url'], 'fetched_at': time.time() - 7200, 'keys': [jwk]}
+
+        cache = JwksCache(tenant['url'], clock=clock)
+        cache.load_snapshot(snapshot, max_age=3600)
+        cache.get_signing_key('key-1')
+        assert tenant['requests'] == 1
+        assert cache.expires_at == clock.now + cache.ttl
+
+        tenant['fail'] = True
+        cache = JwksCache(tenant['url'], clock=clock)
+        cache.load_snapshot(snapshot, max_age=3600)
+        assert cache.get_signing_key('key-1').key_id == 'key-1'
+        assert cache.fetch_errors == 1
+
+    def test_shared_cache_starts_from_the_bundled_snapshot(self, tenant, tmp_path, monkeypatch):
+        """Test that get_jwks_cache loads the snapshot file, but only for the URL it was taken from"""
+        _, jwk = make_key('key-1')
+        path = tmp_path / 'jwks.json'
+        path.write_text(json.dumps({'url': tenant['url'], 'fetched_at': int(time.time()), 'keys': [jwk]}))
+        monkeypatch.setattr(jwks, 'JWKS_SNAPSHOT_PATH', str(path))
+        reset_jwks_caches()
+
+        assert get_jwks_cache(tenant['url']).get_signing_key('key-1').key_id == 'key-1'
+        assert tenant['requests'] == 0
+        assert get_jwks_cache('http://127.0.0.1:1/other.json').keys == {}
+        reset_jwks_caches()
+
+
+class TestAuthorizerJwks:
+
+    def test_warm_authorizer_does_not_refetch_jwks(self, tenant, monkeypatch):
+        """Test that the authorizer verifies tokens from the shared cache across invocations"""
+        key, jwk = make_key('key-1')
+        tenant['keys'] = [jwk]
+        monkeypatch.setenv('AUTH0_DOMAIN', DOMAIN)
+        monkeypatch.setenv('AUTH0_AUDIENCE', AUDIENCE)
+        monkeypatch.setenv('AUTH0_JWKS_URL', tenant['url'])
+        reset_jwks_caches()
+
+        for subject in ('auth0|one', 'auth0|two', 'auth0|three'):
+            token = make_token(key, 'key-1', sub=subject)
+            policy = authorizer.handler({'authorizationToken': f'Bearer {token}', 'methodArn': METHOD_ARN}, None)
+            assert policy['principalId'] == subject
+            assert policy['policyDocument']['Statement'][0]['Effect'] == 'Allow'
+
+        # Unknown kid right after the first fetch: rejected without another request
+        with pytest.raises(Exception, match='Unauthorized'):
+            authorizer.handler({'authorizationToken': make_token(key, 'other-key'), 'methodArn': METHOD_ARN}, None)
+
+        assert tenant['requests'] == 1
+        reset_jwks_caches()
@@ -0,0 +1,73 @@
+import os
+import re
+import sys
+import json
+import importlib.util
+
+import boto3
+import pytest
+from moto import mock_aws
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# Same layout as the router package: entity services/ directories merge into one namespace package
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+for entity_dir in ('participant', 'recipe', 'trial', 'submission'):
+    sys.path.append(os.path.join(LAMBDA_FUNCTIONS_DIR, entity_dir))
+
+from common.clients import reset_registry
+from local.aws import create_tables, lambda_environment
+
+spec = importlib.util.spec_from_file_location('router_handler', os.path.join(LAMBDA_FUNCTIONS_DIR, 'router', 'handler.py'))
+router = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(router)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    for name, value in lambda_environment().items():
+        monkeypatch.setenv(name, value)
+    with mock_aws():
+        reset_registry()
+        create_tables(boto3.resource('dynamodb'))
+        router.loaded_entities.clear()
+        yield
+        reset_registry()
+
+
+class TestRouter:
+
+    def test_resolve_entity(self):
+        """Test that the entity comes from the resource template, falling back to the path"""
+        assert router.resolve_entity({'resource': '/trial/{id}/stats', 'path': '/trial/t-1/stats'}) == 'trial'
+        assert router.resolve_entity({'path': '/voice-memo'}) == 'voice-memo'
+        assert router.resolve_entity({}) is None
+
+    def test_unknown_route_returns_404(self, backend):
+        """Test that unrouted requests get a 404 without loading any entity"""
+        response = router.handler({'httpMethod': 'GET', 'resource': '/user'}, None)
+
+        assert response['statusCode'] == 404
+        assert json.loads(response['body'])['error'] == 'Not Found'
+        assert router.loaded_entities == {}
+
+    def test_dispatch_loads_only_the_requested_entity(self, backend):
+        """Test that a request reaches the entity controller and only that entity is imported"""
+        event = {'httpMethod': 'GET', 'resource': '/recipe', 'queryStringParameters': {'trial_id': 'trial-1'}}
+
+        response = router.handler(event, None)
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['data'] == []
+        assert list(router.loaded_entities) == ['recipe']
+
+    def test_router_package_installs_the_entity_dependencies(self):
+        """Test that every dependency an entity packager installs is also installed for the router"""
+        def dependencies(name):
+            with open(os.path.join(LAMBDA_FUNCTIONS_DIR, '..', 'infra', 'backend', 'lambdas', f'{name}.tf')) as file:
+                return {dependency for block in re.findall(r'dependencies\s*=\s*\[([^\]]*)\]', file.read())
+                        for dependency in re.findall(r'"([^"]+)"', block)}
+
+        entities = ('participant', 'recipe', 'trial', 'submission')
+        entity_dependencies = set().union(*(dependencies(name) for name in entities))
+        assert 'numpy==1.26.4' in entity_dependencies
+        assert entity_dependencies <= dependencies('router')
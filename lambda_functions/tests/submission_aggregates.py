@@ -0,0 +1,224 @@
+import pytest
+import os
+import sys
+import importlib
+from decimal import Decimal
+from unittest.mock import patch
+from moto import mock_aws
+import boto3
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+
+
+def import_from_lambda(lambda_dir, module_name):
+    """
+    Import a module from one lambda's directory. Every lambda has its own `services`
+    package, so previously imported ones are dropped from sys.modules first
+    """
+    for name in list(sys.modules):
+        if name == 'services' or name.startswith('services.') or name == 'handler':
+            del sys.modules[name]
+    sys.path.insert(0, os.path.join(LAMBDA_FUNCTIONS_DIR, lambda_dir))
+    try:
+        return importlib.import_module(module_name)
+    finally:
+        sys.path.pop(0)
+
+
+submissions_module = import_from_lambda('submission', 'services.submissions')
+stats_module = import_from_lambda('trial', 'services.stats')
+aggregates_module = import_from_lambda('submission_aggregates', 'services.aggregates')
+aggregates_handler = import_from_lambda('submission_aggregates', 'handler')
+backfill_module = import_from_lambda('submission_aggregates', 'backfill')
+from local.dynamodb_streams import LocalStream
+from common.clients import reset_registry
+
+
+@pytest.fixture
+def mock_env():
+    """Mock environment variables"""
+    with patch.dict(os.environ, {
+        'SUBMISSIONS_TABLE_NAME': 'test-submissions-table',
+        'AGGREGATES_TABLE_NAME': 'test-aggregates-table',
+        'AWS_DEFAULT_REGION': 'us-west-2'
+    }):
+        yield
+
+
+@pytest.fixture
+def tables(mock_env):
+    """Create mock submission and aggregate tables"""
+    with mock_aws():
+        reset_registry()
+        dynamodb = boto3.resource('dynamodb', region_name='us-west-2')
+
+        submissions_table = dynamodb.create_table(
+            TableName='test-submissions-table',
+            KeySchema=[
+                {'AttributeName': 'submission_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'recipe_id', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'submission_id', 'AttributeType': 'S'},
+                {'AttributeName': 'recipe_id', 'AttributeType': 'S'},
+                {'AttributeName': 'trial_id', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'trial_id_index',
+                    'KeySchema': [
+                        {'AttributeName': 'trial_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'recipe_id', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        aggregates_table = dynamodb.create_table(
+            TableName='test-aggregates-table',
+            KeySchema=[
+                {'AttributeName': 'trial_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'aggregate_key', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'trial_id', 'AttributeType': 'S'},
+                {'AttributeName': 'aggregate_key', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        yield submissions_table, aggregates_table
+
+
+class TestSubmissionAggregates:
+
+    def test_compute_deltas_for_score_update(self):
+        """Test that an update only contributes the difference between old and new score"""
+        old_image = {
+            'submission_id': "participant-1::recipe-1::sweetness",
+            'recipe_id': "recipe-1",
+            'trial_id': "trial-1",
+            'score': Decimal('5'),
+            'status': "draft"
+        }
+        new_image = dict(old_image, score=Decimal('8'), status="saved")
+
+        deltas = aggregates_module.compute_deltas(old_image, new_image)
+
+        assert deltas == {
+            ("trial-1", "recipe-1", "sweetness"): {
+                'submission_count': Decimal(0),
+                'score_sum': Decimal(3),
+                'score_sum_sq': Decimal(39),
+                'saved_count': Decimal(1)
+            }
+        }
+
+    def test_compute_deltas_skips_notes_only_update(self):
+        """Test that updates which do not touch score or status produce no aggregate writes"""
+        old_image = {
+            'submission_id': "participant-1::recipe-1::sweetness",
+            'recipe_id': "recipe-1",
+            'trial_id': "trial-1",
+            'score': Decimal('5'),
+            'status': "draft"
+        }
+
+        assert aggregates_module.compute_deltas(old_image, dict(old_image, notes="sweeter")) == {}
+        assert aggregates_module.compute_deltas(None, old_image)[("trial-1", "recipe-1", "sweetness")][
+            'submission_count'] == Decimal(1)
+
+    def test_stream_aggregates_match_full_scan(self, tables):
+        """Test that aggregates maintained from the local stream match a full trial rescan"""
+        submissions_table, _ = tables
+        stream = LocalStream(submissions_table)
+        service = submissions_module.SubmissionService()
+
+        for index in range(24):
+            service.create_submission(
+                recipe_id=f"recipe-{index % 2}",
+                trial_id="trial-1",
+                participant_id=f"participant-{index // 8}",
+                score=index % 7,
+                status="draft",
+                submission_id=f"participant-{index // 8}::recipe-{index % 2}::outcome-{index % 4}-{index}"
+            )
+        assert stream.deliver(aggregates_handler.handler) == 24
+
+        # Score changes, status changes and notes-only edits between polls
+        service.update_submission("participant-0::recipe-0::outcome-0-0", "recipe-0", {'score': 9, 'status': 'saved'})
+        service.update_submission("participant-1::recipe-1::outcome-1-9", "recipe-1", {'score': 2})
+        service.update_submission("participant-2::recipe-0::outcome-0-16", "recipe-0", {'notes': "too sweet"})
+        service.batch_upsert_submissions([
+            {'recipe_id': "recipe-1", 'trial_id': "trial-1", 'participant_id': "participant-3", 'score': 10,
+             'status': "saved", 'submission_id': "participant-3::recipe-1::outcome-1"}
+        ])
+        stream.deliver(aggregates_handler.handler)
+
+        aggregates = aggregates_module.AggregateService().query_aggregates_by_trial("trial-1")
+        from_aggregates = stats_module.compute_aggregate_stats(aggregates)
+        from_scan = stats_module.compute_submission_stats(service.query_submissions_by_trial("trial-1"))
+
+        assert from_aggregates['submission_count'] == from_scan['submission_count'] == 25
+        assert from_aggregates['saved_count'] == from_scan['saved_count'] == 2
+        assert from_aggregates['mean_score'] == pytest.approx(from_scan['mean_score'])
+        for aggregate_recipe, scan_recipe in zip(from_aggregates['recipes'], from_scan['recipes']):
+            assert aggregate_recipe['recipe_id'] == scan_recipe['recipe_id']
+            for aggregate_outcome, scan_outcome in zip(aggregate_recipe['outcomes'], scan_recipe['outcomes']):
+                assert aggregate_outcome['outcome'] == scan_outcome['outcome']
+                assert aggregate_outcome['count'] == scan_outcome['count']
+                assert aggregate_outcome['mean'] == pytest.approx(scan_outcome['mean'])
+                assert aggregate_outcome['std'] == pytest.approx(scan_outcome['std'], abs=1e-3)
+
+    def test_redelivered_records_are_applied_once(self, tables):
+        """Test that a batch delivered again (Lambda retry after a timeout) does not change the aggregates"""
+        submissions_table, _ = tables
+        stream = LocalStream(submissions_table)
+        service = submissions_module.SubmissionService()
+        aggregate_service = aggregates_module.AggregateService()
+
+        for index in range(6):
+            service.create_submission(recipe_id="recipe-0", trial_id="trial-1", participant_id=f"participant-{index}",
+                                      score=index, submission_id=f"participant-{index}::recipe-0::aroma")
+        inserts = stream.poll()
+        service.update_submission("participant-0::recipe-0::aroma", "recipe-0", {'score': 10, 'status': 'saved'})
+        updates = stream.poll()
+
+        for batch in (inserts, inserts, updates, inserts + updates):
+            assert aggregates_handler.handler({'Records': batch}, None) == {'batchItemFailures': []}
+
+        [aggregate] = aggregate_service.query_aggregates_by_trial("trial-1")
+        assert (aggregate['submission_count'], aggregate['score_sum'], aggregate['saved_count']) == (6, 25, 1)
+
+    def test_backfill_and_live_stream_converge(self, tables):
+        """Test that backfilling pre-existing submissions while the stream runs matches a full scan"""
+        submissions_table, _ = tables
+        service = submissions_module.SubmissionService()
+        for index in range(12):
+            service.create_submission(recipe_id=f"recipe-{index % 2}", trial_id="trial-1",
+                                      participant_id=f"participant-{index}", score=index % 5,
+                                      submission_id=f"participant-{index}::recipe-{index % 2}::outcome-{index % 3}")
+
+        # The consumer starts after these were written; one of them changes before the backfill runs
+        stream = LocalStream(submissions_table)
+        service.update_submission("participant-0::recipe-0::outcome-0", "recipe-0", {'score': 9})
+        stream.deliver(aggregates_handler.handler)
+
+        # One segment: moto undoes a cancelled transaction by restoring a table snapshot, which
+        # would also drop other threads' writes
+        first = backfill_module.backfill('test-submissions-table', segments=1)
+        assert (first['scanned'], first['added'], first['skipped']) == (12, 11, 1)
+        assert backfill_module.backfill('test-submissions-table', segments=1)['added'] == 0
+
+        service.update_submission("participant-1::recipe-1::outcome-1", "recipe-1", {'score': 0, 'status': 'saved'})
+        stream.deliver(aggregates_handler.handler)
+
+        aggregates = aggregates_module.AggregateService().query_aggregates_by_trial("trial-1")
+        from_aggregates = stats_module.compute_aggregate_stats(aggregates)
+        from_scan = stats_module.compute_submission_stats(service.query_submissions_by_trial("trial-1"))
+        assert from_aggregates['submission_count'] == from_scan['submission_count'] == 12
+        assert from_aggregates['saved_count'] == from_scan['saved_count'] == 1
+        assert from_aggregates['mean_score'] == pytest.approx(from_scan['mean_score'])
@@ -0,0 +1,511 @@
+import pytest
+import os
+import sys
+import json
+from unittest.mock import patch
+from moto import mock_aws
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'submission'))
+
+from common.clients import reset_registry
+from services.submissions import SubmissionService, encode_next_token, decode_next_token, normalize_since, VersionConflictError
+
+
+@pytest.fixture
+def mock_env():
+    """Mock environment variables"""
+    with patch.dict(os.environ, {
+        'SUBMISSIONS_TABLE_NAME': 'test-submissions-table',
+        'AWS_DEFAULT_REGION': 'us-west-2'
+    }):
+        yield
+
+
+@pytest.fixture
+def dynamodb_table(mock_env):
+    """Create a mock DynamoDB table with the same indexes as infra/dynamodb.tf"""
+    with mock_aws():
+        reset_registry()
+        dynamodb = boto3.resource('dynamodb', region_name='us-west-2')
+
+        table = dynamodb.create_table(
+            TableName='test-submissions-table',
+            KeySchema=[
+                {'AttributeName': 'submission_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'recipe_id', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'submission_id', 'AttributeType': 'S'},
+                {'AttributeName': 'recipe_id', 'AttributeType': 'S'},
+                {'AttributeName': 'participant_id', 'AttributeType': 'S'},
+                {'AttributeName': 'trial_id', 'AttributeType': 'S'},
+                {'AttributeName': 'last_updated', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'participant_id_index',
+                    'KeySchema': [
+                        {'AttributeName': 'participant_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'recipe_id', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'trial_id_index',
+                    'KeySchema': [
+                        {'AttributeName': 'trial_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'recipe_id', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'recipe_id_index',
+                    'KeySchema': [
+                        {'AttributeName': 'recipe_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'submission_id', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'trial_id_last_updated_index',
+                    'KeySchema': [
+                        {'AttributeName': 'trial_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'last_updated', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        yield table
+
+
+@pytest.fixture
+def submission_service(mock_env, dynamodb_table):
+    """Create SubmissionService instance with mocked dependencies"""
+    return SubmissionService()
+
+
+def create_trial_submissions(service, trial_id, count):
+    """Create count submissions spread across a handful of participants and recipes"""
+    for index in range(count):
+        participant_id = f"participant-{index % 5}"
+        recipe_id = f"recipe-{index % 3}"
+        service.create_submission(
+            recipe_id=recipe_id,
+            trial_id=trial_id,
+            participant_id=participant_id,
+            score=index % 10,
+            submission_id=f"{trial_id}-{participant_id}::{recipe_id}::outcome-{index}"
+        )
+
+
+class TestSubmissionService:
+
+    def test_init_without_table_name(self):
+        """Test that SubmissionService raises error when SUBMISSIONS_TABLE_NAME is not set"""
+        with patch.dict(os.environ, {'AWS_DEFAULT_REGION': 'us-west-2'}, clear=True):
+            with pytest.raises(ValueError, match="SUBMISSIONS_TABLE_NAME environment variable is not set"):
+                SubmissionService()
+
+    def test_query_submissions_by_trial_follows_every_page(self, submission_service):
+        """Test that listing a trial drains every DynamoDB page instead of only the first"""
+        create_trial_submissions(submission_service, "trial-1", 30)
+        create_trial_submissions(submission_service, "trial-2", 4)
+
+        pages = list(submission_service._query_pages('trial_id', 'trial-1', limit=7))
+        submissions = submission_service.query_submissions_by_trial("trial-1")
+
+        assert len(pages) > 1
+        assert len(submissions) == 30
+        assert all(submission['trial_id'] == "trial-1" for submission in submissions)
+
+    def test_query_submissions_page_walks_with_next_token(self, submission_service):
+        """Test that next_token pages cover every submission exactly once"""
+        create_trial_submissions(submission_service, "trial-1", 25)
+
+        seen = []
+        next_token = None
+        while True:
+            items, next_token = submission_service.query_submissions_page(
+                'trial_id', 'trial-1', limit=10, next_token=next_token
+            )
+            assert len(items) <= 10
+            seen.extend(item['submission_id'] for item in items)
+            if next_token is None:
+                break
+
+        assert len(seen) == 25
+        assert len(set(seen)) == 25
+
+    def test_query_submissions_page_rejects_bad_input(self, submission_service):
+        """Test that invalid limits, attributes and tokens raise ValueError"""
+        with pytest.raises(ValueError, match="limit must be between"):
+            submission_service.query_submissions_page('trial_id', 'trial-1', limit=0)
+
+        with pytest.raises(ValueError, match="Cannot query submissions by"):
+            submission_service.query_submissions_page('status', 'saved', limit=10)
+
+        with pytest.raises(ValueError, match="next_token is invalid"):
+            submission_service.query_submissions_page('trial_id', 'trial-1', limit=10, next_token="not-a-token")
+
+    def test_next_token_is_bound_to_its_query(self, submission_service):
+        """Test that a token cannot be replayed against another value, attribute or since filter"""
+        create_trial_submissions(submission_service, "trial-1", 15)
+        _, next_token = submission_service.query_submissions_page('trial_id', 'trial-1', limit=10)
+        assert next_token is not None
+
+        for attribute, value, since in (('trial_id', 'trial-2', None), ('recipe_id', 'recipe-0', None),
+                                        ('trial_id', 'trial-1', "2020-01-01T00:00:00Z")):
+            with pytest.raises(ValueError, match="next_token does not belong to this query"):
+                submission_service.query_submissions_page(attribute, value, limit=10, next_token=next_token, since=since)
+
+    def test_next_token_round_trip(self):
+        """Test that pagination tokens are opaque and decode to the original key"""
+        key = {'submission_id': 'p::r::o', 'recipe_id': 'r', 'trial_id': 't'}
+        token = encode_next_token(key, 'trial_id_index', 't')
+
+        assert encode_next_token(None) is None
+        assert decode_next_token(token, 'trial_id_index', 't') == key
+
+    def test_batch_upsert_submissions_writes_in_chunks(self, submission_service):
+        """Test that a batch larger than 25 items is split into BatchWriteItem chunks"""
+        submissions = [
+            {
+                'recipe_id': f"recipe-{index % 3}",
+                'trial_id': "trial-1",
+                'participant_id': "participant-1",
+                'score': index % 10,
+                'status': "saved",
+                'submission_id': f"participant-1::recipe-{index % 3}::outcome-{index}"
+            }
+            for index in range(60)
+        ]
+
+        with patch.object(
+            submission_service.dynamodb, 'batch_write_item', wraps=submission_service.dynamodb.batch_write_item
+        ) as batch_write_item:
+            written = submission_service.batch_upsert_submissions(submissions)
+
+        assert len(written) == 60
+        assert batch_write_item.call_count == 3
+        assert len(submission_service.query_submissions_by_trial("trial-1")) == 60
+
+    def test_batch_upsert_submissions_retries_unprocessed_items(self, submission_service):
+        """Test that UnprocessedItems are re-sent until DynamoDB accepts them"""
+        real_batch_write_item = submission_service.dynamodb.batch_write_item
+        calls = []
+
+        def flaky_batch_write_item(RequestItems):
+            calls.append(RequestItems)
+            if len(calls) == 1:
+                requests = RequestItems[submission_service.table_name]
+                real_batch_write_item(RequestItems={submission_service.table_name: requests[:1]})
+                return {'UnprocessedItems': {submission_service.table_name: requests[1:]}}
+            return real_batch_write_item(RequestItems=RequestItems)
+
+        submissions = [
+            {'recipe_id': "recipe-1", 'trial_id': "trial-1", 'participant_id': f"participant-{index}", 'score': 5}
+            for index in range(3)
+        ]
+
+        with patch.object(submission_service.dynamodb, 'batch_write_item', side_effect=flaky_batch_write_item), \
+                patch('services.submissions.time.sleep'):
+            submission_service.batch_upsert_submissions(submissions)
+
+        assert len(calls) == 2
+        assert len(calls[1][submission_service.table_name]) == 2
+        assert len(submission_service.query_submissions_by_trial("trial-1")) == 3
+
+    def test_batch_upsert_submissions_validates_before_writing(self, submission_service):
+        """Test that one invalid submission rejects the whole batch without writing anything"""
+        submissions = [
+            {'recipe_id': "recipe-1", 'trial_id': "trial-1", 'participant_id': "participant-1", 'score': 5},
+            {'recipe_id': "recipe-1", 'trial_id': "trial-1", 'participant_id': "participant-2", 'score': 5,
+             'status': "published"}
+        ]
+
+        with pytest.raises(ValueError, match="index 1"):
+            submission_service.batch_upsert_submissions(submissions)
+
+        assert submission_service.query_submissions_by_trial("trial-1") == []
+
+    def test_batch_upsert_submissions_keeps_stored_transcription(self, submission_service):
+        """Test that a batch save leaving out transcription and voice_memo_key keeps the stored ones"""
+        upsert = dict(
+            submission_id="participant-1::recipe-1::sweetness",
+            recipe_id="recipe-1",
+            trial_id="trial-1",
+            participant_id="participant-1"
+        )
+        created = submission_service.upsert_submission(score=5, voice_memo_key="memos/participant-1.webm", **upsert)
+        submission_service.table.update_item(
+            Key={'submission_id': upsert['submission_id'], 'recipe_id': "recipe-1"},
+            UpdateExpression="SET transcription = :transcription",
+            ExpressionAttributeValues={':transcription': "a little too sweet"}
+        )
+
+        submission_service.batch_upsert_submissions([dict(score=7, status="saved", notes="better", **upsert)])
+
+        stored = submission_service.get_submission_by_id(upsert['submission_id'], "recipe-1")
+        assert (stored['score'], stored['status'], stored['notes']) == (7, "saved", "better")
+        assert stored['transcription'] == "a little too sweet"
+        assert stored['voice_memo_key'] == "memos/participant-1.webm"
+        assert stored['created_at'] == created['created_at']
+
+    def test_iter_submissions_since_returns_only_changes(self, submission_service):
+        """Test that a since watermark limits a trial listing to submissions updated after it"""
+        create_trial_submissions(submission_service, "trial-1", 6)
+        watermark = max(item['last_updated'] for item in submission_service.query_submissions_by_trial("trial-1"))
+
+        submission_service.update_submission("trial-1-participant-2::recipe-2::outcome-2", "recipe-2", {'score': 9})
+        submission_service.create_submission(
+            recipe_id="recipe-0",
+            trial_id="trial-1",
+            participant_id="participant-9",
+            score=4,
+            submission_id="participant-9::recipe-0::outcome-1"
+        )
+
+        changed = list(submission_service.iter_submissions('trial_id', "trial-1", since=watermark))
+
+        assert sorted(item['submission_id'] for item in changed) == [
+            "participant-9::recipe-0::outcome-1",
+            "trial-1-participant-2::recipe-2::outcome-2"
+        ]
+
+    def test_write_at_an_exact_second_is_after_its_watermark(self, submission_service):
+        """Test that last_updated keeps zero microseconds, so it still compares after an earlier since"""
+        from services import submissions
+        from datetime import datetime
+
+        class ExactSecond(datetime):
+            @classmethod
+            def utcnow(cls):
+                return datetime(2024, 5, 1, 12, 0, 0)
+
+        with patch.object(submissions, 'datetime', ExactSecond):
+            item = submission_service.create_submission(
+                recipe_id="recipe-0", trial_id="trial-1", participant_id="participant-0", score=5
+            )
+
+        assert item['last_updated'] == "2024-05-01T12:00:00.000000"
+        since = normalize_since("2024-05-01T11:59:59.999999")
+        changed = list(submission_service.iter_submissions('trial_id', "trial-1", since=since))
+        assert [entry['submission_id'] for entry in changed] == [item['submission_id']]
+
+    def test_since_validation(self, submission_service):
+        """Test that since must be a timestamp and is only accepted for trial listings"""
+        assert normalize_since("2024-12-11T10:00:00Z") == "2024-12-11T10:00:00.000000"
+        assert normalize_since("2024-12-11T12:00:00+02:00") == "2024-12-11T10:00:00.000000"
+
+        with pytest.raises(ValueError, match="ISO 8601"):
+            list(submission_service.iter_submissions('trial_id', "trial-1", since="yesterday"))
+
+        with pytest.raises(ValueError, match="only supported when querying by trial_id"):
+            list(submission_service.iter_submissions('recipe_id', "recipe-1", since="2024-12-11T10:00:00"))
+
+    def test_iter_submissions_with_fields_projects_attributes(self, submission_service):
+        """Test that a fields selection returns only those attributes plus the key"""
+        submission_service.create_submission(
+            recipe_id="recipe-1",
+            trial_id="trial-1",
+            participant_id="participant-1",
+            score=7,
+            status="saved",
+            notes="long notes " * 50,
+            submission_id="participant-1::recipe-1::sweetness"
+        )
+
+        submissions = list(submission_service.iter_submissions('trial_id', "trial-1", fields=['score', 'status']))
+
+        assert submissions == [{
+            'submission_id': "participant-1::recipe-1::sweetness",
+            'recipe_id': "recipe-1",
+            'score': 7,
+            'status': "saved"
+        }]
+
+        with pytest.raises(ValueError, match="Invalid field name"):
+            list(submission_service.iter_submissions('trial_id', "trial-1", fields=['score', 'notes.length']))
+
+    def test_upsert_submission_creates_then_updates(self, submission_service):
+        """Test that PUT-style upserts create once and keep creation-only fields on later writes"""
+        created = submission_service.upsert_submission(
+            submission_id="participant-1::recipe-1::sweetness",
+            recipe_id="recipe-1",
+            trial_id="trial-1",
+            participant_id="participant-1",
+            score=5,
+            notes="first try"
+        )
+        updated = submission_service.upsert_submission(
+            submission_id="participant-1::recipe-1::sweetness",
+            recipe_id="recipe-1",
+            trial_id="trial-other",
+            participant_id="participant-1",
+            score=8,
+            status="saved"
+        )
+
+        assert created['version'] == 1
+        assert updated['version'] == 2
+        assert updated['score'] == 8
+        assert updated['status'] == "saved"
+        assert updated['notes'] == "first try"
+        assert updated['trial_id'] == "trial-1"
+        assert updated['created_at'] == created['created_at']
+
+    def test_upsert_submission_expected_version(self, submission_service):
+        """Test that a stale expected_version is rejected without writing"""
+        upsert = dict(
+            submission_id="participant-1::recipe-1::sweetness",
+            recipe_id="recipe-1",
+            trial_id="trial-1",
+            participant_id="participant-1"
+        )
+        submission_service.upsert_submission(score=5, expected_version=0, **upsert)
+
+        with pytest.raises(VersionConflictError):
+            submission_service.upsert_submission(score=6, expected_version=0, **upsert)
+
+        assert submission_service.upsert_submission(score=7, expected_version=1, **upsert)['version'] == 2
+
+        with pytest.raises(VersionConflictError):
+            submission_service.upsert_submission(score=9, expected_version=1, **upsert)
+
+        stored = submission_service.get_submission_by_id("participant-1::recipe-1::sweetness", "recipe-1")
+        assert stored['score'] == 7
+
+    def test_every_write_path_sets_created_at(self, submission_service):
+        """Test that create, upsert and batch writes all store created_at"""
+        created = submission_service.create_submission(
+            recipe_id="recipe-1", trial_id="trial-1", participant_id="participant-1", score=5
+        )
+        upserted = submission_service.upsert_submission(
+            submission_id="participant-2::recipe-1::sweetness", recipe_id="recipe-1", trial_id="trial-1",
+            participant_id="participant-2", score=5
+        )
+        batched = submission_service.batch_upsert_submissions([
+            {'recipe_id': "recipe-1", 'trial_id': "trial-1", 'participant_id': "participant-3", 'score': 5}
+        ])[0]
+
+        for item in (created, upserted, batched):
+            stored = submission_service.get_submission_by_id(item['submission_id'], "recipe-1")
+            assert stored['created_at'] == stored['last_updated']
+
+    def test_create_only_upsert_rejects_unversioned_rows(self, submission_service):
+        """Test that expected_version=0 fails for a row written before versioning existed"""
+        submission_service.table.put_item(Item={
+            'submission_id': "participant-1::recipe-1::sweetness", 'recipe_id': "recipe-1",
+            'trial_id': "trial-1", 'participant_id': "participant-1", 'score': 4, 'status': "saved"
+        })
+
+        with pytest.raises(VersionConflictError):
+            submission_service.upsert_submission(
+                submission_id="participant-1::recipe-1::sweetness", recipe_id="recipe-1", trial_id="trial-1",
+                participant_id="participant-1", score=6, expected_version=0
+            )
+
+        stored = submission_service.get_submission_by_id("participant-1::recipe-1::sweetness", "recipe-1")
+        assert stored['score'] == 4
+
+    def test_batch_upsert_submissions_sets_version(self, submission_service):
+        """Test that a batch replace gives the item a version that stale expected_versions do not match"""
+        upsert = dict(
+            submission_id="participant-1::recipe-1::sweetness",
+            recipe_id="recipe-1",
+            trial_id="trial-1",
+            participant_id="participant-1"
+        )
+        submission_service.upsert_submission(score=5, expected_version=0, **upsert)
+        written = submission_service.batch_upsert_submissions([dict(score=6, **upsert)])
+
+        stored = submission_service.get_submission_by_id("participant-1::recipe-1::sweetness", "recipe-1")
+        assert stored['version'] == written[0]['version'] > 1
+
+        with pytest.raises(VersionConflictError):
+            submission_service.upsert_submission(score=7, expected_version=1, **upsert)
+
+        updated = submission_service.upsert_submission(score=8, expected_version=int(stored['version']), **upsert)
+        assert updated['version'] == stored['version'] + 1
+
+    def test_batch_get_submissions_preserves_input_order(self, submission_service):
+        """Test that keys spanning several chunks come back in request order, with None for missing keys"""
+        create_trial_submissions(submission_service, "trial-1", 240)
+        keys = [
+            {'submission_id': f"trial-1-participant-{index % 5}::recipe-{index % 3}::outcome-{index}",
+             'recipe_id': f"recipe-{index % 3}"}
+            for index in reversed(range(240))
+        ]
+        keys.insert(7, {'submission_id': "missing::recipe-0::outcome", 'recipe_id': "recipe-0"})
+        keys.append(keys[0])
+
+        real_batch_get_item = submission_service.dynamodb.meta.client.batch_get_item
+        calls = []
+
+        def flaky_batch_get_item(RequestItems):
+            calls.append(RequestItems)
+            request = RequestItems[submission_service.table_name]
+            if len(calls) == 1:
+                response = real_batch_get_item(RequestItems={
+                    submission_service.table_name: dict(request, Keys=request['Keys'][:10])
+                })
+                response['UnprocessedKeys'] = {
+                    submission_service.table_name: dict(request, Keys=request['Keys'][10:])
+                }
+                return response
+            return real_batch_get_item(RequestItems=RequestItems)
+
+        with patch.object(submission_service.dynamodb.meta.client, 'batch_get_item',
+                          side_effect=flaky_batch_get_item), \
+                patch('services.submissions.time.sleep'):
+            submissions = submission_service.batch_get_submissions(keys, fields=['score'])
+
+        # 241 unique keys -> 3 chunks of at most 100, plus one retry of unprocessed keys
+        assert len(calls) == 4
+        assert all(len(call[submission_service.table_name]['Keys']) <= 100 for call in calls)
+        assert len(submissions) == len(keys)
+        assert submissions[7] is None
+        assert submissions[-1] == submissions[0]
+        for key, submission in zip(keys, submissions):
+            if submission is not None:
+                assert (submission['submission_id'], submission['recipe_id']) == (key['submission_id'], key['recipe_id'])
+                assert set(submission) == {'submission_id', 'recipe_id', 'score'}
+        assert sum(submission is None for submission in submissions) == 1
+
+    def test_native_read_mode_matches_resource_reads(self, submission_service):
+        """Test that native reads return the same submissions with int/float values instead of Decimal"""
+        create_trial_submissions(submission_service, "trial-1", 30)
+        submission_service.upsert_submission(
+            submission_id="trial-1-participant-0::recipe-0::outcome-0",
+            recipe_id="recipe-0",
+            trial_id="trial-1",
+            participant_id="participant-0",
+            score=7.5
+        )
+
+        with patch.dict(os.environ, {'DYNAMODB_READ_MODE': 'native'}):
+            native_service = SubmissionService()
+
+        resource_items = submission_service.query_submissions_by_trial("trial-1")
+        native_items = native_service.query_submissions_by_trial("trial-1")
+        assert native_items == [json.loads(json.dumps(item, default=float)) for item in resource_items]
+        assert all(isinstance(item['score'], (int, float)) for item in native_items)
+        assert isinstance(native_items[0]['version'], int)
+
+        # Next tokens are interchangeable between read modes
+        first_page, next_token = native_service.query_submissions_page('trial_id', "trial-1", limit=10)
+        second_page, _ = submission_service.query_submissions_page('trial_id', "trial-1", limit=10, next_token=next_token)
+        assert {item['submission_id'] for item in first_page}.isdisjoint(item['submission_id'] for item in second_page)
+
+        submission = native_service.get_submission_by_id("trial-1-participant-0::recipe-0::outcome-0", "recipe-0")
+        assert submission['score'] == 7.5
+        fetched = native_service.batch_get_submissions([
+            {'submission_id': "trial-1-participant-0::recipe-0::outcome-0", 'recipe_id': "recipe-0"},
+            {'submission_id': "missing", 'recipe_id': "recipe-0"}
+        ])
+        assert fetched == [submission, None]
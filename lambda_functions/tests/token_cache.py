@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import time
+import importlib.util
+
+import jwt
+import pytest
+from jwt.algorithms import RSAAlgorithm
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+LAMBDA_FUNCTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, LAMBDA_FUNCTIONS_DIR)
+
+from common import auth
+from common.jwks import JwksCache
+from common.tokens import VerifiedTokenCache
+
+spec = importlib.util.spec_from_file_location(
+    'auth0_authorizer', os.path.join(LAMBDA_FUNCTIONS_DIR, 'authorizers', 'jwt', 'auth0', 'handler.py')
+)
+authorizer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(authorizer)
+
+DOMAIN = 'tenant.auth0.local'
+AUDIENCE = 'https://api.local'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestVerifiedTokenCache:
+
+    def test_entries_expire_skew_seconds_before_exp(self):
+        """Test that claims are served until exp minus the skew margin"""
+        clock = FakeClock()
+        cache = VerifiedTokenCache(skew=30, clock=clock)
+        cache.put('token-1', {'sub': 'auth0|one', 'exp': clock.now + 100})
+
+        assert cache.get('token-1') == {'sub': 'auth0|one', 'exp': clock.now + 100}
+        clock.now += 71
+        assert cache.get('token-1') is None
+        assert cache.stats() == {'entries': 0, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+    def test_tokens_without_exp_or_about_to_expire_are_not_cached(self):
+        """Test that only claims with a usable exp are stored"""
+        clock = FakeClock()
+        cache = VerifiedTokenCache(skew=30, clock=clock)
+        cache.put('no-exp', {'sub': 'auth0|one'})
+        cache.put('expiring', {'sub': 'auth0|one', 'exp': clock.now + 10})
+
+        assert cache.get('no-exp') is None
+        assert cache.get('expiring') is None
+        assert cache.stats()['entries'] == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the LRU bound"""
+        clock = FakeClock()
+        cache = VerifiedTokenCache(max_entries=2, clock=clock)
+        for token in ('a', 'b'):
+            cache.put(token, {'exp': clock.now + 3600})
+        cache.get('a')
+        cache.put('c', {'exp': clock.now + 3600})
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
+        assert cache.stats()['evictions'] == 1
+
+
+class TestAuthorizerTokenCache:
+
+    def test_repeated_token_skips_verification(self, monkeypatch):
+        """Test that the authorizer verifies a token once and serves repeats from the cache"""
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(RSAAlgorithm.to_jwk(key.public_key()))
+        jwk.update({'kid': 'key-1', 'use': 'sig', 'alg': 'RS256'})
+        jwks = JwksCache('http://unused.local/jwks.json')
+        jwks.load({'keys': [jwk]})
+        now = int(time.time())
+        token = jwt.encode(
+            {'sub': 'auth0|proctor', 'iss': f'https://{DOMAIN}/', 'aud': AUDIENCE, 'iat': now, 'exp': now + 3600},
+            key, algorithm='RS256', headers={'kid': 'key-1'}
+        )
+
+        decodes = []
+        real_decode = jwt.decode
+        monkeypatch.setattr(jwt, 'decode', lambda *args, **kwargs: decodes.append(1) or real_decode(*args, **kwargs))
+        monkeypatch.setattr(auth, 'get_jwks', lambda domain: jwks)
+        monkeypatch.setenv('AUTH0_DOMAIN', DOMAIN)
+        monkeypatch.setenv('AUTH0_AUDIENCE', AUDIENCE)
+        auth.verified_tokens.clear()
+
+        for method in ('GET', 'PUT', 'GET'):
+            event = {'authorizationToken': f'Bearer {token}', 'methodArn': f'arn:aws:execute-api:us-west-2:1:api/dev/{method}/trial'}
+            assert authorizer.handler(event, None)['principalId'] == 'auth0|proctor'
+
+        assert len(decodes) == 1
+        assert auth.verified_tokens.stats()['hits'] == 2
+
+        with pytest.raises(Exception, match='Unauthorized'):
+            authorizer.handler({'authorizationToken': token[:-4] + 'AAAA', 'methodArn': 'arn'}, None)
+        auth.verified_tokens.clear()
@@ -0,0 +1,70 @@
+import pytest
+import os
+import sys
+import statistics
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'trial'))
+
+from services.stats import compute_submission_stats, parse_outcome
+
+
+def make_submission(participant_id, recipe_id, outcome, score, status="saved"):
+    return {
+        'submission_id': f"{participant_id}::{recipe_id}::{outcome}",
+        'recipe_id': recipe_id,
+        'score': Decimal(str(score)),
+        'status': status
+    }
+
+
+class TestTrialStats:
+
+    def test_parse_outcome(self):
+        """Test that the outcome is read from the third part of the submission_id"""
+        assert parse_outcome("participant-1::recipe-1::sweetness") == "sweetness"
+        assert parse_outcome("0b9e6f5c-uuid") == "unknown"
+
+    def test_compute_submission_stats_empty(self):
+        """Test statistics for a trial with no submissions"""
+        stats = compute_submission_stats([])
+
+        assert stats == {'submission_count': 0, 'saved_count': 0, 'draft_count': 0, 'mean_score': None, 'recipes': []}
+
+    def test_compute_submission_stats_groups_by_recipe_and_outcome(self):
+        """Test that statistics match a straightforward per-group computation"""
+        sweetness_scores = [7, 8, 6, 9, 5]
+        submissions = [
+            make_submission(f"participant-{index}", "recipe-a", "sweetness", score, "saved" if index % 2 else "draft")
+            for index, score in enumerate(sweetness_scores)
+        ]
+        submissions.append(make_submission("participant-0", "recipe-a", "texture", 4))
+        submissions.append(make_submission("participant-0", "recipe-b", "sweetness", 3.5))
+
+        stats = compute_submission_stats(submissions)
+
+        assert stats['submission_count'] == 7
+        assert stats['saved_count'] == 4
+        assert stats['draft_count'] == 3
+        assert [recipe['recipe_id'] for recipe in stats['recipes']] == ["recipe-a", "recipe-b"]
+
+        recipe_a = {outcome['outcome']: outcome for outcome in stats['recipes'][0]['outcomes']}
+        sweetness = recipe_a['sweetness']
+        assert sweetness['count'] == 5
+        assert sweetness['saved_count'] == 2
+        assert sweetness['draft_count'] == 3
+        assert sweetness['mean'] == pytest.approx(statistics.mean(sweetness_scores))
+        assert sweetness['std'] == pytest.approx(statistics.stdev(sweetness_scores), abs=1e-4)
+        assert sweetness['min'] == 5
+        assert sweetness['max'] == 9
+
+        margin = 2.776 * statistics.stdev(sweetness_scores) / len(sweetness_scores) ** 0.5
+        assert sweetness['ci95'][0] == pytest.approx(7 - margin, abs=1e-3)
+        assert sweetness['ci95'][1] == pytest.approx(7 + margin, abs=1e-3)
+
+        # A single score has no spread, so std and CI are reported as null
+        texture = recipe_a['texture']
+        assert texture['count'] == 1
+        assert texture['std'] is None
+        assert texture['ci95'] == [None, None]
@@ -1,11 +1,16 @@
 import json
 import os
-import boto3
 import time
 import uuid
+from datetime import datetime
 from botocore.exceptions import ClientError
+from common.responses import handle_content_encoding
+from common.auth import authenticate
+from common.clients import get_client, get_resource
 
 
+@authenticate
+@handle_content_encoding
 def handler(event, context):
     """
     Lambda handler for transcribing voice memos
@@ -59,8 +64,8 @@ def handler(event, context):
             }
         
         # Initialize AWS clients
-        transcribe_client = boto3.client('transcribe')
-        dynamodb = boto3.resource('dynamodb')
+        transcribe_client = get_client('transcribe')
+        dynamodb = get_resource('dynamodb')
         table = dynamodb.Table(submissions_table)
         
         # Start transcription job
@@ -111,9 +116,10 @@ def handler(event, context):
                         'submission_id': submission_id,
                         'recipe_id': recipe_id
                     },
-                    UpdateExpression='SET transcription = :transcription',
+                    UpdateExpression='SET transcription = :transcription, last_updated = :last_updated',
                     ExpressionAttributeValues={
-                        ':transcription': transcript_text
+                        ':transcription': transcript_text,
+                        ':last_updated': datetime.utcnow().isoformat(timespec='microseconds')
                     }
                 )
                 
@@ -1,6 +1,11 @@
 import json
 from services.trials import TrialService
 from decimal import Decimal
+from common.responses import handle_content_encoding
+from common.auth import authenticate
+from common.clients import get_service, prewarm
+
+prewarm(TrialService)
 
 
 def decimal_default(obj):
@@ -24,6 +29,8 @@ def create_response(status_code: int, body: dict):
     }
 
 
+@authenticate
+@handle_content_encoding
 def handler(event, context):
     """
     Lambda handler for trial endpoints
@@ -33,10 +40,28 @@ def handler(event, context):
         http_method = event.get('httpMethod')
         path_params = event.get('pathParameters') or {}
 
-        service = TrialService()
+        service = get_service(TrialService)
+
+        # GET endpoint - score statistics for a trial
+        if http_method == 'GET' and event.get('resource') == '/trial/{id}/stats':
+            # Imported here so NumPy is only loaded by containers that serve stats requests
+            from services.stats import TrialStatsService
+
+            trial_id = path_params.get('id')
+            if not trial_id:
+                return create_response(400, {
+                    'error': 'Bad Request',
+                    'message': 'Must provide trial id in path'
+                })
+
+            stats = get_service(TrialStatsService).get_trial_stats(trial_id)
+            return create_response(200, {
+                'message': 'Trial statistics retrieved successfully',
+                'data': stats
+            })
 
         # GET endpoint - retrieve trial(s)
-        if http_method == 'GET':
+        elif http_method == 'GET':
             # If id is provided in path params, get single trial
             if 'id' in path_params and path_params['id']:
                 trial_id = path_params['id']
@@ -0,0 +1,222 @@
+import os
+from boto3.dynamodb.conditions import Key
+import numpy as np
+from typing import Dict, Any, List
+from common.dynamodb import NativeTable, native_reads_enabled
+from common.clients import get_resource
+from common.outcomes import parse_outcome
+
+
+# Two-sided 95% Student's t critical values for 1-30 degrees of freedom.
+# Larger samples fall back to the normal approximation.
+T_CRITICAL_95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+]
+Z_CRITICAL_95 = 1.96
+
+
+def t_critical_95(degrees_of_freedom: np.ndarray) -> np.ndarray:
+    """
+    Look up the 95% t critical value for each degrees-of-freedom entry (NaN where df < 1)
+    """
+    table = np.array([np.nan] + T_CRITICAL_95)
+    clipped = np.clip(degrees_of_freedom, 0, len(T_CRITICAL_95))
+    return np.where(degrees_of_freedom > len(T_CRITICAL_95), Z_CRITICAL_95, table[clipped])
+
+
+def summarize_groups(counts: np.ndarray, sums: np.ndarray, sums_of_squares: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute mean, sample standard deviation and 95% CI for each group from count, sum and sum of squares
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts
+        variances = (sums_of_squares - counts * means ** 2) / (counts - 1)
+        stds = np.sqrt(np.clip(variances, 0, None))
+        margins = t_critical_95(counts.astype(np.int64) - 1) * stds / np.sqrt(counts)
+    stds = np.where(counts > 1, stds, np.nan)
+    return {
+        'mean': means,
+        'std': stds,
+        'ci95_low': means - margins,
+        'ci95_high': means + margins
+    }
+
+
+def to_number(value) -> Any:
+    """Convert a NumPy scalar to a JSON-friendly number, using None for NaN"""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
+
+
+def compute_submission_stats(submissions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute per-recipe x per-outcome score statistics for a list of submissions.
+    All aggregation happens on NumPy arrays grouped by a combined recipe/outcome index
+    """
+    if not submissions:
+        return {'submission_count': 0, 'saved_count': 0, 'draft_count': 0, 'mean_score': None, 'recipes': []}
+
+    recipe_ids = np.array([submission['recipe_id'] for submission in submissions])
+    outcomes = np.array([parse_outcome(submission['submission_id']) for submission in submissions])
+    scores = np.array([float(submission.get('score', 0)) for submission in submissions], dtype=np.float64)
+    saved = np.array([submission.get('status') == 'saved' for submission in submissions])
+
+    recipe_keys, recipe_index = np.unique(recipe_ids, return_inverse=True)
+    outcome_keys, outcome_index = np.unique(outcomes, return_inverse=True)
+    group_count = len(recipe_keys) * len(outcome_keys)
+    groups = recipe_index * len(outcome_keys) + outcome_index
+
+    counts = np.bincount(groups, minlength=group_count).astype(np.float64)
+    sums = np.bincount(groups, weights=scores, minlength=group_count)
+    sums_of_squares = np.bincount(groups, weights=scores ** 2, minlength=group_count)
+    saved_counts = np.bincount(groups, weights=saved, minlength=group_count)
+
+    minimums = np.full(group_count, np.inf)
+    maximums = np.full(group_count, -np.inf)
+    np.minimum.at(minimums, groups, scores)
+    np.maximum.at(maximums, groups, scores)
+
+    summary = summarize_groups(counts, sums, sums_of_squares)
+
+    recipes = []
+    for recipe_position, recipe_id in enumerate(recipe_keys):
+        recipe_outcomes = []
+        for outcome_position, outcome in enumerate(outcome_keys):
+            group = recipe_position * len(outcome_keys) + outcome_position
+            if counts[group] == 0:
+                continue
+            recipe_outcomes.append({
+                'outcome': str(outcome),
+                'count': int(counts[group]),
+                'saved_count': int(saved_counts[group]),
+                'draft_count': int(counts[group] - saved_counts[group]),
+                'mean': to_number(summary['mean'][group]),
+                'std': to_number(summary['std'][group]),
+                'min': to_number(minimums[group]),
+                'max': to_number(maximums[group]),
+                'ci95': [to_number(summary['ci95_low'][group]), to_number(summary['ci95_high'][group])]
+            })
+        recipes.append({'recipe_id': str(recipe_id), 'outcomes': recipe_outcomes})
+
+    saved_total = int(saved.sum())
+    return {
+        'submission_count': len(submissions),
+        'saved_count': saved_total,
+        'draft_count': len(submissions) - saved_total,
+        'mean_score': to_number(scores.mean()),
+        'recipes': recipes
+    }
+
+
+def compute_aggregate_stats(aggregates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute per-recipe x per-outcome statistics from running aggregates
+    (submission_count, score_sum, score_sum_sq, saved_count). Running sums cannot
+    be reversed for min/max, so those are reported as null
+    """
+    aggregates = [aggregate for aggregate in aggregates if int(aggregate.get('submission_count', 0)) > 0]
+    if not aggregates:
+        return {'submission_count': 0, 'saved_count': 0, 'draft_count': 0, 'mean_score': None, 'recipes': []}
+
+    aggregates = sorted(aggregates, key=lambda aggregate: (aggregate['recipe_id'], aggregate['outcome']))
+    counts = np.array([float(aggregate['submission_count']) for aggregate in aggregates])
+    sums = np.array([float(aggregate['score_sum']) for aggregate in aggregates])
+    sums_of_squares = np.array([float(aggregate['score_sum_sq']) for aggregate in aggregates])
+    saved_counts = np.array([float(aggregate.get('saved_count', 0)) for aggregate in aggregates])
+
+    summary = summarize_groups(counts, sums, sums_of_squares)
+
+    recipes: Dict[str, List[Dict[str, Any]]] = {}
+    for position, aggregate in enumerate(aggregates):
+        recipes.setdefault(aggregate['recipe_id'], []).append({
+            'outcome': aggregate['outcome'],
+            'count': int(counts[position]),
+            'saved_count': int(saved_counts[position]),
+            'draft_count': int(counts[position] - saved_counts[position]),
+            'mean': to_number(summary['mean'][position]),
+            'std': to_number(summary['std'][position]),
+            'min': None,
+            'max': None,
+            'ci95': [to_number(summary['ci95_low'][position]), to_number(summary['ci95_high'][position])]
+        })
+
+    submission_count = int(counts.sum())
+    saved_total = int(saved_counts.sum())
+    return {
+        'submission_count': submission_count,
+        'saved_count': saved_total,
+        'draft_count': submission_count - saved_total,
+        'mean_score': to_number(sums.sum() / counts.sum()),
+        'recipes': [{'recipe_id': recipe_id, 'outcomes': outcomes} for recipe_id, outcomes in recipes.items()]
+    }
+
+
+class TrialStatsService:
+    def __init__(self):
+        self.dynamodb = get_resource('dynamodb')
+        self.table_name = os.environ.get('SUBMISSIONS_TABLE_NAME')
+        if not self.table_name:
+            raise ValueError("SUBMISSIONS_TABLE_NAME environment variable is not set")
+        self.table = self.dynamodb.Table(self.table_name)
+        self.reader = NativeTable(self.table_name) if native_reads_enabled() else self.table
+
+        # When running aggregates are maintained, stats are read from them instead of rescanning the trial
+        self.aggregates_table_name = os.environ.get('AGGREGATES_TABLE_NAME')
+        self.aggregates_table = self.dynamodb.Table(self.aggregates_table_name) if self.aggregates_table_name else None
+
+    def get_trial_submissions(self, trial_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch every submission in a trial, projecting only the attributes statistics need
+        """
+        try:
+            query_kwargs = {
+                'IndexName': 'trial_id_index',
+                'KeyConditionExpression': Key('trial_id').eq(trial_id),
+                'ProjectionExpression': '#submission_id, #recipe_id, #score, #status',
+                'ExpressionAttributeNames': {
+                    '#submission_id': 'submission_id',
+                    '#recipe_id': 'recipe_id',
+                    '#score': 'score',
+                    '#status': 'status'
+                }
+            }
+            items = []
+            while True:
+                response = self.reader.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return items
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            raise Exception(f"Error querying submissions for trial stats: {str(e)}")
+
+    def get_trial_aggregates(self, trial_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch the running recipe/outcome aggregates for a trial
+        """
+        try:
+            query_kwargs = {'KeyConditionExpression': Key('trial_id').eq(trial_id)}
+            items = []
+            while True:
+                response = self.aggregates_table.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return items
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            raise Exception(f"Error querying submission aggregates: {str(e)}")
+
+    def get_trial_stats(self, trial_id: str) -> Dict[str, Any]:
+        """
+        Get score statistics for a trial grouped by recipe and outcome
+        """
+        if self.aggregates_table is not None:
+            stats = compute_aggregate_stats(self.get_trial_aggregates(trial_id))
+            stats['source'] = 'aggregates'
+        else:
+            stats = compute_submission_stats(self.get_trial_submissions(trial_id))
+            stats['source'] = 'submissions'
+        stats['trial_id'] = trial_id
+        return stats
@@ -1,13 +1,13 @@
 import os
-import boto3
 from decimal import Decimal
 import uuid
 from typing import Optional, Dict, Any
+from common.clients import get_resource
 
 
 class TrialService:
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.table_name = os.environ.get('TRIALS_TABLE_NAME')
         if not self.table_name:
             raise ValueError("TRIALS_TABLE_NAME environment variable is not set")
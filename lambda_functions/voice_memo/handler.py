@@ -3,6 +3,9 @@ import os
 import boto3
 from botocore.exceptions import ClientError
 import uuid
+from common.responses import handle_content_encoding
+from common.auth import authenticate
+from common.clients import get_client
 
 
 def create_response(status_code: int, body: dict):
@@ -19,6 +22,8 @@ def create_response(status_code: int, body: dict):
     }
 
 
+@authenticate
+@handle_content_encoding
 def handler(event, context):
     """
     Lambda handler for voice memo upload presigned URL generation
@@ -66,7 +71,7 @@ def handler(event, context):
             # Generate presigned URL for upload
             # Use signature version 4 for better CORS support
             region = os.environ.get('AWS_REGION', 'us-west-2')
-            s3_client = boto3.client(
+            s3_client = get_client(
                 's3',
                 region_name=region,
                 config=boto3.session.Config(
@@ -2,11 +2,13 @@ import os
 import json
 import boto3
 from datetime import datetime, timezone
+from common.responses import handle_content_encoding
 
 dynamodb = boto3.resource("dynamodb")
 table = dynamodb.Table(os.environ["USERS_TABLE_NAME"])
 
 
+@handle_content_encoding
 def handler(event, context):
     body = json.loads(event["body"])
     user = body["user"]